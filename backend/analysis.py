@@ -0,0 +1,231 @@
+import re
+from dataclasses import dataclass, field
+
+# Below this many words there is nothing for the judge to analyze
+MIN_ARGUMENT_WORDS = 5
+
+# Sentence ends in Latin, Devanagari (danda) and CJK punctuation
+_SENTENCES = re.compile(
+    r"[^.!?\u0964\u3002\uff01\uff1f]+[.!?\u0964\u3002\uff01\uff1f]*"
+)
+_WORDS = re.compile(r"[a-z][a-z']+")
+# Scripts written without spaces between words
+_UNSPACED = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+EVIDENCE_PATTERNS = (
+    re.compile(r"\b\d[\d,]*(?:\.\d+)?\s*(?:%|percent\b|per cent\b)?"),
+    re.compile(r"\baccording to\b", re.I),
+    re.compile(
+        r"\b(?:study|studies|research|survey|report|data|statistics|evidence"
+        r"|experts?)\b",
+        re.I,
+    ),
+    re.compile(r"\bet al\b|\(\s*[A-Z][A-Za-z]+,? \d{4}\s*\)|\[\d+\]"),
+    re.compile(r"https?://\S+"),
+)
+
+TRANSITIONS = (
+    "therefore", "however", "furthermore", "moreover", "because", "consequently",
+    "thus", "hence", "in addition", "for example", "for instance", "as a result",
+    "firstly", "secondly", "finally", "in conclusion", "on the other hand",
+    "this means", "which means", "since", "although", "similarly", "in contrast",
+)
+_TRANSITIONS = re.compile(
+    r"\b(?:" + "|".join(re.escape(t) for t in TRANSITIONS) + r")\b", re.I
+)
+
+FALLACY_MARKERS = {
+    "Hasty generalization": re.compile(
+        r"\b(?:everyone|everybody|nobody|always|never) (?:knows|agrees|does|will)\b",
+        re.I,
+    ),
+    "Appeal to popularity": re.compile(
+        r"\b(?:everyone|most people) (?:thinks?|believes?|says?)\b", re.I
+    ),
+    "Ad hominem": re.compile(r"\b(?:stupid|idiots?|ignorant|clueless|morons?)\b", re.I),
+    "Slippery slope": re.compile(
+        r"\b(?:next thing you know|slippery slope|will inevitably lead to)\b", re.I
+    ),
+    "Appeal to obviousness": re.compile(
+        r"\b(?:obviously|clearly everyone|it is common sense)\b", re.I
+    ),
+}
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers him his how i if
+in into is it its itself just me more most my no nor not now of off on once only
+or other our ours out over own same she should so some such than that the their
+theirs them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your
+yours motion house believes
+""".split())
+
+
+_SUFFIXES = ("ing", "ful", "ed", "es", "ly", "s")
+
+
+def stem(word: str) -> str:
+    """Strip one common suffix so "abolished" and "abolishing" match."""
+    for suffix in _SUFFIXES:
+        long_enough = len(word) - len(suffix) >= 4
+        if word.endswith(suffix) and long_enough and not word.endswith("ss"):
+            return word[:-len(suffix)]
+    return word
+
+
+def count_words(text: str) -> int:
+    """Count words in any script: space-separated tokens containing a letter.
+
+    Chinese and Japanese have no spaces between words, so each of their
+    characters counts as one word.
+    """
+    unspaced = len(_UNSPACED.findall(text))
+    tokens = _UNSPACED.sub(" ", text).split()
+    return unspaced + sum(1 for token in tokens if any(ch.isalpha() for ch in token))
+
+
+def content_terms(text: str) -> set:
+    """Stemmed, lower-cased content words of ``text``."""
+    words = _WORDS.findall(text.lower())
+    return {stem(word) for word in words if word not in STOPWORDS}
+
+
+@dataclass
+class ArgumentFeatures:
+    """Facts about an argument that can be computed without the LLM."""
+
+    word_count: int
+    sentence_count: int
+    evidence_count: int
+    evidence_markers: list = field(default_factory=list)
+    transitions: list = field(default_factory=list)
+    topic_terms: list = field(default_factory=list)
+    missing_topic_terms: list = field(default_factory=list)
+    on_topic_sentences: int = 0
+    fallacies: list = field(default_factory=list)
+
+    @property
+    def trivial(self) -> bool:
+        return self.word_count < MIN_ARGUMENT_WORDS
+
+    @property
+    def topic_overlap(self) -> float:
+        total = len(self.topic_terms) + len(self.missing_topic_terms)
+        return len(self.topic_terms) / total if total else 1.0
+
+
+def analyze_argument(argument: str, topic: str) -> ArgumentFeatures:
+    """Compute the local features of an argument against its topic."""
+    sentences = [s.strip() for s in _SENTENCES.findall(argument) if count_words(s)]
+    markers = [
+        m.group().strip()
+        for pattern in EVIDENCE_PATTERNS
+        for m in pattern.finditer(argument)
+    ]
+    transitions = (m.group().lower() for m in _TRANSITIONS.finditer(argument))
+    topic_terms = content_terms(topic)
+    argument_terms = content_terms(argument)
+    return ArgumentFeatures(
+        word_count=count_words(argument),
+        sentence_count=len(sentences),
+        # Several markers in one sentence usually describe one piece of evidence
+        evidence_count=sum(
+            1 for s in sentences if any(p.search(s) for p in EVIDENCE_PATTERNS)
+        ),
+        evidence_markers=list(dict.fromkeys(markers)),
+        transitions=list(dict.fromkeys(transitions)),
+        topic_terms=sorted(topic_terms & argument_terms),
+        missing_topic_terms=sorted(topic_terms - argument_terms),
+        on_topic_sentences=sum(1 for s in sentences if content_terms(s) & topic_terms),
+        fallacies=[
+            f'{name}: "{m.group()}"'
+            for name, pattern in FALLACY_MARKERS.items()
+            for m in pattern.finditer(argument)
+        ],
+    )
+
+
+def local_scores(features: ArgumentFeatures) -> dict:
+    """Heuristic judge scores from the local features alone, for fast mode."""
+    sentences = max(features.sentence_count, 1)
+    transitions = len(features.transitions)
+    on_topic = features.on_topic_sentences / sentences
+    coherence = 0.5 + min(0.35, 0.35 * transitions / sentences)
+    if features.sentence_count >= 3:
+        coherence += 0.1
+    relevance = 0.3 + 0.35 * features.topic_overlap + 0.3 * on_topic
+    evidence_strength = min(0.9, 0.3 + 0.2 * features.evidence_count)
+    fallacy_penalty = min(0.6, 0.05 + 0.15 * len(features.fallacies))
+    linking = ", ".join(features.transitions) or "none"
+    missing = ", ".join(features.missing_topic_terms) or "none"
+    markers = ", ".join(features.evidence_markers[:5])
+    return {
+        "coherence": round(min(coherence, 0.95), 2),
+        "coherence_reason": (
+            f"Local estimate: {transitions} linking phrase(s) ({linking}) "
+            f"across {features.sentence_count} sentence(s)."
+        ),
+        "relevance": round(min(relevance, 0.95), 2),
+        "relevance_reason": (
+            f"Local estimate: {features.on_topic_sentences} of "
+            f"{features.sentence_count} sentence(s) use the topic's key terms; "
+            f"missing: {missing}."
+        ),
+        "evidence_strength": round(evidence_strength, 2),
+        "evidence_reason": (
+            f"Local estimate: evidence markers found: {markers}."
+            if features.evidence_markers
+            else "Local estimate: no numbers, sources or citations found."
+        ),
+        "fallacy_penalty": round(fallacy_penalty, 2),
+        "fallacy_reason": (
+            "Local estimate: " + "; ".join(features.fallacies)
+            if features.fallacies
+            else "Local estimate: no common fallacy phrasing detected."
+        ),
+        "sentence_count": features.sentence_count,
+        "evidence_count": features.evidence_count,
+        "fallacies": features.fallacies,
+    }
+
+
+def trivial_scores(features: ArgumentFeatures) -> dict:
+    """Scores for input too short to be an argument."""
+    reason = (
+        f"Only {features.word_count} word(s) - "
+        "write at least a full sentence to get feedback."
+    )
+    return {
+        "coherence": 0.0,
+        "coherence_reason": reason,
+        "relevance": 0.0,
+        "relevance_reason": reason,
+        "evidence_strength": 0.0,
+        "evidence_reason": reason,
+        "fallacy_penalty": 0.0,
+        "fallacy_reason": reason,
+        "sentence_count": features.sentence_count,
+        "evidence_count": 0,
+        "fallacies": [],
+    }
+
+
+def describe_features(features: ArgumentFeatures) -> str:
+    """Render the local facts as a prompt block for the judge."""
+    evidence = f"- Evidence: {features.evidence_count} sentence(s) with markers"
+    if features.evidence_markers:
+        evidence += f" ({'; '.join(features.evidence_markers[:8])})"
+    topic_terms = f"- Topic terms used: {', '.join(features.topic_terms) or 'none'}"
+    if features.missing_topic_terms:
+        topic_terms += f"; not used: {', '.join(features.missing_topic_terms)}"
+    return "\n".join((
+        f"- Sentences: {features.sentence_count}",
+        evidence,
+        f"- Linking phrases: {', '.join(features.transitions) or 'none'}",
+        topic_terms,
+        f"- Sentences using topic terms: {features.on_topic_sentences} of "
+        f"{features.sentence_count}",
+        f"- Possible fallacy phrasing: {'; '.join(features.fallacies) or 'none'}",
+    ))
@@ -0,0 +1,6 @@
+"""Offline benchmarks for the DebateBot backend.
+
+Run from the backend directory, e.g. ``python -m benchmarks.debate_concurrency``.
+The benchmarks swap the Groq client for a local fake so no API key or network
+access is needed.
+"""
@@ -0,0 +1,137 @@
+"""Measure how generation budgets cut tail latency on rambling completions.
+
+Usage: python -m benchmarks.budgets [--requests 60] [--ramble-rate 0.1]
+       [--token-rate 400] [--seed 7]
+
+Sends /api/live-counter requests to a fake LLM that paces its output at
+``--token-rate`` tokens per second and, for ``--ramble-rate`` of calls,
+writes several times the requested length. The run is repeated with the
+budgets of budgets.py disabled and enabled; with them, the fake stops at
+``max_tokens`` and the server trims to the word limit, so p99 latency must
+drop and no counter may run more than one sentence past the limit.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.load import percentile
+
+import budgets
+import llm_client
+import main
+from tokens import count_tokens
+
+SENTENCE = (
+    "Evidence from recent studies contradicts this claim, "
+    "and the costs of the policy fall on families."
+)
+COUNTER_BODY = {
+    "topic": "Homework should be banned in primary schools.",
+    "round": "opening",
+    "use_cache": False,
+}
+
+
+@dataclass
+class BudgetedMessage:
+    content: str
+    response_metadata: dict = field(default_factory=dict)
+
+
+class RamblingFakeLLM(FakeLLM):
+    """Fake that sometimes overshoots its length, honouring a bound ``max_tokens``."""
+
+    def __init__(
+        self, ramble_rate: float, token_rate: float, seed: int,
+        max_tokens: int = None, rng=None,
+    ):
+        super().__init__(delay=0.02)
+        self.ramble_rate = ramble_rate
+        self.token_rate = token_rate
+        self.max_tokens = max_tokens
+        self.rng = rng or random.Random(seed)
+
+    def bind(self, max_tokens: int = None, **kwargs):
+        return RamblingFakeLLM(
+            self.ramble_rate, self.token_rate, 0, max_tokens, self.rng
+        )
+
+    async def ainvoke(self, prompt, **kwargs) -> BudgetedMessage:
+        # About 190 words normally; a rambling reply is four times as long
+        sentences = 12 if self.rng.random() >= self.ramble_rate else 48
+        reply = " ".join([SENTENCE] * sentences)
+        metadata = {"finish_reason": "stop"}
+        if self.max_tokens and count_tokens(reply) > self.max_tokens:
+            words = reply.split()
+            kept = int(len(words) * self.max_tokens / count_tokens(reply))
+            reply = " ".join(words[:kept])
+            metadata["finish_reason"] = "length"
+        await asyncio.sleep(self.delay + count_tokens(reply) / self.token_rate)
+        return BudgetedMessage(reply, metadata)
+
+
+async def run(client, args, enabled: bool) -> dict:
+    llm_client.llm = RamblingFakeLLM(args.ramble_rate, args.token_rate, args.seed)
+    llm_client.BUDGETS = budgets.BUDGETS if enabled else {}
+    llm_client.budget_stats = budgets.BudgetStats()
+    latencies, words = [], []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        argument = f"Homework takes {i + 2} hours a week from family time."
+        response = await client.post(
+            "/api/live-counter", json={**COUNTER_BODY, "user_argument": argument}
+        )
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        words.append(len(response.json()["counter_argument"].split()))
+    return {
+        "p50": round(percentile(latencies, 0.50), 3),
+        "p99": round(percentile(latencies, 0.99), 3),
+        "max_words": max(words),
+    }
+
+
+async def measure(args) -> dict:
+    transport = httpx.ASGITransport(app=main.app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        unbudgeted = await run(client, args, enabled=False)
+        budgeted = await run(client, args, enabled=True)
+    return {
+        "unbudgeted": unbudgeted,
+        "budgeted": budgeted,
+        "stats": llm_client.budget_stats.stats().get("counter"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument(
+        "--ramble-rate", type=float, default=0.1,
+        help="Fraction of replies that overshoot",
+    )
+    parser.add_argument(
+        "--token-rate", type=float, default=400.0,
+        help="Fake output tokens per second",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args))
+    print(report)
+    limit = budgets.BUDGETS["counter"].max_words + len(SENTENCE.split())
+    if report["budgeted"]["max_words"] > limit:
+        print(f"A budgeted counter ran past {limit} words")
+        sys.exit(1)
+    if report["budgeted"]["p99"] >= report["unbudgeted"]["p99"]:
+        print("Budgets did not reduce p99 latency")
+        sys.exit(1)
@@ -0,0 +1,61 @@
+"""Compare serial and concurrent /api/debate execution against a fake LLM.
+
+Usage: python -m benchmarks.debate_concurrency [--delay 0.2]
+
+With a fixed per-call delay the serial mode needs six round-trips and the
+concurrent mode three, so the expected speed-up is roughly 2x. The script
+exits non-zero if the concurrent run is not clearly faster.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks.fake_llm import FakeLLM
+
+import llm_client
+import main
+
+
+def time_debate(concurrent: bool) -> float:
+    request = main.DebateRequest(
+        topic="Paneer is the best dairy product.", concurrent=concurrent
+    )
+    start = time.perf_counter()
+    result = asyncio.run(main.run_debate(request))
+    elapsed = time.perf_counter() - start
+    assert set(result) == {"topic", "proposition", "opposition"}
+    return elapsed
+
+
+def run(delay: float) -> dict:
+    llm_client.llm = FakeLLM(delay=delay)
+    # Compile the graph up front so neither timed run pays for it
+    start = time.perf_counter()
+    main.get_debate_graph()
+    build = time.perf_counter() - start
+    serial = time_debate(concurrent=False)
+    concurrent = time_debate(concurrent=True)
+    return {
+        "delay": delay,
+        "graph_build_seconds": round(build, 3),
+        "serial_seconds": round(serial, 3),
+        "concurrent_seconds": round(concurrent, 3),
+        "speedup": round(serial / concurrent, 2),
+        "llm_calls": llm_client.llm.calls,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--delay", type=float, default=0.2, help="Fake LLM latency in seconds"
+    )
+    args = parser.parse_args()
+
+    report = run(args.delay)
+    print(report)
+    # Three round-trips instead of six; leave headroom for scheduling noise.
+    if report["speedup"] < 1.6:
+        print("Concurrent debate was not meaningfully faster than serial execution")
+        sys.exit(1)
@@ -0,0 +1,93 @@
+"""Check that concurrent requests overlap on the event loop.
+
+Usage: python -m benchmarks.event_loop_load [--requests 20] [--delay 0.3]
+
+Fires a burst of /api/live-counter requests at the app in-process while
+polling /api/health, once with a fake LLM that awaits (how ``invoke_llm``
+behaves) and once with one that blocks the loop (how a synchronous
+``llm.invoke`` inside an ``async def`` handler behaves). With a non-blocking
+LLM the burst should finish in about one LLM delay and health checks should
+stay fast.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_llm import BlockingFakeLLM, FakeLLM
+
+import llm_client
+import main
+
+COUNTER_BODY = {
+    "topic": "Homework should be banned.",
+    "user_argument": "Homework eats into family time and sleep.",
+    "round": "opening",
+    "argument_history": [],
+}
+
+
+async def measure(fake, requests: int) -> dict:
+    llm_client.llm = fake
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        health_latencies = []
+        done = asyncio.Event()
+
+        async def poll_health():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        # Distinct arguments so identical-prompt coalescing does not kick in
+        argument = COUNTER_BODY["user_argument"]
+        bodies = [
+            {**COUNTER_BODY, "user_argument": f"{argument} ({i})"}
+            for i in range(requests)
+        ]
+        poller = asyncio.create_task(poll_health())
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/api/live-counter", json=body) for body in bodies)
+        )
+        wall = time.perf_counter() - start
+        done.set()
+        await poller
+
+    assert all(r.status_code == 200 for r in responses)
+    return {
+        "wall_seconds": round(wall, 3),
+        "overlap": round(requests * fake.delay / wall, 2),
+        "max_health_seconds": round(max(health_latencies), 3),
+    }
+
+
+def run(requests: int, delay: float) -> dict:
+    return {
+        "requests": requests,
+        "delay": delay,
+        "async": asyncio.run(measure(FakeLLM(delay=delay), requests)),
+        "blocking": asyncio.run(measure(BlockingFakeLLM(delay=delay), requests)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument(
+        "--delay", type=float, default=0.3, help="Fake LLM latency in seconds"
+    )
+    args = parser.parse_args()
+
+    report = run(args.requests, args.delay)
+    print(report)
+    # Overlap is how many LLM calls were in flight on average; queueing gives ~1.
+    if report["async"]["overlap"] < args.requests / 2:
+        print("Requests queued behind each other instead of overlapping")
+        sys.exit(1)
@@ -0,0 +1,55 @@
+"""A local stand-in for the Groq chat completions API.
+
+Run with: python -m uvicorn benchmarks.fake_groq:app --port 9100
+
+Point the backend at it with GROQ_API_BASE=http://127.0.0.1:9100 to drive
+the real ChatGroq client and its HTTP connection pool without a key or
+quota. Every completion takes FAKE_GROQ_LATENCY seconds (default 0.05).
+JSON-mode requests get a valid judge reply, others a speech.
+"""
+import asyncio
+import os
+import time
+
+from fastapi import FastAPI, Request
+
+from benchmarks.fake_llm import SCORE_REPLY, SPEECH_REPLY
+
+LATENCY = float(os.getenv("FAKE_GROQ_LATENCY", "0.05"))
+
+app = FastAPI()
+app.state.completions = 0
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    app.state.completions += 1
+    await asyncio.sleep(LATENCY)
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    content = SCORE_REPLY if json_mode else SPEECH_REPLY
+    messages = body.get("messages", [])
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+    completion_tokens = len(content.split())
+    return {
+        "id": f"chatcmpl-{app.state.completions}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "logprobs": None,
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.get("/stats")
+def stats():
+    return {"completions": app.state.completions}
@@ -0,0 +1,168 @@
+import asyncio
+import math
+import os
+import random
+import time
+from dataclasses import dataclass
+
+import groq
+import httpx
+
+from tokens import count_tokens
+
+# llm_client builds a ChatGroq client on first use, which refuses to
+# start without a key. The fakes below replace it before any call is made.
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+# The fake has no upstream quota; only throttle when a benchmark asks to.
+os.environ.setdefault("GROQ_RPM", "0")
+
+
+# A judge reply that passes scoring.ArgumentScores validation
+SCORE_REPLY = (
+    '{"coherence": 0.8, "relevance": 0.9, '
+    '"evidence_strength": 0.6, "fallacy_penalty": 0.1, '
+    '"strongest_point": "Uniforms cut costs.", "weakest_point": "No figures given."}'
+)
+
+
+@dataclass
+class FakeMessage:
+    content: str
+
+
+class FakeLLM:
+    """Stand-in for ChatGroq that sleeps for a fixed delay per call."""
+
+    def __init__(
+        self, delay: float = 0.2, reply: str = "A fake argument. It has evidence."
+    ):
+        self.delay = delay
+        self.reply = reply
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs) -> FakeMessage:
+        self.calls += 1
+        time.sleep(self.delay)
+        return FakeMessage(self.reply)
+
+    async def ainvoke(self, prompt, **kwargs) -> FakeMessage:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return FakeMessage(self.reply)
+
+    async def astream(self, prompt, **kwargs):
+        self.calls += 1
+        words = self.reply.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.delay / len(words))
+            yield FakeMessage(word if i == 0 else " " + word)
+
+
+COACHING_FIELDS = (
+    '"message": "Almost there.", '
+    '"tips": [{"metric": "Evidence", "tip": "Cite a figure."}]'
+)
+FEEDBACK_REPLY = '{"type": "improvement", ' + COACHING_FIELDS + "}"
+COACHED_REPLY = SCORE_REPLY[:-1] + ", " + COACHING_FIELDS + "}"
+SPEECH_SENTENCE = (
+    "Evidence from recent studies supports this position, "
+    "and the costs of ignoring it are high."
+)
+SPEECH_REPLY = " ".join([SPEECH_SENTENCE] * 8)
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+class ProfiledFakeLLM(FakeLLM):
+    """Fake with random latency, output paced at a token rate and injected errors.
+
+    Each call waits a time-to-first-token drawn from ``distribution`` around
+    ``latency``, then streams the reply at ``token_rate`` tokens per second
+    (0 for instant). A fraction ``error_rate`` of calls fail with a Groq
+    connection error after the first-token wait. Replies are shaped by the
+    prompt, so judge and coach calls get JSON that passes validation.
+    """
+
+    def __init__(
+        self, latency: float = 0.2, distribution: str = "fixed",
+        token_rate: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+    ):
+        super().__init__(delay=latency)
+        self.distribution = distribution
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.errors = 0
+
+    def bind(self, **kwargs):
+        return self
+
+    def reply_for(self, prompt: str) -> str:
+        if '"coherence"' in prompt:
+            return COACHED_REPLY if '"tips"' in prompt else SCORE_REPLY
+        if '"tips"' in prompt:
+            return FEEDBACK_REPLY
+        return SPEECH_REPLY
+
+    def first_token_delay(self) -> float:
+        if self.distribution == "uniform":
+            return self.rng.uniform(0.5 * self.delay, 1.5 * self.delay)
+        if self.distribution == "lognormal":
+            sigma = 0.5
+            return self.rng.lognormvariate(math.log(self.delay) - sigma ** 2 / 2, sigma)
+        return self.delay
+
+    def token_delay(self, text: str) -> float:
+        return count_tokens(text) / self.token_rate if self.token_rate else 0.0
+
+    def injected_failure(self) -> groq.APIConnectionError:
+        self.errors += 1
+        request = httpx.Request("POST", "https://fake.groq")
+        return groq.APIConnectionError(message="Injected failure", request=request)
+
+    async def ainvoke(self, prompt, **kwargs) -> FakeMessage:
+        self.calls += 1
+        reply = self.reply_for(prompt)
+        await asyncio.sleep(self.first_token_delay())
+        if self.rng.random() < self.error_rate:
+            raise self.injected_failure()
+        await asyncio.sleep(self.token_delay(reply))
+        return FakeMessage(reply)
+
+    async def astream(self, prompt, **kwargs):
+        self.calls += 1
+        reply = self.reply_for(prompt)
+        await asyncio.sleep(self.first_token_delay())
+        if self.rng.random() < self.error_rate:
+            raise self.injected_failure()
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            chunk = word if i == 0 else " " + word
+            await asyncio.sleep(self.token_delay(chunk))
+            yield FakeMessage(chunk)
+
+
+class BlockingFakeLLM(FakeLLM):
+    """Fake whose async path blocks the event loop, like calling ``invoke``."""
+
+    async def ainvoke(self, prompt, **kwargs) -> FakeMessage:
+        return self.invoke(prompt, **kwargs)
+
+
+class FakeClock:
+    """Manually advanced clock for driving time-based components offline.
+
+    ``sleep`` yields to the event loop and then moves time forward to the
+    sleeper's wake-up point, so concurrent sleepers share simulated time
+    rather than adding their delays together.
+    """
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        wake = self.now + seconds
+        await asyncio.sleep(0)
+        self.now = max(self.now, wake)
@@ -0,0 +1,221 @@
+"""Load and latency benchmark for the main endpoints against a fake LLM.
+
+Usage: python -m benchmarks.load
+       [--endpoints debate,live-counter,score-argument,get-feedback]
+       [--concurrency 1,4,16] [--requests 24] [--latency 0.05] [--distribution fixed]
+       [--token-rate 0] [--error-rate 0] [--seed 7] [--output report.json]
+       [--baseline benchmarks/baseline.json] [--tolerance 0.25]
+
+Drives each endpoint in-process with ``--requests`` distinct requests at
+each concurrency level (a closed loop of that many clients) and prints a
+JSON report with p50/p95/p99 latency, requests per second, error count and
+upstream LLM calls per request. With ``--baseline`` the run fails when p95
+or throughput regress by more than ``--tolerance``, or when any endpoint
+starts making more LLM calls per request.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_llm import LATENCY_DISTRIBUTIONS, ProfiledFakeLLM
+
+import llm_client
+import main
+
+
+def uniform_argument(i: int) -> str:
+    return (
+        f"Uniforms cost families around ${100 + i} a year, "
+        "so abolishing them eases budgets."
+    )
+
+
+ENDPOINTS = {
+    "debate": ("/api/debate", lambda i: {
+        "topic": f"Homework should be banned in primary schools (motion {i}).",
+        "use_cache": False,
+    }),
+    "live-counter": ("/api/live-counter", lambda i: {
+        "topic": "Homework should be banned in primary schools.",
+        "user_argument": (
+            f"Homework eats into family time and sleep for {i + 2} hours a week."
+        ),
+        "round": "opening",
+        "use_cache": False,
+    }),
+    "score-argument": ("/api/score-argument", lambda i: {
+        "topic": "School uniforms should be abolished.",
+        "argument": uniform_argument(i),
+        "use_cache": False,
+    }),
+    "get-feedback": ("/api/get-feedback", lambda i: {
+        "topic": "School uniforms should be abolished.",
+        "argument": uniform_argument(i),
+        "scores": {
+            "coherence": 0.7, "relevance": 0.8, "evidenceStrength": 0.5,
+            "fallacyPenalty": 0.1, "argumentStrength": 0.62,
+        },
+        "target_score": 85,
+        "use_cache": False,
+    }),
+}
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_level(client, endpoint: str, concurrency: int, requests: int) -> dict:
+    """Send ``requests`` distinct requests from ``concurrency`` looping clients."""
+    path, body = ENDPOINTS[endpoint]
+    pending = iter(range(requests))
+    latencies, errors = [], 0
+    calls_before = llm_client.llm.calls
+
+    async def worker():
+        nonlocal errors
+        for i in pending:
+            start = time.perf_counter()
+            response = await client.post(path, json=body(i))
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    calls = llm_client.llm.calls - calls_before
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50": round(percentile(latencies, 0.50), 4),
+        "p95": round(percentile(latencies, 0.95), 4),
+        "p99": round(percentile(latencies, 0.99), 4),
+        "rps": round(requests / elapsed, 2),
+        "llm_calls_per_request": round(calls / requests, 2),
+    }
+
+
+async def measure(args) -> dict:
+    llm_client.llm = ProfiledFakeLLM(
+        args.latency, args.distribution, args.token_rate, args.error_rate, args.seed
+    )
+    transport = httpx.ASGITransport(app=main.app)
+    results = []
+    client = httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    )
+    async with client:
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                # The app logs every speech it generates; keep the report clean
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results.append(
+                        await run_level(client, endpoint, concurrency, args.requests)
+                    )
+
+    return {
+        "config": {
+            "latency": args.latency,
+            "distribution": args.distribution,
+            "token_rate": args.token_rate,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+        },
+        "injected_errors": llm_client.llm.errors,
+        "results": results,
+    }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list:
+    """Compare a report with a baseline report of the same configuration."""
+    expected = {(r["endpoint"], r["concurrency"]): r for r in baseline["results"]}
+    problems = []
+    for result in report["results"]:
+        base = expected.get((result["endpoint"], result["concurrency"]))
+        if base is None:
+            continue
+        label = f"{result['endpoint']} @ {result['concurrency']}"
+        if result["p95"] > base["p95"] * (1 + tolerance):
+            problems.append(f"{label}: p95 {result['p95']}s vs baseline {base['p95']}s")
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            problems.append(f"{label}: {result['rps']} req/s vs baseline {base['rps']}")
+        calls = result["llm_calls_per_request"]
+        base_calls = base["llm_calls_per_request"]
+        if calls > base_calls:
+            problems.append(
+                f"{label}: {calls} LLM calls/request vs baseline {base_calls}"
+            )
+        if result["errors"] > base["errors"]:
+            problems.append(
+                f"{label}: {result['errors']} errors vs baseline {base['errors']}"
+            )
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--endpoints", type=lambda v: v.split(","), default=list(ENDPOINTS)
+    )
+    parser.add_argument(
+        "--concurrency", type=lambda v: [int(c) for c in v.split(",")],
+        default=[1, 4, 16],
+    )
+    parser.add_argument(
+        "--requests", type=int, default=24,
+        help="Requests per endpoint and concurrency level",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05,
+        help="Mean fake LLM time to first token, seconds",
+    )
+    parser.add_argument(
+        "--distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed"
+    )
+    parser.add_argument(
+        "--token-rate", type=float, default=0.0,
+        help="Fake output tokens per second (0 = instant)",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="Fraction of fake LLM calls that fail",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument(
+        "--baseline", help="Fail on regressions against this earlier report"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed relative p95/throughput regression",
+    )
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(measure(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = regressions(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
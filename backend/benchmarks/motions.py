@@ -0,0 +1,180 @@
+"""Measure near-duplicate motion lookups at 10k and 100k stored motions.
+
+Usage: python -m benchmarks.motions [--sizes 10000 100000] [--queries 500]
+       [--target-ms 5] [--seed 7]
+
+Fills a MotionIndex with synthetic motions, then times lookups of three
+kinds: paraphrases of stored motions (case, punctuation, question form and
+"This House believes" wrappers), which must all match the motion they came
+from; negations of stored motions, which must never match; and unseen
+motions, which should not match. The index is also saved and reloaded, and
+the reloaded copy must answer the same. p99 lookup latency must stay under
+``--target-ms`` at every size.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.load import percentile
+
+from motions import MotionIndex
+
+SUBJECTS = """
+homework uniforms smartphones tablets calculators exams grades tuition scholarships
+libraries museums zoos circuses casinos lotteries tobacco alcohol sugar meat dairy
+cars trucks motorbikes scooters drones satellites rockets robots algorithms chatbots
+vaccines antibiotics hospitals pharmacies nurses doctors teachers parents athletes
+referees journalists bloggers influencers politicians monarchies senators judges
+juries prisons police soldiers borders tariffs taxes subsidies pensions wages unions
+factories mines forests rivers oceans beaches parks stadiums olympics billboards
+newspapers television podcasts videogames esports cryptocurrency banks mortgages
+landlords tenants airlines railways highways bicycles pedestrians tourists refugees
+""".split()
+QUALIFIERS = """
+public private foreign domestic rural urban digital national local international
+electric nuclear renewable organic genetic autonomous professional amateur elite
+""".split()
+PREDICATES = [
+    "should be banned in {place}",
+    "should be compulsory in {place}",
+    "should be taxed more heavily in {place}",
+    "do more harm than good in {place}",
+    "should receive public funding in {place}",
+    "should be privatised in {place}",
+    "are essential to {place}",
+]
+PLACES = """
+schools universities cities villages democracies europe africa asia workplaces
+households hospitals prisons sport politics media science society
+""".split()
+
+
+def motion(rng: random.Random) -> str:
+    subject = f"{rng.choice(QUALIFIERS)} {rng.choice(SUBJECTS)}"
+    predicate = rng.choice(PREDICATES)
+    place = rng.choice(PLACES)
+    return f"{subject.capitalize()} {predicate.format(place=place)}."
+
+
+def paraphrase(text: str, rng: random.Random) -> str:
+    body = text.rstrip(".")
+    forms = [
+        body.lower(),
+        f"  {body.upper()}!! ",
+        f"This House believes {body[0].lower()}{body[1:]}.",
+        f"{body}?",
+    ]
+    if " should " in body:
+        subject, rest = body.split(" should ", 1)
+        forms.append(f"Should {subject[0].lower()}{subject[1:]} {rest}?")
+    return rng.choice(forms)
+
+
+def negation(text: str) -> str:
+    if " should " in text:
+        return text.replace(" should ", " should not ", 1)
+    return text.replace(" are ", " are not ", 1).replace(" do ", " do not ", 1)
+
+
+def timed(index: MotionIndex, queries: list) -> tuple:
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(index.match(query))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def measure(size: int, args) -> dict:
+    rng = random.Random(args.seed)
+    stored = list(dict.fromkeys(motion(rng) for _ in range(size * 2)))[:size]
+    stored_set = set(stored)
+    index = MotionIndex()
+    start = time.perf_counter()
+    for text in stored:
+        index.add(text)
+    build_seconds = time.perf_counter() - start
+
+    sources = rng.sample(stored, args.queries)
+    paraphrases = [paraphrase(text, rng) for text in sources]
+    negations = [negation(text) for text in sources]
+    unseen = []
+    while len(unseen) < args.queries:
+        text = motion(rng)
+        if text not in stored_set:
+            unseen.append(text)
+
+    latencies, found = timed(index, paraphrases)
+    recalled = sum(
+        result is not None and result[0] == source
+        for result, source in zip(found, sources)
+    )
+    negation_latencies, negated = timed(index, negations)
+    unseen_latencies, unseen_found = timed(index, unseen)
+    latencies += negation_latencies + unseen_latencies
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "motions.json")
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        reloaded = MotionIndex.load(path)
+        load_seconds = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+    _, reloaded_found = timed(reloaded, paraphrases)
+
+    return {
+        "motions": len(index),
+        "build_seconds": round(build_seconds, 2),
+        "lookup_p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "lookup_p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "paraphrase_recall": round(recalled / len(sources), 3),
+        "negation_matches": sum(result is not None for result in negated),
+        "unseen_matches": sum(result is not None for result in unseen_found),
+        "save_seconds": round(save_seconds, 2),
+        "load_seconds": round(load_seconds, 2),
+        "index_mb": round(size_mb, 1),
+        "reload_consistent": reloaded_found == found,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument(
+        "--queries", type=int, default=500, help="Lookups of each kind per size"
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=5.0, help="Max p99 lookup latency"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    failed = False
+    for size in args.sizes:
+        report = measure(size, args)
+        print({"size": size, **report})
+        if report["paraphrase_recall"] < 1.0:
+            print(f"Paraphrases were missed at {size} motions")
+            failed = True
+        if report["negation_matches"]:
+            print(f"Negated motions matched at {size} motions")
+            failed = True
+        if not report["reload_consistent"]:
+            print(f"The reloaded index answered differently at {size} motions")
+            failed = True
+        if report["lookup_p99_ms"] > args.target_ms:
+            p99 = report["lookup_p99_ms"]
+            print(
+                f"p99 lookup latency {p99}ms is over {args.target_ms}ms "
+                f"at {size} motions"
+            )
+            failed = True
+    if failed:
+        sys.exit(1)
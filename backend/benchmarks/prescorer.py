@@ -0,0 +1,98 @@
+"""Measure the local pre-scorer over a corpus of arguments.
+
+Usage: python -m benchmarks.prescorer [--repeat 200] [--delay 0.3]
+
+Times ``analyze_argument`` over benchmarks/arguments.json, then scores the
+corpus through /api/score-argument against a slow fake LLM, once with the
+full judge and once in fast mode. Trivial inputs must never reach the LLM,
+fast mode must not call it at all, and local analysis must stay well under
+a millisecond per argument.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fake_llm import SCORE_REPLY, FakeLLM
+
+import llm_client
+import main
+from analysis import analyze_argument
+
+CORPUS = json.loads((Path(__file__).parent / "arguments.json").read_text())
+MAX_ANALYSIS_MICROSECONDS = 1000
+
+
+def time_analysis(repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in CORPUS:
+            analyze_argument(item["argument"], item["topic"])
+    return (time.perf_counter() - start) / (repeat * len(CORPUS)) * 1e6
+
+
+async def score_corpus(client, fast: bool, delay: float) -> dict:
+    llm_client.llm = FakeLLM(delay=delay, reply=SCORE_REPLY)
+    requests_before = llm_client.router.requests.get("score", 0)
+    start = time.perf_counter()
+    bodies = [{**item, "fast": fast, "use_cache": False} for item in CORPUS]
+    responses = await asyncio.gather(
+        *(client.post("/api/score-argument", json=body) for body in bodies)
+    )
+    assert all(r.status_code == 200 for r in responses)
+    return {
+        "seconds": round(time.perf_counter() - start, 3),
+        # Judge requests, before any escalation to a larger model
+        "judge_requests": llm_client.router.requests.get("score", 0) - requests_before,
+        "llm_calls": llm_client.llm.calls,
+    }
+
+
+async def measure(repeat: int, delay: float) -> dict:
+    trivial = sum(
+        analyze_argument(item["argument"], item["topic"]).trivial for item in CORPUS
+    )
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        full = await score_corpus(client, fast=False, delay=delay)
+        fast = await score_corpus(client, fast=True, delay=delay)
+
+    return {
+        "arguments": len(CORPUS),
+        "trivial": trivial,
+        "analysis_microseconds": round(time_analysis(repeat), 1),
+        "full": full,
+        "fast": fast,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="Passes over the corpus when timing analysis",
+    )
+    parser.add_argument(
+        "--delay", type=float, default=0.3, help="Fake LLM latency in seconds"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args.repeat, args.delay))
+    print(report)
+    if report["analysis_microseconds"] > MAX_ANALYSIS_MICROSECONDS:
+        print("Local analysis is too slow to run on every request")
+        sys.exit(1)
+    if report["full"]["judge_requests"] != report["arguments"] - report["trivial"]:
+        print("Trivial arguments reached the LLM")
+        sys.exit(1)
+    if report["fast"]["llm_calls"] != 0:
+        print("Fast mode called the LLM")
+        sys.exit(1)
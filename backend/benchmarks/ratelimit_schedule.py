@@ -0,0 +1,55 @@
+"""Simulate the Groq rate limiter on a fake clock.
+
+Usage: python -m benchmarks.ratelimit_schedule
+
+Queues a burst of bulk calls (debates, scoring) followed by a few
+interactive live-counter calls against a 30 RPM limit, with simulated time.
+Interactive calls should be admitted ahead of the queued bulk calls, and
+bulk calls that would wait past their max wait should be rejected with a
+retry hint instead of being sent upstream.
+"""
+import asyncio
+import sys
+
+from benchmarks.fake_llm import FakeClock
+
+from ratelimit import RateLimitExceeded, Scheduler
+
+
+async def simulate() -> dict:
+    clock = FakeClock()
+    scheduler = Scheduler(30, 100_000, max_wait={"interactive": 10, "bulk": 30},
+                          clock=clock, sleep=clock.sleep)
+    admitted = []
+    rejected = []
+
+    async def call(name: str, priority: str):
+        try:
+            await scheduler.acquire(priority, 500)
+            admitted.append((name, round(clock(), 1)))
+        except RateLimitExceeded as e:
+            rejected.append((name, round(e.retry_after, 1)))
+
+    # Drain the initial burst allowance so everything after has to queue
+    await asyncio.gather(*(call(f"warmup-{i}", "bulk") for i in range(30)))
+    bulk = [call(f"bulk-{i}", "bulk") for i in range(20)]
+    interactive = [call(f"counter-{i}", "interactive") for i in range(3)]
+    await asyncio.gather(*bulk, *interactive)
+
+    queued = [name for name, _ in admitted if not name.startswith("warmup")]
+    return {
+        "admission_order": queued,
+        "admitted_at": dict(admitted[30:]),
+        "rejected": dict(rejected),
+    }
+
+
+if __name__ == "__main__":
+    report = asyncio.run(simulate())
+    print(report)
+    if report["admission_order"][:3] != ["counter-0", "counter-1", "counter-2"]:
+        print("Interactive calls were not admitted ahead of queued bulk calls")
+        sys.exit(1)
+    if not report["rejected"]:
+        print("Bulk calls past their max wait were not rejected")
+        sys.exit(1)
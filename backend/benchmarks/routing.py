@@ -0,0 +1,119 @@
+"""Compare judge latency with the small-first score cascade and the large model alone.
+
+Usage: python -m benchmarks.routing [--small 0.05] [--large 0.3]
+       [--invalid-rate 0.2] [--seed 7]
+
+Scores the non-trivial arguments of benchmarks/arguments.json through
+/api/score-argument against a fake with two tiers: a fast small model that
+returns broken JSON for ``--invalid-rate`` of its calls, and a slow large
+model that always answers correctly. Every broken small-model reply must be
+escalated, and the cascade must still beat routing every call to the large
+model.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_llm import SCORE_REPLY, FakeMessage
+from benchmarks.prescorer import CORPUS
+
+import llm_client
+import main
+from analysis import analyze_argument
+from routing import LARGE_MODEL, SMALL_MODEL, ModelRouter
+
+
+class TieredFakeLLM:
+    """Fake client whose latency and reliability depend on the bound model."""
+
+    def __init__(
+        self, small_delay: float, large_delay: float, invalid_rate: float, seed: int
+    ):
+        self.model_name = LARGE_MODEL
+        self.delays = {SMALL_MODEL: small_delay, LARGE_MODEL: large_delay}
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.calls = {SMALL_MODEL: 0, LARGE_MODEL: 0}
+        self.invalid = 0
+
+    def bind(self, model: str = None, **kwargs):
+        return BoundFake(self, model or self.model_name)
+
+
+class BoundFake:
+    def __init__(self, fake: TieredFakeLLM, model: str):
+        self.fake = fake
+        self.model = model
+
+    async def ainvoke(self, prompt, **kwargs) -> FakeMessage:
+        fake = self.fake
+        fake.calls[self.model] += 1
+        await asyncio.sleep(fake.delays[self.model])
+        if self.model == SMALL_MODEL and fake.rng.random() < fake.invalid_rate:
+            fake.invalid += 1
+            return FakeMessage(SCORE_REPLY[: len(SCORE_REPLY) // 2])
+        return FakeMessage(SCORE_REPLY)
+
+
+async def score_corpus(client, router: ModelRouter, args) -> dict:
+    llm_client.llm = TieredFakeLLM(args.small, args.large, args.invalid_rate, args.seed)
+    llm_client.router = router
+    items = [
+        item for item in CORPUS
+        if not analyze_argument(item["argument"], item["topic"]).trivial
+    ]
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        body = {**item, "use_cache": False}
+        response = await client.post("/api/score-argument", json=body)
+        assert response.status_code == 200
+        latencies.append(time.perf_counter() - start)
+    return {
+        "mean_seconds": round(sum(latencies) / len(latencies), 3),
+        "calls": dict(llm_client.llm.calls),
+        "invalid_small_replies": llm_client.llm.invalid,
+        "routes": router.stats().get("score", {}),
+    }
+
+
+async def measure(args) -> dict:
+    transport = httpx.ASGITransport(app=main.app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        large = ModelRouter(routes={"score": ("large",)})
+        large_only = await score_corpus(client, large, args)
+        cascade = await score_corpus(client, ModelRouter(), args)
+    return {"large_only": large_only, "cascade": cascade}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--small", type=float, default=0.05, help="Fake small-model latency in seconds"
+    )
+    parser.add_argument(
+        "--large", type=float, default=0.3, help="Fake large-model latency in seconds"
+    )
+    parser.add_argument(
+        "--invalid-rate", type=float, default=0.2,
+        help="Fraction of small-model replies that are broken",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args))
+    print(report)
+    cascade = report["cascade"]
+    if cascade["routes"].get("escalations", 0) < cascade["invalid_small_replies"]:
+        print("Broken small-model replies were not escalated")
+        sys.exit(1)
+    if cascade["mean_seconds"] >= report["large_only"]["mean_seconds"]:
+        print("The score cascade was not faster than the large model alone")
+        sys.exit(1)
@@ -0,0 +1,233 @@
+"""Compare one uvicorn process with gunicorn workers and check graceful shutdown.
+
+Usage: python -m benchmarks.serving [--workers 4] [--concurrency 32] [--requests 300]
+       [--latency 0.05] [--min-speedup 0]
+
+Starts the fake Groq API of benchmarks/fake_groq.py, then serves the app
+twice against it: as a single ``uvicorn main:app`` process and with
+``gunicorn -c gunicorn.conf.py main:app`` running ``--workers`` workers.
+Each is driven with a mix of /api/debate, /api/live-counter and
+/api/score-argument requests from ``--concurrency`` clients, going through
+the real ChatGroq client and its connection pool.
+
+The gunicorn server is then sent SIGTERM while a debate job and several
+debates are in flight: every in-flight request must still succeed and the
+job must be stored as done. The gunicorn run must reach ``--min-speedup``
+times the single process's requests per second; the default of 0 only
+reports it, since the gain depends on the CPUs available.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.load import ENDPOINTS, percentile
+
+BACKEND = Path(__file__).resolve().parent.parent
+MIX = ("score-argument", "live-counter", "debate")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited before {url} answered")
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not answer within {timeout}s")
+
+
+def launch(command: list, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        command, cwd=BACKEND, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def stop(process: subprocess.Popen):
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def drive(base_url: str, concurrency: int, requests: int) -> dict:
+    """Send ``requests`` mixed requests from ``concurrency`` looping clients."""
+    pending = iter(range(requests))
+    latencies, errors = [], 0
+
+    async def worker(client):
+        nonlocal errors
+        for i in pending:
+            path, body = ENDPOINTS[MIX[i % len(MIX)]]
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body(i))
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        # Warm every worker's client and graph before timing
+        await asyncio.gather(*(client.get("/api/health") for _ in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50": round(percentile(latencies, 0.50), 4),
+        "p95": round(percentile(latencies, 0.95), 4),
+        "rps": round(requests / elapsed, 2),
+    }
+
+
+async def shutdown_check(
+    base_url: str, server: subprocess.Popen, job_path: str, in_flight: int
+) -> dict:
+    """SIGTERM the server with work in flight; nothing accepted may be lost."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        job_body = {"topic": "Zoos should be banned.", "use_cache": False}
+        job = (await client.post("/api/debate/jobs", json=job_body)).json()
+        path, body = ENDPOINTS["debate"]
+        requests = [
+            asyncio.ensure_future(client.post(path, json=body(10_000 + i)))
+            for i in range(in_flight)
+        ]
+        await asyncio.sleep(0.1)
+        server.send_signal(signal.SIGTERM)
+        responses = await asyncio.gather(*requests, return_exceptions=True)
+    exit_code = await asyncio.to_thread(server.wait, 60)
+    with sqlite3.connect(job_path) as conn:
+        row = conn.execute(
+            "SELECT data FROM jobs WHERE id = ?", (job["job_id"],)
+        ).fetchone()
+    return {
+        "in_flight": in_flight,
+        "completed": sum(
+            not isinstance(r, Exception) and r.status_code == 200 for r in responses
+        ),
+        "job_status": json.loads(row[0])["status"] if row else None,
+        "exit_code": exit_code,
+    }
+
+
+def measure(args) -> dict:
+    tmp = tempfile.mkdtemp()
+    fake_port, single_port, multi_port = free_port(), free_port(), free_port()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "benchmark-placeholder",
+        "GROQ_API_BASE": f"http://127.0.0.1:{fake_port}",
+        "GROQ_RPM": "0",
+        "FAKE_GROQ_LATENCY": str(args.latency),
+        "DEBATE_JOB_PATH": os.path.join(tmp, "debate_jobs.sqlite3"),
+        "SESSION_PATH": os.path.join(tmp, "sessions.sqlite3"),
+    }
+    single_url = f"http://127.0.0.1:{single_port}"
+    multi_url = f"http://127.0.0.1:{multi_port}"
+    uvicorn = [sys.executable, "-m", "uvicorn", "--log-level", "warning"]
+    fake = launch(
+        uvicorn + ["benchmarks.fake_groq:app", "--port", str(fake_port)], env
+    )
+    report = {"cpus": os.cpu_count(), "workers": args.workers}
+    try:
+        wait_for(f"http://127.0.0.1:{fake_port}/stats", fake)
+
+        single = launch(uvicorn + ["main:app", "--port", str(single_port)], env)
+        try:
+            wait_for(f"{single_url}/api/health", single)
+            report["single"] = asyncio.run(
+                drive(single_url, args.concurrency, args.requests)
+            )
+        finally:
+            stop(single)
+
+        gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+        multi_env = {
+            **env, "PORT": str(multi_port), "WEB_CONCURRENCY": str(args.workers)
+        }
+        multi = launch(gunicorn + ["main:app"], multi_env)
+        try:
+            wait_for(f"{multi_url}/api/health", multi)
+            report["gunicorn"] = asyncio.run(
+                drive(multi_url, args.concurrency, args.requests)
+            )
+            report["shutdown"] = asyncio.run(shutdown_check(
+                multi_url, multi, env["DEBATE_JOB_PATH"], args.in_flight
+            ))
+        finally:
+            stop(multi)
+    finally:
+        stop(fake)
+    report["speedup"] = round(report["gunicorn"]["rps"] / report["single"]["rps"], 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="gunicorn worker processes"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Concurrent clients"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=300, help="Requests per server"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05,
+        help="Fake Groq seconds per completion",
+    )
+    parser.add_argument(
+        "--in-flight", type=int, default=8, help="Debates in flight at SIGTERM"
+    )
+    parser.add_argument("--min-speedup", type=float, default=0.0)
+    args = parser.parse_args()
+
+    report = measure(args)
+    print(json.dumps(report, indent=2))
+    failed = False
+    for mode in ("single", "gunicorn"):
+        if report[mode]["errors"]:
+            print(f"{report[mode]['errors']} requests failed under {mode}")
+            failed = True
+    shutdown = report["shutdown"]
+    dropped = shutdown["completed"] < shutdown["in_flight"]
+    if dropped or shutdown["job_status"] != "done":
+        print("Work in flight at SIGTERM was dropped")
+        failed = True
+    if report["speedup"] < args.min_speedup:
+        print(
+            f"gunicorn reached {report['speedup']}x the single process, "
+            f"below {args.min_speedup}x"
+        )
+        failed = True
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,70 @@
+"""Check that concurrent identical requests share one LLM call.
+
+Usage: python -m benchmarks.singleflight [--clients 30] [--delay 0.3]
+
+Simulates a classroom submitting the same motion to /api/debate at once and
+a double-fired /api/score-argument, against a slow fake LLM. A full debate
+is six LLM calls, so every client after the first should be served by the
+in-flight calls of the first.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_llm import SCORE_REPLY, FakeLLM
+
+import llm_client
+import main
+
+
+async def burst(client, path: str, body: dict, clients: int) -> float:
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        *(client.post(path, json=body) for _ in range(clients))
+    )
+    assert all(r.status_code == 200 for r in responses)
+    return time.perf_counter() - start
+
+
+async def measure(clients: int, delay: float) -> dict:
+    llm_client.llm = FakeLLM(delay=delay)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        debate = {"topic": "School uniforms should be abolished."}
+        debate_seconds = await burst(client, "/api/debate", debate, clients)
+        debate_calls = llm_client.llm.calls
+        llm_client.llm = FakeLLM(delay=delay, reply=SCORE_REPLY)
+        argument = "Uniforms cut costs for families on low incomes."
+        score = {"argument": argument, "topic": "Uniforms"}
+        await burst(client, "/api/score-argument", score, 2)
+        score_calls = llm_client.llm.calls
+        stats = (await client.get("/api/singleflight/stats")).json()
+
+    return {
+        "clients": clients,
+        "delay": delay,
+        "debate_seconds": round(debate_seconds, 3),
+        "debate_llm_calls": debate_calls,
+        "score_llm_calls": score_calls,
+        "coalesced": stats.get("coalesced"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=30)
+    parser.add_argument(
+        "--delay", type=float, default=0.3, help="Fake LLM latency in seconds"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args.clients, args.delay))
+    print(report)
+    if report["debate_llm_calls"] != 6 or report["score_llm_calls"] != 1:
+        print("Identical in-flight requests were not coalesced")
+        sys.exit(1)
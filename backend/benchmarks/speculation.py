@@ -0,0 +1,115 @@
+"""Compare live-debate round latency with and without speculative drafts.
+
+Usage: python -m benchmarks.speculation [--per-word 0.004] [--typing 1.5]
+
+Plays a three-round live debate against a fake LLM whose latency grows with
+the word cap in the prompt, as real output-bound generation does. With
+``speculate`` the server drafts each round while the simulated user types,
+so every counter should be a shorter refinement of a ready draft.
+"""
+import argparse
+import asyncio
+import re
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_llm import FakeLLM, FakeMessage
+
+import llm_client
+import main
+from metrics import speculative_drafts
+
+_WORD_CAP = re.compile(r"max (\d+) words")
+
+ARGUMENTS = {
+    "opening": (
+        "Homework eats into family time and sleep, "
+        "and young children learn more through play."
+    ),
+    "rebuttal": (
+        "Studies show homework in primary school has almost no effect on test scores."
+    ),
+    "closing": (
+        "Without homework, children arrive at school rested and ready to learn."
+    ),
+}
+
+
+class WordBudgetLLM(FakeLLM):
+    """Fake whose latency is proportional to the prompt's word cap."""
+
+    def __init__(self, per_word: float):
+        super().__init__(delay=0.0, reply="A fake counter. It cites evidence.")
+        self.per_word = per_word
+
+    async def ainvoke(self, prompt, **kwargs) -> FakeMessage:
+        self.calls += 1
+        match = _WORD_CAP.search(prompt)
+        await asyncio.sleep(self.per_word * int(match.group(1)) if match else 0.01)
+        return FakeMessage(f"{self.reply} ({self.calls})")
+
+
+async def play(client, speculate: bool, typing: float) -> list:
+    topic = "Homework should be banned in primary schools."
+    created = await client.post("/api/live-sessions", json={"topic": topic})
+    session_id = created.json()["session_id"]
+    if speculate:
+        await client.post(
+            f"/api/live-sessions/{session_id}/prepare", json={"round": "opening"}
+        )
+
+    latencies = []
+    for round_type, argument in ARGUMENTS.items():
+        await asyncio.sleep(typing)
+        start = time.perf_counter()
+        response = await client.post("/api/live-counter", json={
+            "session_id": session_id,
+            "user_argument": argument,
+            "round": round_type,
+            "speculate": speculate,
+            "use_cache": False,
+        })
+        assert response.status_code == 200
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def measure(per_word: float, typing: float) -> dict:
+    llm_client.llm = WordBudgetLLM(per_word)
+    transport = httpx.ASGITransport(app=main.app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        baseline = await play(client, speculate=False, typing=typing)
+        speculative = await play(client, speculate=True, typing=typing)
+
+    return {
+        "per_word": per_word,
+        "typing_seconds": typing,
+        "baseline_round_seconds": round(sum(baseline) / len(baseline), 3),
+        "speculative_round_seconds": round(sum(speculative) / len(speculative), 3),
+        "drafts_used": speculative_drafts.values.get(("used",), 0),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--per-word", type=float, default=0.004,
+        help="Fake LLM seconds per allowed output word",
+    )
+    parser.add_argument(
+        "--typing", type=float, default=1.5,
+        help="Seconds the simulated user spends typing each round",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args.per_word, args.typing))
+    print(report)
+    if report["drafts_used"] != len(ARGUMENTS):
+        print("Speculative drafts were not used for every round")
+        sys.exit(1)
+    if report["speculative_round_seconds"] >= report["baseline_round_seconds"]:
+        print("Speculation did not reduce round latency")
+        sys.exit(1)
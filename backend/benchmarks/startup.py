@@ -0,0 +1,126 @@
+"""Measure backend cold start: import cost and time to the first /api/health.
+
+Usage: python -m benchmarks.startup [--runs 3] [--target 2.0] [--top 10]
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+reports the slowest top-level imports, then starts uvicorn on a free port
+``--runs`` times and times each launch until /api/health answers. Fails if
+the median exceeds ``--target`` seconds or if importing the app pulls in
+LangGraph, langchain_groq or groq, which are only needed once an LLM is
+called.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+DEFERRED_MODULES = ("langgraph", "langchain_groq", "groq")
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def startup_env() -> dict:
+    # A placeholder key lets the app import without credentials; no call is made
+    return {**os.environ, "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "benchmark")}
+
+
+def import_report(top: int) -> dict:
+    """Import main in a fresh interpreter and summarise ``-X importtime`` output."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND, env=startup_env(), capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    children, slowest = [], []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        # Imports are listed after their own dependencies, each level indented
+        # two more spaces
+        if len(indent) == 3:
+            children.append((name, int(cumulative)))
+        elif len(indent) == 1:
+            if name == "main":
+                slowest = children
+            children = []
+    slowest.sort(key=lambda item: item[1], reverse=True)
+    return {
+        "import_main_seconds": round(modules.get("main", 0) / 1e6, 3),
+        "slowest_imports": [
+            {"module": name, "seconds": round(us / 1e6, 3)}
+            for name, us in slowest[:top]
+        ],
+        "deferred_but_imported": [name for name in DEFERRED_MODULES if name in modules],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_health(timeout: float = 30.0) -> float:
+    """Start uvicorn and return the seconds until /api/health first answers 200."""
+    port = free_port()
+    start = time.perf_counter()
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(port), "--log-level", "warning",
+    ]
+    server = subprocess.Popen(
+        command, cwd=BACKEND, env=startup_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1.0)
+                if response.status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before /api/health answered")
+            time.sleep(0.01)
+        raise TimeoutError(f"/api/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Server launches to time")
+    parser.add_argument(
+        "--target", type=float, default=2.0,
+        help="Maximum median seconds to first /api/health",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    report = import_report(args.top)
+    launches = [time_to_health() for _ in range(args.runs)]
+    report["health_seconds"] = [round(seconds, 3) for seconds in launches]
+    report["median_health_seconds"] = round(statistics.median(launches), 3)
+    report["target_seconds"] = args.target
+    print(report)
+    if report["deferred_but_imported"]:
+        deferred = ", ".join(report["deferred_but_imported"])
+        print(f"Startup imports {deferred}; these should load on first LLM use")
+        sys.exit(1)
+    if report["median_health_seconds"] > args.target:
+        print("Time to first /api/health is over target")
+        sys.exit(1)
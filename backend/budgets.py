@@ -0,0 +1,157 @@
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+
+from metrics import output_overruns, trimmed_tokens
+from tokens import count_tokens
+
+# A sentence ends at . ! or ? (plus closing quotes) followed by whitespace, so
+# "3.5%" does not split. A final fragment without end punctuation is its own match.
+_SENTENCE = re.compile(r".*?[.!?]+[\"')\]]*(?:\s+|$)|.+", re.S)
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s*$")
+_BOUNDARY = re.compile(r"[.!?][\"')\]]*(?=\s)")
+
+# Meta commentary models sometimes append after the speech itself
+PROSE_STOPS = ("\n\nNote:", "\n\nWord count", "\n---")
+
+
+@dataclass(frozen=True)
+class GenerationBudget:
+    """Output limits for one task.
+
+    ``max_tokens`` is the hard cap sent upstream. Prose tasks also set
+    ``max_words``: the text is cut after the sentence in progress once that
+    many words are reached, so answers always end on a full sentence.
+    """
+    max_tokens: int
+    max_words: int = None
+    stop: tuple = ()
+
+    def scaled(self, items: int) -> "GenerationBudget":
+        """The budget for a call answering ``items`` requests at once."""
+        return replace(self, max_tokens=self.max_tokens * items)
+
+
+# Token caps leave room for the word limit (about 1.3 tokens per word) plus
+# the sentence that crosses it; JSON tasks are only capped, never trimmed
+BUDGETS = {
+    "opening": GenerationBudget(max_tokens=280, max_words=150, stop=PROSE_STOPS),
+    "rebuttal": GenerationBudget(max_tokens=280, max_words=150, stop=PROSE_STOPS),
+    "closing": GenerationBudget(max_tokens=280, max_words=150, stop=PROSE_STOPS),
+    "counter": GenerationBudget(max_tokens=360, max_words=200, stop=PROSE_STOPS),
+    "draft": GenerationBudget(max_tokens=360),
+    "summary": GenerationBudget(max_tokens=80, max_words=30),
+    "score": GenerationBudget(max_tokens=700),
+    "feedback": GenerationBudget(max_tokens=500),
+}
+
+# A coached score (/api/score-argument with target_score) is one "score" call
+# whose reply also carries the feedback message and tips
+COACHED_SCORE_BUDGET = GenerationBudget(
+    max_tokens=BUDGETS["score"].max_tokens + BUDGETS["feedback"].max_tokens
+)
+
+
+def trim_to_budget(text: str, max_words: int, complete: bool = True) -> str:
+    """Keep the sentences that start within ``max_words`` words.
+
+    When generation was cut off (``complete=False``), an unfinished last
+    sentence is dropped too, unless it is the only one.
+    """
+    sentences = _SENTENCE.findall(text)
+    kept, words = [], 0
+    for sentence in sentences:
+        if words >= max_words:
+            break
+        kept.append(sentence)
+        words += len(sentence.split())
+    if not complete and len(kept) > 1 and not _SENTENCE_END.search(kept[-1]):
+        kept.pop()
+    return "".join(kept).rstrip() if len(kept) < len(sentences) else text
+
+
+class StreamBudget:
+    """Tracks a streamed completion and says when to stop reading it.
+
+    Once ``max_words`` words have been emitted, the stream continues only to
+    the end of the current sentence.
+    """
+
+    def __init__(self, max_words: int):
+        self.max_words = max_words
+        self.text = ""
+
+    def feed(self, chunk: str) -> tuple:
+        """Return (text to emit, whether the stream should stop after it)."""
+        if len(self.text.split()) < self.max_words:
+            self.text += chunk
+            return chunk, False
+        # Past the limit: emit up to the next sentence end. A chunk may start
+        # with the whitespace that confirms the previous one ended a sentence.
+        if chunk[:1].isspace() and _SENTENCE_END.search(self.text):
+            return "", True
+        match = _BOUNDARY.search(chunk)
+        if match is None:
+            self.text += chunk
+            return chunk, False
+        emitted = chunk[:match.end()]
+        self.text += emitted
+        return emitted, True
+
+
+COUNTS = ("calls", "capped", "trimmed", "stopped_early", "trimmed_tokens")
+
+
+class BudgetStats:
+    """Per-stage counts of output limits being hit, for tuning the budgets."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.lock = threading.Lock()
+        self.stages = {}
+
+    def _stage(self, stage: str) -> dict:
+        if stage not in self.stages:
+            self.stages[stage] = {
+                "calls": 0, "capped": 0, "trimmed": 0, "stopped_early": 0,
+                "trimmed_tokens": 0, "tokens": deque(maxlen=self.window),
+            }
+        return self.stages[stage]
+
+    def record(
+        self, stage: str, completion_tokens: int, capped: bool = False,
+        trimmed_text: str = "", stopped_early: bool = False,
+    ):
+        removed = count_tokens(trimmed_text) if trimmed_text else 0
+        with self.lock:
+            entry = self._stage(stage)
+            entry["calls"] += 1
+            entry["tokens"].append(completion_tokens - removed)
+            entry["capped"] += capped
+            entry["trimmed"] += bool(trimmed_text)
+            entry["stopped_early"] += stopped_early
+            entry["trimmed_tokens"] += removed
+        if capped:
+            output_overruns.inc(stage=stage, kind="max_tokens")
+        if trimmed_text:
+            output_overruns.inc(stage=stage, kind="trimmed")
+            trimmed_tokens.inc(removed, stage=stage)
+        if stopped_early:
+            output_overruns.inc(stage=stage, kind="stopped_early")
+
+    def stats(self) -> dict:
+        with self.lock:
+            report = {}
+            for stage, entry in sorted(self.stages.items()):
+                tokens = sorted(entry["tokens"])
+                p95 = min(len(tokens) - 1, int(0.95 * len(tokens)))
+                budget = BUDGETS.get(stage)
+                report[stage] = {
+                    "max_tokens": budget.max_tokens if budget else None,
+                    "max_words": budget.max_words if budget else None,
+                    **{key: entry[key] for key in COUNTS},
+                    "tokens_p50": tokens[len(tokens) // 2] if tokens else 0,
+                    "tokens_p95": tokens[p95] if tokens else 0,
+                }
+            return report
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlite_store import SQLiteStore
+
+# Which endpoint each LLM task belongs to, for per-endpoint cache settings.
+TASK_ENDPOINTS = {
+    "opening": "debate",
+    "rebuttal": "debate",
+    "closing": "debate",
+    "counter": "live-counter",
+    "draft": "live-counter",
+    "score": "score-argument",
+    "feedback": "get-feedback",
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so indentation-only prompt differences share a key."""
+    return " ".join(prompt.split())
+
+
+def cache_key(prompt: str, params: dict) -> str:
+    """Hash a normalized prompt together with the model parameters."""
+    payload = json.dumps(
+        {"prompt": normalize_prompt(prompt), "params": params}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """In-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(
+        self, max_entries: int = 1024, ttl: float = 3600, clock=time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self.clock() >= expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self.lock:
+            self.entries[key] = (value, self.clock() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SQLiteCache(SQLiteStore):
+    """On-disk cache in a SQLite file, shared across workers and restarts.
+
+    Every write deletes expired entries and, beyond ``max_entries``, the
+    oldest ones, so the file stays bounded. Reads do not refresh an entry:
+    that would turn every cache hit into a write shared by all workers.
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache.sqlite3",
+        ttl: float = 86400,
+        clock=time.time,
+        max_entries: int = 10000,
+    ):
+        super().__init__(
+            path,
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS responses_expiry ON responses (expires_at)",
+        )
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.clock() >= row[1]:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, self.clock() + self.ttl),
+            )
+            self.conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (self.clock(),)
+            )
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY expires_at "
+                "LIMIT max(0, (SELECT COUNT(*) FROM responses) - ?))",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """LLM response cache with per-endpoint opt-in and hit/miss counters."""
+
+    def __init__(self, backend, endpoints=()):
+        self.backend = backend
+        self.endpoints = set(endpoints)
+        self.hits = {}
+        self.misses = {}
+
+    def enabled(self, task: str) -> bool:
+        return TASK_ENDPOINTS.get(task, task) in self.endpoints
+
+    def get(self, task: str, key: str):
+        value = self.backend.get(key)
+        counter = self.hits if value is not None else self.misses
+        counter[task] = counter.get(task, 0) + 1
+        return value
+
+    def set(self, key: str, value: str):
+        self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        return {
+            "endpoints": sorted(self.endpoints),
+            "entries": len(self.backend),
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+        }
+
+
+def build_cache() -> ResponseCache:
+    """Build the response cache from the LLM_CACHE_* environment variables.
+
+    Sampling runs at temperature 0.6, so caching replays one sample for every
+    identical request. It is therefore off unless LLM_CACHE_ENDPOINTS names
+    the endpoints that should use it (e.g. "debate,score-argument").
+    """
+    endpoints = [
+        e.strip() for e in os.getenv("LLM_CACHE_ENDPOINTS", "").split(",") if e.strip()
+    ]
+    ttl = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    if os.getenv("LLM_CACHE_BACKEND", "memory") == "sqlite":
+        backend = SQLiteCache(
+            os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            ttl=ttl,
+            max_entries=int(os.getenv("LLM_CACHE_SQLITE_SIZE", "10000")),
+        )
+    else:
+        backend = MemoryCache(int(os.getenv("LLM_CACHE_SIZE", "1024")), ttl=ttl)
+    return ResponseCache(backend, endpoints)
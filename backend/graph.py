@@ -1,125 +1,310 @@
-import os
-from dotenv import load_dotenv
-from typing import TypedDict
-from langchain_groq import ChatGroq
-from langgraph.graph import StateGraph, START, END
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Annotated, TypedDict
+from llm_client import invoke_llm, stream_llm
+from history import compactor, render_entries
+from streaming import merge_streams
 
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+DEBATE_SIDES = ("proposition", "opposition")
+DEBATE_STAGES = ("opening", "rebuttal", "closing")
+
+# Failed debates kept in the checkpointer so a retry can resume them
+MAX_RESUMABLE_DEBATES = 256
+
+
+def merge_speeches(left: dict, right: dict) -> dict:
+    """Reducer merging {side: {stage: text}} updates from parallel branches."""
+    merged = {side: dict(stages) for side, stages in (left or {}).items()}
+    for side, stages in (right or {}).items():
+        merged.setdefault(side, {}).update(stages)
+    return merged
 
-llm = ChatGroq(
-    temperature=0.6,
-    model="llama-3.3-70b-versatile"
-)
 
 class DebateState(TypedDict):
-    topic: str              # The motion
-    side: str               # Proposition or Opposition
-    argument_history: str   # What has been said so far
-    final_output: str       # The latest speech
+    topic: str                                      # The motion
+    use_cache: bool                                 # Allow cached LLM responses
+    speeches: Annotated[dict, merge_speeches]       # {side: {stage: text}} so far
 
-def run_opening_node(state: DebateState):
-    print("--- Generating Opening Argument ---")
-    
-    topic = state["topic"]
-    side = state["side"]
-    
-    prompt = f"""
-    You are a world-class debater participating in a formal debate.
-    Motion: {topic}
-    Your Stance: {side}
+def build_argument_prompt(topic: str, side: str, stage: str, history: str = "") -> str:
+    """Build the prompt for a debate argument for a given side and stage."""
     
-    Write a compelling, concise opening statement (max 200 words).
-    Present 3 clear, distinct arguments.
-    """
+    if stage == "opening":
+        prompt = f"""You are presenting the {side} position in a formal debate.
+Motion: {topic}
+
+Write a strong opening statement (max 150 words) with 2-3 distinct arguments.
+
+IMPORTANT RULES:
+- Do NOT start with "Ladies and gentlemen" or similar greetings
+- Do NOT use phrases like "I believe" or "In my opinion"
+- Present arguments as factual claims with evidence
+- Use a direct, assertive tone
+- Jump straight into your first point
+
+Example format:
+"[First key claim]. [Supporting evidence or reasoning]. [Second point with evidence]. [Third point if needed]."
+"""
     
-    response = llm.invoke(prompt)
+    elif stage == "rebuttal":
+        prompt = f"""You are presenting a rebuttal for the {side} position in a formal debate.
+Motion: {topic}
+
+Arguments to counter:
+{history}
+
+Write a sharp rebuttal (max 150 words) addressing the opposing points.
+
+IMPORTANT RULES:
+- Do NOT start with "While my opponent" or "My opponent claims"
+- Do NOT use "the opposition" or "they argue"
+- Instead, directly state why each claim is flawed
+- Present counter-evidence factually
+- Use phrases like "This overlooks...", "The evidence shows...", "In reality..."
+
+Example format:
+"The claim that [X] fails to account for [Y]. [Counter-evidence]. Furthermore, [next counter-point with evidence]."
+"""
     
-    return {
-        "final_output": response.content,
-        "argument_history": f"\n\nOPENING ({side}):\n{response.content}"
-    }
+    else:  # closing
+        prompt = f"""You are delivering a closing statement for the {side} position.
+Motion: {topic}
+
+Debate context:
+{history}
+
+Write a powerful closing (max 150 words) summarizing your strongest points.
+
+IMPORTANT RULES:
+- Do NOT start with "In conclusion" or "To summarize"
+- Do NOT use "Ladies and gentlemen" or "As I have shown"
+- Make a final compelling case with your best evidence
+- End with a strong declarative statement
+- Be assertive and confident
 
-def run_rebuttal_node(state: DebateState):
-    print("--- Generating Rebuttal ---")
+Example format:
+"[Restate strongest point]. [Key evidence that proves your case]. [Why this matters]. [Strong final statement]."
+"""
     
-    # Flip the Side
-    current_side = state["side"]
-    if current_side == "Proposition":
-        new_side = "Opposition"
+    return prompt
+
+async def stage_history(speeches: dict, side: str, stage: str) -> str:
+    """Return the earlier speeches that a side's speech at this stage builds on.
+
+    Speeches are passed through the history compactor, so an unusually long
+    opening is condensed rather than inflating every later prompt.
+    """
+    other = "opposition" if side == "proposition" else "proposition"
+    # Each side rebuts the other's opening
+    if stage == "rebuttal":
+        entries = [(None, speeches[other]["opening"])]
+    # Closings weigh a side's own opening against the rebuttal it received
+    elif stage == "closing":
+        entries = [
+            ("Your Opening", speeches[side]["opening"]),
+            ("Opponent's Rebuttal", speeches[other]["rebuttal"]),
+        ]
     else:
-        new_side = "Proposition"
-        
-    topic = state["topic"]
-    history = state["argument_history"]
-    
-    prompt = f"""
-    You are a world-class debater. 
-    Motion: {topic}
-    Your Stance: {new_side}
-    
-    PREVIOUS ARGUMENTS:
-    {history}
-    
-    Instruction: Write a sharp rebuttal (max 200 words) countering the points above. 
+        return ""
+    return render_entries(await compactor.compact(entries))
+
+
+async def speech_prompt(topic: str, speeches: dict, side: str, stage: str) -> str:
+    """Build the prompt for one side's speech at a stage, given the speeches so far."""
+    return build_argument_prompt(
+        topic, side.capitalize(), stage, await stage_history(speeches, side, stage)
+    )
+
+
+def speech_node(side: str, stage: str):
+    """Build the graph node that writes one side's speech for one stage."""
+    async def run_speech_node(state: DebateState):
+        print(f"--- Generating {side.capitalize()} {stage.capitalize()} ---")
+        prompt = await speech_prompt(state["topic"], state["speeches"], side, stage)
+        text = await invoke_llm(prompt, stage, state.get("use_cache", True))
+        return {"speeches": {side: {stage: text}}}
+    return run_speech_node
+
+
+def build_debate_graph():
+    """Compile the debate graph with an in-memory checkpointer.
+
+    Both sides of a stage run as parallel branches; each stage waits for
+    both speeches of the previous one. Completed speeches are checkpointed
+    per superstep, so a debate whose stage failed resumes from that stage
+    instead of regenerating earlier speeches.
     """
-    
-    response = llm.invoke(prompt)
-    
-    return {
-        "final_output": response.content,
-        "argument_history": f"{history}\n\nREBUTTAL ({new_side}):\n{response.content}",
-        "side": new_side 
-    }
+    # LangGraph is the slowest import in the backend; keep it off the startup path
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.graph import StateGraph, START, END
 
-def run_summary_node(state: DebateState):
-    print("--- Generating Summary ---")
-    
-    history = state["argument_history"]
-    topic = state["topic"]
-    
-    prompt = f"""
-    You are an expert debate judge.
-    Motion: {topic}
-    
-    Review the following debate transcript:
-    {history}
-    
-    Provide a final closing summary (max 150 words). 
-    Highlight the strongest point from each side and conclude the debate.
+    builder = StateGraph(DebateState)
+    previous = START
+    for stage in DEBATE_STAGES:
+        nodes = [f"{side}_{stage}" for side in DEBATE_SIDES]
+        for side, node in zip(DEBATE_SIDES, nodes):
+            builder.add_node(node, speech_node(side, stage))
+            builder.add_edge(previous, node)
+        previous = nodes
+    builder.add_edge(previous, END)
+    return builder.compile(checkpointer=MemorySaver())
+
+
+debate_graph = None
+_graph_lock = threading.Lock()
+resumable_debates = OrderedDict()
+# Debates being generated right now; their checkpoints must not be resumed twice
+active_debates = set()
+
+
+class DebateConflict(Exception):
+    """Raised when a ``debate_id`` is already running or belongs to another motion."""
+
+
+def get_debate_graph():
+    """Return the compiled debate graph, building it on first use."""
+    global debate_graph
+    # The startup warm-up builds it on a worker thread; never build it twice
+    with _graph_lock:
+        if debate_graph is None:
+            debate_graph = build_debate_graph()
+    return debate_graph
+
+
+async def run_debate_graph(topic: str, debate_id: str = None, use_cache: bool = True,
+                           concurrent: bool = True, on_speech=None) -> dict:
+    """Run (or resume) a debate and return its {side: {stage: text}} speeches.
+
+    Passing the ``debate_id`` of a debate that failed part-way resumes it:
+    only the speeches that did not complete are generated again.
+    ``on_speech(side, stage, text)`` is called as each speech completes,
+    including those restored from a resumed debate.
+
+    Raises DebateConflict if the debate is still running, or if it was
+    started on a different motion than ``topic``.
     """
-    
-    response = llm.invoke(prompt)
-    
-    return {
-        "final_output": response.content,
-        "argument_history": f"{history}\n\nSUMMARY:\n{response.content}"
-    }
+    graph = get_debate_graph()
+    debate_id = debate_id or uuid.uuid4().hex
+    config = {"configurable": {"thread_id": debate_id}}
+    if not concurrent:
+        config["max_concurrency"] = 1
 
-builder = StateGraph(DebateState)
+    snapshot = await graph.aget_state(config)
+    if snapshot.next:
+        if snapshot.values.get("topic") != topic:
+            raise DebateConflict(
+                f"Debate {debate_id} was started on a different motion"
+            )
+        print(f"--- Resuming debate {debate_id} at {', '.join(snapshot.next)} ---")
+        inputs = None
+    else:
+        inputs = {"topic": topic, "use_cache": use_cache, "speeches": {}}
 
-builder.add_node("opening", run_opening_node)
-builder.add_node("rebuttal", run_rebuttal_node)
-builder.add_node("summary", run_summary_node)
+    # Checked after the await above, so two requests cannot both claim the id
+    if debate_id in active_debates:
+        raise DebateConflict(f"Debate {debate_id} is already running")
+    active_debates.add(debate_id)
+    try:
+        if on_speech is None:
+            speeches = (await graph.ainvoke(inputs, config))["speeches"]
+        else:
+            if inputs is None:
+                report_speeches(snapshot.values.get("speeches", {}), on_speech)
+            async for update in graph.astream(inputs, config, stream_mode="updates"):
+                for node_update in update.values():
+                    if isinstance(node_update, dict):
+                        report_speeches(node_update.get("speeches", {}), on_speech)
+            speeches = (await graph.aget_state(config)).values["speeches"]
+    except BaseException:
+        resumable_debates[debate_id] = True
+        resumable_debates.move_to_end(debate_id)
+        while len(resumable_debates) > MAX_RESUMABLE_DEBATES:
+            stale_id, _ = resumable_debates.popitem(last=False)
+            graph.checkpointer.delete_thread(stale_id)
+        raise
+    finally:
+        active_debates.discard(debate_id)
 
-builder.add_edge(START, "opening")
-builder.add_edge("opening", "rebuttal")
-builder.add_edge("rebuttal", "summary")
-builder.add_edge("summary", END)
+    resumable_debates.pop(debate_id, None)
+    graph.checkpointer.delete_thread(debate_id)
+    return speeches
 
-debate_graph = builder.compile()
 
+def report_speeches(speeches: dict, on_speech):
+    for side, stages in speeches.items():
+        for stage, text in stages.items():
+            on_speech(side, stage, text)
 
-if __name__ == "__main__":
-    test_input = {
-        "topic": "Paneer is the best Dairy product.", 
-        "side": "Proposition",
-        "argument_history": "", 
-        "final_output": ""
+
+async def debate_events(topic: str):
+    """Yield token and speech events for a full debate, stage by stage.
+
+    The streaming counterpart of the graph, for /api/debate/stream: stages
+    run in the same order and each speech gets the same prompt as its graph
+    node, but tokens are passed on as they arrive.
+    """
+    speeches = {side: {} for side in DEBATE_SIDES}
+    for stage in DEBATE_STAGES:
+        streams = {
+            side: stream_llm(await speech_prompt(topic, speeches, side, stage), stage)
+            for side in DEBATE_SIDES
+        }
+        texts = {side: "" for side in DEBATE_SIDES}
+        async for side, chunk in merge_streams(streams):
+            texts[side] += chunk
+            yield {"type": "token", "side": side, "stage": stage, "text": chunk}
+        for side, text in texts.items():
+            speeches[side][stage] = text
+            yield {
+                "type": "speech",
+                "side": side,
+                "stage": stage,
+                "summary": get_summary(text),
+                "full": text,
+            }
+
+    yield {"type": "done", **format_debate(topic, speeches)}
+
+
+def get_summary(content: str, max_words: int = 25) -> str:
+    """Get first sentence or truncate to max words."""
+    sentences = content.split('.')
+    if sentences:
+        first_sentence = sentences[0].strip()
+        words = first_sentence.split()
+        if len(words) > max_words:
+            return ' '.join(words[:max_words]) + '...'
+        return first_sentence + '.'
+    return content[:150] + '...'
+
+
+def format_debate(topic: str, speeches: dict) -> dict:
+    """Shape {side: {stage: text}} into the /api/debate response.
+
+    Speeches not written yet are left out, so a debate in progress has the
+    same shape with fewer stages.
+    """
+    return {
+        "topic": topic,
+        **{
+            side: {
+                stage: {
+                    "summary": get_summary(speeches[side][stage]),
+                    "full": speeches[side][stage],
+                }
+                for stage in DEBATE_STAGES
+                if stage in speeches.get(side, {})
+            }
+            for side in DEBATE_SIDES
+        }
     }
-    
 
-    result = debate_graph.invoke(test_input) # type: ignore
-    
+
+if __name__ == "__main__":
+    speeches = asyncio.run(run_debate_graph("Paneer is the best Dairy product."))
+
     print("\n\nFINAL TRANSCRIPT:")
-    print(result["argument_history"])
\ No newline at end of file
+    for stage in DEBATE_STAGES:
+        for side in DEBATE_SIDES:
+            print(f"\n{stage.upper()} ({side.capitalize()}):\n{speeches[side][stage]}")
@@ -0,0 +1,58 @@
+"""Production serving: gunicorn managing several uvicorn worker processes.
+
+Usage (from backend/): gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master and forked into WEB_CONCURRENCY
+workers (default: one per available CPU). Each worker runs its own event
+loop and opens its own Groq connection pool on first use. On SIGTERM a
+worker stops accepting connections, finishes open requests and queued
+debate jobs, then exits; workers still busy after GRACEFUL_TIMEOUT seconds
+are killed.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(available_cpus())))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+# Workers heartbeat from their event loop, so this only fires if a loop is blocked
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# Long enough for a full debate; DEBATE_JOB_DRAIN_TIMEOUT should fit inside it
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "90"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = "-"
+
+# Read by the app when the master imports it: the Groq rate limits are split
+# between workers, and state that must be visible to every worker is kept in
+# SQLite unless configured otherwise.
+os.environ["SERVER_WORKERS"] = str(workers)
+if workers > 1:
+    os.environ.setdefault("DEBATE_JOB_PATH", "debate_jobs.sqlite3")
+    os.environ.setdefault("SESSION_BACKEND", "sqlite")
+
+
+def on_starting(server):
+    # Import the LLM and graph libraries before forking, so workers start
+    # without paying for them. Clients and connections are still built per worker.
+    if server.cfg.preload_app:
+        import langchain_groq  # noqa: F401
+        import langgraph.graph  # noqa: F401
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import main
+
+        main.reopen_stores()
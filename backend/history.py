@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+
+from llm_client import invoke_llm
+from tokens import count_tokens
+
+SUMMARY_PROMPT = """Condense this debate point into one sentence (max 30 words).
+Keep its central claim and its strongest piece of evidence. Do not add commentary.
+
+{text}"""
+
+
+def fallback_summary(text: str, max_words: int = 30) -> str:
+    """Word-capped excerpt used when a turn cannot be summarized by the LLM."""
+    words = text.split()
+    if len(words) <= max_words:
+        return text.strip()
+    return " ".join(words[:max_words]) + "..."
+
+
+class HistoryCompactor:
+    """Cap debate history in prompts: recent turns verbatim, older ones condensed.
+
+    Each turn is condensed at most once; summaries are cached by the turn's
+    text, so the same opening or argument is never summarized twice. If the
+    history still exceeds ``token_budget``, recent turns are condensed too,
+    oldest first, and only then are the oldest entries dropped.
+    """
+
+    def __init__(
+        self,
+        summarize,
+        keep_last: int = 4,
+        token_budget: int = 800,
+        max_cached: int = 4096,
+    ):
+        self.summarize = summarize
+        self.keep_last = max(1, keep_last)
+        self.token_budget = token_budget
+        self.max_cached = max_cached
+        self.summaries = OrderedDict()
+        self.pending = {}
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def condense(self, text: str) -> str:
+        """Return the cached summary of a turn, computing it on first use."""
+        key = self._key(text)
+        if key in self.summaries:
+            self.summaries.move_to_end(key)
+            return self.summaries[key]
+        if key not in self.pending:
+            self.pending[key] = asyncio.ensure_future(self._summarize(key, text))
+        return await asyncio.shield(self.pending[key])
+
+    async def _summarize(self, key: str, text: str) -> str:
+        try:
+            summary = (await self.summarize(SUMMARY_PROMPT.format(text=text))).strip()
+        except Exception as e:
+            print(f"Error condensing debate history: {e}")
+            summary = fallback_summary(text)
+        finally:
+            self.pending.pop(key, None)
+        self.summaries[key] = summary
+        while len(self.summaries) > self.max_cached:
+            self.summaries.popitem(last=False)
+        return summary
+
+    def cached(self, text: str):
+        """Return the summary of a turn if it has already been computed."""
+        return self.summaries.get(self._key(text))
+
+    def remember(self, text: str, summary: str):
+        """Seed the cache with a summary stored elsewhere (e.g. in a session)."""
+        self.summaries[self._key(text)] = summary
+
+    def warm(self, texts: list):
+        """Start condensing turns in the background before a prompt needs them."""
+        for text in texts:
+            if self._key(text) not in self.summaries:
+                asyncio.ensure_future(self.condense(text))
+
+    def older(self, entries: list) -> list:
+        """The entries that fall outside the verbatim window."""
+        return entries[:-self.keep_last] if len(entries) > self.keep_last else []
+
+    async def compact(self, entries: list) -> list:
+        """Compact (label, text) entries to fit the budget, oldest condensed first."""
+        total = sum(count_tokens(text) for _, text in entries)
+        if total <= self.token_budget and len(entries) <= self.keep_last:
+            return entries
+
+        older, recent = self.older(entries), entries[-self.keep_last:]
+        summaries = await asyncio.gather(*(self.condense(text) for _, text in older))
+        condensed = [(label, summary) for (label, _), summary in zip(older, summaries)]
+        compacted = condensed + recent
+
+        def fits() -> bool:
+            return sum(count_tokens(text) for _, text in compacted) <= self.token_budget
+
+        # Condense verbatim turns, oldest first, before dropping anything
+        for i in range(len(older), len(compacted)):
+            if fits():
+                break
+            label, text = compacted[i]
+            compacted[i] = (label, await self.condense(text))
+
+        # Drop the oldest entries until the history fits, always keeping the latest
+        while len(compacted) > 1 and not fits():
+            compacted.pop(0)
+        if count_tokens(compacted[0][1]) > self.token_budget:
+            label, text = compacted[0]
+            max_words = int(self.token_budget * 0.6)
+            compacted[0] = (label, fallback_summary(text, max_words=max_words))
+        return compacted
+
+
+def render_entries(entries: list, separator: str = "\n") -> str:
+    """Render (label, text) entries; unlabelled entries are rendered bare."""
+    return separator.join(
+        f"{label}: {text}" if label else text for label, text in entries
+    )
+
+
+async def summarize_turn(prompt: str) -> str:
+    return await invoke_llm(prompt, "summary")
+
+
+def build_compactor(summarize=summarize_turn) -> HistoryCompactor:
+    """Build the history compactor from the HISTORY_* environment variables."""
+    return HistoryCompactor(
+        summarize,
+        keep_last=int(os.getenv("HISTORY_KEEP_LAST", "4")),
+        token_budget=int(os.getenv("HISTORY_TOKEN_BUDGET", "800")),
+    )
+
+
+compactor = build_compactor()
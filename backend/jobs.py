@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+
+from graph import DEBATE_SIDES, DEBATE_STAGES, run_debate_graph
+from sqlite_store import SQLiteStore
+
+TOTAL_SPEECHES = len(DEBATE_SIDES) * len(DEBATE_STAGES)
+
+
+class JobQueueFull(Exception):
+    """Raised when a debate job cannot be queued because too many are waiting."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Debate job queue is full, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class DebateJob:
+    id: str
+    topic: str
+    use_cache: bool = True
+    concurrent: bool = True
+    status: str = "queued"  # "queued", "running", "done" or "failed"
+    speeches: dict = field(default_factory=lambda: {side: {} for side in DEBATE_SIDES})
+    error: str = None
+    created: float = 0.0
+    finished: float = None
+
+    @property
+    def completed(self) -> int:
+        return sum(len(stages) for stages in self.speeches.values())
+
+
+class SQLiteJobStore(SQLiteStore):
+    """Debate jobs in a SQLite file, so any worker process can answer a poll."""
+
+    def __init__(self, path: str = "debate_jobs.sqlite3"):
+        super().__init__(
+            path,
+            "CREATE TABLE IF NOT EXISTS jobs "
+            "(id TEXT PRIMARY KEY, data TEXT NOT NULL, finished REAL)",
+        )
+
+    def save(self, job: DebateJob):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data, finished) VALUES (?, ?, ?)",
+                (job.id, json.dumps(asdict(job)), job.finished),
+            )
+            self.conn.commit()
+
+    def get(self, job_id: str):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return DebateJob(**json.loads(row[0])) if row else None
+
+    def prune(self, cutoff: float):
+        with self.lock:
+            self.conn.execute("DELETE FROM jobs WHERE finished < ?", (cutoff,))
+            self.conn.commit()
+
+
+class DebateJobs:
+    """Run /api/debate requests in the background on a bounded worker pool.
+
+    ``workers`` debates run at once; at most ``max_queued`` more wait for a
+    worker, beyond which ``submit`` raises JobQueueFull. Speeches are stored
+    on the job as they complete so pollers see partial results. Finished
+    jobs are forgotten ``ttl`` seconds after they end.
+
+    The job id doubles as the debate id, so a failed job can be resumed by
+    passing it as ``debate_id`` to /api/debate.
+
+    With a ``store`` every change to a job is also written there, and jobs
+    this process does not know are looked up in it. Several server
+    processes sharing one store can then each answer polls for the others'
+    jobs; the store's timestamps must come from a wall ``clock``.
+    """
+
+    def __init__(
+        self, run=run_debate_graph, workers: int = 2, max_queued: int = 20,
+        ttl: float = 3600.0, clock=time.monotonic, store: SQLiteJobStore = None,
+    ):
+        self.run = run
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.clock = clock
+        self.store = store
+        self.jobs = {}
+        self.queue = None
+        self.tasks = []
+        self.rejected = 0
+        self.closing = False
+
+    def submit(
+        self, topic: str, use_cache: bool = True, concurrent: bool = True
+    ) -> DebateJob:
+        self._prune()
+        self._start()
+        if self.closing or self.queue.qsize() >= self.max_queued:
+            self.rejected += 1
+            raise JobQueueFull(self.retry_after())
+        job_id = uuid.uuid4().hex
+        job = DebateJob(job_id, topic, use_cache, concurrent, created=self.clock())
+        self.jobs[job.id] = job
+        self._save(job)
+        self.queue.put_nowait(job)
+        return job
+
+    def completed(self, topic: str, speeches: dict) -> DebateJob:
+        """Record a debate that is already available, e.g. precomputed, as done."""
+        self._prune()
+        now = self.clock()
+        job = DebateJob(
+            uuid.uuid4().hex, topic, status="done", speeches=speeches,
+            created=now, finished=now,
+        )
+        self.jobs[job.id] = job
+        self._save(job)
+        return job
+
+    def get(self, job_id: str):
+        self._prune()
+        job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    async def drain(self, timeout: float):
+        """Stop taking jobs and wait up to ``timeout`` seconds for the unfinished ones.
+
+        Jobs still unfinished after that are marked failed; called on shutdown.
+        """
+        self.closing = True
+        if self.queue is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Debate jobs still running after {timeout:.0f}s, abandoning them")
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            if job.finished is None:
+                job.status = "failed"
+                job.error = "The server restarted before the debate finished"
+                job.finished = self.clock()
+                self._save(job)
+
+    def retry_after(self) -> float:
+        """Rough wait until a queue slot frees up: the mean duration of recent jobs."""
+        finished = [job for job in self.jobs.values() if job.finished is not None]
+        durations = [job.finished - job.created for job in finished]
+        return max(1.0, sum(durations) / len(durations)) if durations else 30.0
+
+    def _start(self):
+        # Created on first use so the queue binds to the server's running loop
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        self.tasks = [task for task in self.tasks if not task.done()]
+        while len(self.tasks) < self.workers:
+            self.tasks.append(asyncio.ensure_future(self._work()))
+
+    async def _work(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job: DebateJob):
+        job.status = "running"
+        self._save(job)
+
+        def on_speech(side: str, stage: str, text: str):
+            job.speeches[side][stage] = text
+            self._save(job)
+
+        try:
+            job.speeches = await self.run(
+                job.topic, job.id, job.use_cache, job.concurrent, on_speech=on_speech
+            )
+            job.status = "done"
+        except Exception as e:
+            print(f"Error running debate job {job.id}: {e}")
+            job.status = "failed"
+            job.error = str(e) or type(e).__name__
+        job.finished = self.clock()
+        self._save(job)
+
+    def _save(self, job: DebateJob):
+        if self.store is not None:
+            self.store.save(job)
+
+    def _prune(self):
+        cutoff = self.clock() - self.ttl
+        expired = [
+            job.id for job in self.jobs.values()
+            if job.finished is not None and job.finished < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if self.store is not None:
+            self.store.prune(cutoff)
+
+    def stats(self) -> dict:
+        statuses = [job.status for job in self.jobs.values()]
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "done": statuses.count("done"),
+            "failed": statuses.count("failed"),
+            "rejected": self.rejected,
+        }
+
+
+def build_debate_jobs() -> DebateJobs:
+    """Build the debate job pool from the DEBATE_JOB_* environment variables.
+
+    DEBATE_JOB_PATH keeps jobs in a SQLite file shared by server processes.
+    """
+    path = os.getenv("DEBATE_JOB_PATH")
+    return DebateJobs(
+        workers=int(os.getenv("DEBATE_JOB_WORKERS", "2")),
+        max_queued=int(os.getenv("DEBATE_JOB_QUEUE", "20")),
+        ttl=float(os.getenv("DEBATE_JOB_TTL", "3600")),
+        clock=time.time if path else time.monotonic,
+        store=SQLiteJobStore(path) if path else None,
+    )
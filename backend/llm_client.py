@@ -0,0 +1,298 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from cache import build_cache, cache_key
+from singleflight import SingleFlight
+from ratelimit import TASK_PRIORITIES, build_scheduler, estimate_tokens
+from resilience import build_resilience, upstream_failure
+from metrics import llm_calls, record_llm_call
+from tokens import count_tokens
+from routing import build_router
+from budgets import BUDGETS, BudgetStats, StreamBudget, trim_to_budget
+
+load_dotenv()
+
+# Built on first use by get_llm(); importing langchain_groq costs a noticeable
+# part of a cold start, and endpoints such as /api/health never need it
+llm = None
+_llm_lock = threading.Lock()
+# Keep-alive connection pools for Groq calls, built alongside the client
+http_clients = None
+
+response_cache = build_cache()
+# Identical prompts in flight share one upstream call (LLM_SINGLEFLIGHT=0 disables)
+inflight_calls = SingleFlight() if os.getenv("LLM_SINGLEFLIGHT", "1") != "0" else None
+# Client-side RPM/TPM limiter in front of Groq (None when disabled)
+scheduler = build_scheduler()
+# Deadlines, retries, hedging and circuit breaking around upstream calls
+resilience = build_resilience()
+# Which model (or cascade of models) answers each task
+router = build_router()
+# How often each stage's output limits are hit
+budget_stats = BudgetStats()
+
+
+def message_text(response) -> str:
+    """Return the text content of a chat model response."""
+    content = response.content
+    return str(content) if not isinstance(content, str) else content
+
+
+def build_http_clients() -> tuple:
+    """Return (sync, async) httpx clients sharing one set of pool limits.
+
+    Pool sizes come from LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_KEEPALIVE and
+    LLM_HTTP_KEEPALIVE_EXPIRY. Each server process builds its own on first
+    use, so forked workers never share sockets.
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+    # Same as the groq SDK's default; endpoint deadlines are enforced in resilience.py
+    timeout = httpx.Timeout(60.0, connect=5.0)
+    return (
+        httpx.Client(limits=limits, timeout=timeout),
+        httpx.AsyncClient(limits=limits, timeout=timeout),
+    )
+
+
+def get_llm():
+    """Return the shared chat model, constructing it on first use."""
+    global llm, http_clients
+    with _llm_lock:
+        if llm is None:
+            from langchain_groq import ChatGroq
+
+            http_clients = build_http_clients()
+            llm = ChatGroq(
+                temperature=0.6,
+                model=router.large,
+                max_retries=0,  # Retries are handled with backoff in resilience.py
+                http_client=http_clients[0],
+                http_async_client=http_clients[1],
+            )
+    return llm
+
+
+async def close_llm():
+    """Close the Groq connection pools; called on server shutdown."""
+    global llm, http_clients
+    with _llm_lock:
+        clients, http_clients = http_clients, None
+        if clients is not None:
+            llm = None
+    if clients is not None:
+        clients[0].close()
+        await clients[1].aclose()
+
+
+def model_params(model_name: str, json_mode: bool = False, budget=None) -> dict:
+    """Return the model settings that, with the prompt, determine a response."""
+    params = {
+        "model": model_name,
+        "temperature": getattr(get_llm(), "temperature", None),
+    }
+    if json_mode:
+        params["response_format"] = "json_object"
+    if budget is not None:
+        params["budget"] = [budget.max_tokens, budget.max_words, list(budget.stop)]
+    return params
+
+
+def routed_model(model_name: str, json_mode: bool = False, budget=None):
+    """Return the shared LLM client bound to ``model_name``.
+
+    Binding overrides the request's model, so every tier shares one client
+    and its connection pool. ``json_mode`` constrains the output to a single
+    JSON object (Groq JSON mode); ``budget`` caps its length (budgets.py).
+    """
+    model = get_llm()
+    overrides = {}
+    if model_name != getattr(model, "model_name", model_name):
+        overrides["model"] = model_name
+    if json_mode:
+        overrides["response_format"] = {"type": "json_object"}
+    if budget is not None:
+        overrides["max_tokens"] = budget.max_tokens
+        if budget.stop:
+            overrides["stop"] = list(budget.stop)
+    if overrides and hasattr(model, "bind"):
+        return model.bind(**overrides)
+    return model
+
+
+async def acquire_slot(task: str, prompt: str, max_wait: float = None):
+    """Wait until the rate limiter admits a call for this task, or ``max_wait`` ends."""
+    if scheduler is not None:
+        await scheduler.acquire(
+            TASK_PRIORITIES.get(task, "bulk"), estimate_tokens(prompt), max_wait
+        )
+
+
+async def invoke_llm(
+    prompt: str, task: str, use_cache: bool = True, json_mode: bool = False,
+    validate=None, confident=None, budget=None,
+) -> str:
+    """Send a prompt to the task's model without blocking the event loop.
+
+    ChatGroq implements ``ainvoke`` on top of the async Groq client, so
+    while one request waits on Groq the worker keeps serving others.
+    When caching is enabled for the task's endpoint, a stored response for
+    the same prompt is returned instead; ``use_cache=False`` skips the lookup
+    but still stores the fresh response. Concurrent calls with the same
+    prompt are coalesced into one upstream request, which is retried,
+    hedged and bounded by the task's deadline (see resilience.py).
+
+    ``json_mode`` asks Groq for a syntactically valid JSON object. When
+    ``validate`` is given, a response it rejects is returned but not cached.
+    Tasks routed to a cascade (see routing.py) move on to the next model
+    when ``validate`` or ``confident`` rejects a response; the last model's
+    response is returned either way.
+
+    Output is limited by the task's generation budget (see budgets.py), or
+    by ``budget`` when given.
+    """
+    budget = budget or BUDGETS.get(task)
+    router.record_request(task)
+    models = router.models(task)
+    for model_name in models[:-1]:
+        text = await invoke_model(
+            prompt, task, model_name, use_cache, json_mode, validate, budget
+        )
+        if not is_valid(text, validate):
+            router.record_escalation(task, model_name, "invalid")
+        elif not is_valid(text, confident):
+            router.record_escalation(task, model_name, "low-confidence")
+        else:
+            return text
+    return await invoke_model(
+        prompt, task, models[-1], use_cache, json_mode, validate, budget
+    )
+
+
+async def invoke_model(
+    prompt: str, task: str, model_name: str, use_cache: bool, json_mode: bool,
+    validate, budget=None,
+) -> str:
+    """Call one model through the response cache, single-flight and resilience."""
+    key = cache_key(prompt, model_params(model_name, json_mode, budget))
+    model = routed_model(model_name, json_mode, budget)
+    cached = response_cache.enabled(task)
+    if cached and use_cache:
+        text = response_cache.get(task, key)
+        if text is not None:
+            return text
+
+    async def admit(max_wait: float):
+        await acquire_slot(task, prompt, max_wait)
+
+    async def attempt() -> str:
+        start = time.perf_counter()
+        try:
+            response = await model.ainvoke(prompt)
+        except Exception:
+            llm_calls.inc(stage=task, model=model_name, outcome="error")
+            raise
+        text = message_text(response)
+        seconds = time.perf_counter() - start
+        record_llm_call(task, model_name, seconds, prompt, response, text)
+        return apply_budget(task, budget, response, text)
+
+    async def call() -> str:
+        return await resilience.run(task, attempt, model_name, admit)
+
+    if inflight_calls is not None:
+        text = await inflight_calls.do(key, call)
+    else:
+        text = await call()
+
+    if cached and is_valid(text, validate):
+        response_cache.set(key, text)
+    return text
+
+
+def finish_reason(message):
+    return (getattr(message, "response_metadata", None) or {}).get("finish_reason")
+
+
+def apply_budget(task: str, budget, response, text: str) -> str:
+    """Trim prose to the budget's word limit at a sentence end; record overruns."""
+    capped = finish_reason(response) == "length"
+    trimmed = text
+    if budget is not None and budget.max_words:
+        trimmed = trim_to_budget(text, budget.max_words, complete=not capped)
+    usage = getattr(response, "usage_metadata", None) or {}
+    completion = usage.get("output_tokens", count_tokens(text))
+    removed = text[len(trimmed):]
+    budget_stats.record(task, completion, capped=capped, trimmed_text=removed)
+    return trimmed
+
+
+def is_valid(text: str, validate) -> bool:
+    if validate is None:
+        return True
+    try:
+        validate(text)
+    except ValueError:
+        return False
+    return True
+
+
+async def stream_llm(prompt: str, task: str):
+    """Yield the LLM's completion for a prompt as text chunks arrive.
+
+    Streams are not retried once tokens have been sent, but they respect the
+    circuit breaker and count towards its failures. They use the first model
+    of the task's route and never escalate. Once the task's word budget is
+    reached the stream ends with the current sentence and the upstream
+    response is closed, so the rest is never generated.
+    """
+    model_name = router.models(task)[0]
+    budget = BUDGETS.get(task)
+    limit = None
+    if budget is not None and budget.max_words:
+        limit = StreamBudget(budget.max_words)
+    resilience.breaker.before_call()
+    start = time.perf_counter()
+    completion = ""
+    capped = stopped = False
+    stream = None
+    healthy = False
+    try:
+        await acquire_slot(task, prompt)
+        stream = routed_model(model_name, budget=budget).astream(prompt)
+        async for chunk in stream:
+            if finish_reason(chunk) == "length":
+                capped = True
+            text = message_text(chunk)
+            if limit is not None:
+                text, stopped = limit.feed(text)
+            if text:
+                completion += text
+                yield text
+            if stopped:
+                break
+        healthy = True
+    except Exception as e:
+        if upstream_failure(e):
+            resilience.breaker.record_failure()
+        llm_calls.inc(stage=task, model=model_name, outcome="error")
+        raise
+    finally:
+        if stream is not None:
+            await stream.aclose()
+        if healthy:
+            resilience.breaker.record_success()
+        else:
+            # Cancelled, abandoned by the consumer, or a failure already recorded
+            resilience.breaker.release()
+    seconds = time.perf_counter() - start
+    record_llm_call(task, model_name, seconds, prompt, completion=completion)
+    budget_stats.record(
+        task, count_tokens(completion), capped=capped, stopped_early=stopped
+    )
@@ -1,15 +1,107 @@
 import os
+import math
+import asyncio
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from graph import llm
+from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from graph import (
+    DEBATE_SIDES,
+    DebateConflict,
+    debate_events,
+    format_debate,
+    get_debate_graph,
+    run_debate_graph,
+)
+from llm_client import (
+    budget_stats,
+    close_llm,
+    get_llm,
+    inflight_calls,
+    invoke_llm,
+    resilience,
+    response_cache,
+    router,
+    stream_llm,
+)
+from ratelimit import RateLimitExceeded
+from resilience import CircuitOpenError
+from streaming import PointSplitter, ndjson
+from scoring import (
+    ArgumentScores,
+    CoachedScores,
+    FeedbackResult,
+    agreement_check,
+    build_batch_scoring_prompt,
+    build_feedback_prompt,
+    build_scoring_prompt,
+    fallback_feedback,
+    fallback_scores,
+    format_scores,
+    parse_batch_scores,
+    score_gap,
+)
+from structured import request_structured
+from analysis import analyze_argument, local_scores, trivial_scores
+from metrics import MetricsMiddleware, fallbacks, record_parse, render, scored_locally
+from sessions import (
+    DebateSession,
+    build_session_store,
+    client_history_entries,
+    render_history,
+)
+from history import compactor
+from speculation import build_draft_store, next_round
+from precompute import build_precomputed
+from jobs import TOTAL_SPEECHES, JobQueueFull, build_debate_jobs
+from budgets import BUDGETS, COACHED_SCORE_BUDGET
 
 load_dotenv()
 
-app = FastAPI()
+
+def warm_up():
+    """Import and build the LLM client and debate graph ahead of the first request."""
+    try:
+        get_llm()
+        get_debate_graph()
+    except Exception as e:
+        print(f"Error warming up LLM client: {e}")
+
+
+def reopen_stores():
+    """Give this process its own SQLite connections.
+
+    gunicorn.conf.py calls this in each worker it forks from the preloaded
+    app, since a SQLite connection must not be used across a fork.
+    """
+    for store in (precomputed, sessions, response_cache.backend, debate_jobs.store):
+        if hasattr(store, "reopen"):
+            store.reopen()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up on a thread once the server is listening, so health checks answer at once
+    if os.getenv("LLM_WARMUP", "1") != "0":
+        app.state.warmup = asyncio.ensure_future(asyncio.to_thread(warm_up))
+    yield
+    # Shutdown runs once open requests have finished: let queued and running
+    # debate jobs finish too, then release the upstream connections
+    await debate_jobs.drain(float(os.getenv("DEBATE_JOB_DRAIN_TIMEOUT", "60")))
+    await close_llm()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://127.0.0.1:5500",
@@ -29,156 +121,210 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+
+# Live-debate history kept server-side, keyed by session id
+sessions = build_session_store()
+drafts = build_draft_store()
+precomputed = build_precomputed()
+# Also keep live /api/debate results in the precomputed store, so paraphrases reuse them
+STORE_LIVE_DEBATES = os.getenv("PRECOMPUTE_STORE_LIVE", "0") == "1"
+debate_jobs = build_debate_jobs()
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    """Turn a call the limiter could not admit in time into a clean 429."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests - please try again shortly"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Fail fast with 503 while the LLM upstream is known to be down."""
+    message = "The AI service is temporarily unavailable - please try again shortly"
+    return JSONResponse(
+        status_code=503,
+        content={"detail": message},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+@app.exception_handler(JobQueueFull)
+async def job_queue_full_handler(request: Request, exc: JobQueueFull):
+    """Shed new debate jobs with 503 while the worker pool's queue is full."""
+    message = "Too many debates are being generated - please try again shortly"
+    return JSONResponse(
+        status_code=503,
+        content={"detail": message},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+@app.exception_handler(DebateConflict)
+async def debate_conflict_handler(request: Request, exc: DebateConflict):
+    """Refuse to resume a debate that is still running or was on another motion."""
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+@app.exception_handler(TimeoutError)
+async def deadline_handler(request: Request, exc: TimeoutError):
+    """Report an LLM call that ran past its endpoint deadline as 504."""
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "The AI took too long to respond - please try again"},
+    )
 
 class DebateRequest(BaseModel):
     topic: str
+    concurrent: bool = True  # Run independent speeches of each stage in parallel
+    use_cache: bool = True  # False forces fresh generations even if caching is on
+    debate_id: Optional[str] = None  # Reuse to resume a debate that failed part-way
+
+class DebateStreamRequest(BaseModel):
+    # Streams always generate fresh, concurrent speeches and cannot be resumed
+    topic: str
 
 class DebateResponse(BaseModel):
     topic: str
     proposition: dict
     opposition: dict
 
-def generate_argument(topic: str, side: str, stage: str, history: str = "") -> str:
-    """Generate a debate argument for a given side and stage."""
-    
-    if stage == "opening":
-        prompt = f"""You are presenting the {side} position in a formal debate.
-Motion: {topic}
-
-Write a strong opening statement (max 150 words) with 2-3 distinct arguments.
-
-IMPORTANT RULES:
-- Do NOT start with "Ladies and gentlemen" or similar greetings
-- Do NOT use phrases like "I believe" or "In my opinion"
-- Present arguments as factual claims with evidence
-- Use a direct, assertive tone
-- Jump straight into your first point
-
-Example format:
-"[First key claim]. [Supporting evidence or reasoning]. [Second point with evidence]. [Third point if needed]."
-"""
-    
-    elif stage == "rebuttal":
-        prompt = f"""You are presenting a rebuttal for the {side} position in a formal debate.
-Motion: {topic}
-
-Arguments to counter:
-{history}
-
-Write a sharp rebuttal (max 150 words) addressing the opposing points.
-
-IMPORTANT RULES:
-- Do NOT start with "While my opponent" or "My opponent claims"
-- Do NOT use "the opposition" or "they argue"
-- Instead, directly state why each claim is flawed
-- Present counter-evidence factually
-- Use phrases like "This overlooks...", "The evidence shows...", "In reality..."
-
-Example format:
-"The claim that [X] fails to account for [Y]. [Counter-evidence]. Furthermore, [next counter-point with evidence]."
-"""
-    
-    else:  # closing
-        prompt = f"""You are delivering a closing statement for the {side} position.
-Motion: {topic}
-
-Debate context:
-{history}
-
-Write a powerful closing (max 150 words) summarizing your strongest points.
-
-IMPORTANT RULES:
-- Do NOT start with "In conclusion" or "To summarize"
-- Do NOT use "Ladies and gentlemen" or "As I have shown"
-- Make a final compelling case with your best evidence
-- End with a strong declarative statement
-- Be assertive and confident
-
-Example format:
-"[Restate strongest point]. [Key evidence that proves your case]. [Why this matters]. [Strong final statement]."
-"""
-    
-    response = llm.invoke(prompt)
-    content = response.content
-    return str(content) if not isinstance(content, str) else content
-
-def get_summary(content: str, max_words: int = 25) -> str:
-    """Get first sentence or truncate to max words."""
-    sentences = content.split('.')
-    if sentences:
-        first_sentence = sentences[0].strip()
-        words = first_sentence.split()
-        if len(words) > max_words:
-            return ' '.join(words[:max_words]) + '...'
-        return first_sentence + '.'
-    return content[:150] + '...'
-
 @app.get("/")
 def read_root():
     return {"message": "Debate Bot System Online"}
 
 @app.post("/api/debate")
 async def run_debate(request: DebateRequest):
-    """Run a full debate on the given topic."""
-    topic = request.topic
-    
-    # Generate Opening Arguments
-    prop_opening = generate_argument(topic, "Proposition", "opening")
-    opp_opening = generate_argument(topic, "Opposition", "opening")
-    
-    # Generate Rebuttals (each side rebuts the other's opening)
-    prop_rebuttal = generate_argument(topic, "Proposition", "rebuttal", opp_opening)
-    opp_rebuttal = generate_argument(topic, "Opposition", "rebuttal", prop_opening)
-    
-    # Generate Closing Arguments
-    prop_history = f"Your Opening: {prop_opening}\nOpponent's Rebuttal: {opp_rebuttal}"
-    opp_history = f"Your Opening: {opp_opening}\nOpponent's Rebuttal: {prop_rebuttal}"
-    
-    prop_closing = generate_argument(topic, "Proposition", "closing", prop_history)
-    opp_closing = generate_argument(topic, "Opposition", "closing", opp_history)
-    
-    return {
-        "topic": topic,
-        "proposition": {
-            "opening": {
-                "summary": get_summary(prop_opening),
-                "full": prop_opening
-            },
-            "rebuttal": {
-                "summary": get_summary(prop_rebuttal),
-                "full": prop_rebuttal
-            },
-            "closing": {
-                "summary": get_summary(prop_closing),
-                "full": prop_closing
+    """Run a full debate on the given topic.
+
+    Popular motions, and close paraphrases of them, are served from the
+    precomputed store when it has a fresh variant (see precompute.py);
+    ``use_cache=False`` always runs live. With PRECOMPUTE_STORE_LIVE=1 a
+    live debate on a new motion is stored for later paraphrases too.
+    """
+    reuse = precomputed is not None and request.use_cache and not request.debate_id
+    if reuse:
+        stored = precomputed.pick(request.topic)
+        if stored is not None:
+            return stored
+    speeches = await run_debate_graph(
+        request.topic, request.debate_id, request.use_cache, request.concurrent
+    )
+    result = format_debate(request.topic, speeches)
+    if reuse and STORE_LIVE_DEBATES:
+        precomputed.add(request.topic, result)
+    return result
+
+@app.post("/api/debate/jobs", status_code=202)
+async def submit_debate_job(request: DebateRequest):
+    """Queue a full debate and return its job id straight away.
+
+    Poll GET /api/debate/jobs/{job_id} for the speeches written so far. A
+    precomputed debate comes back as a job that is already done.
+    """
+    if precomputed is not None and request.use_cache:
+        stored = precomputed.pick(request.topic)
+        if stored is not None:
+            speeches = {
+                side: {stage: speech["full"] for stage, speech in stored[side].items()}
+                for side in DEBATE_SIDES
             }
-        },
-        "opposition": {
-            "opening": {
-                "summary": get_summary(opp_opening),
-                "full": opp_opening
-            },
-            "rebuttal": {
-                "summary": get_summary(opp_rebuttal),
-                "full": opp_rebuttal
-            },
-            "closing": {
-                "summary": get_summary(opp_closing),
-                "full": opp_closing
-            }
-        }
+            job = debate_jobs.completed(request.topic, speeches)
+            return {"job_id": job.id, "status": job.status}
+    job = debate_jobs.submit(request.topic, request.use_cache, request.concurrent)
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/api/debate/jobs/{job_id}")
+def get_debate_job(job_id: str):
+    """Return a debate job's status and the speeches completed so far.
+
+    Speeches use the /api/debate shape; stages not written yet are absent.
+    """
+    job = debate_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Debate job not found or expired")
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "completed": job.completed,
+        "total": TOTAL_SPEECHES,
+        "error": job.error,
+        **format_debate(job.topic, job.speeches),
     }
 
+@app.post("/api/debate/stream")
+async def stream_debate(request: DebateStreamRequest):
+    """Stream a full debate as NDJSON events tagged with side and stage."""
+    return StreamingResponse(
+        ndjson(debate_events(request.topic)), media_type="application/x-ndjson"
+    )
+
 @app.get("/api/health")
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+def metrics():
+    """Export request, LLM, parse-failure and fallback metrics for Prometheus."""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    """Report which endpoints use the LLM response cache and its hit/miss counts."""
+    return response_cache.stats()
+
+@app.get("/api/llm/stats")
+def llm_stats():
+    """Report LLM latency percentiles, retries, hedges, circuit and model routes."""
+    return {**resilience.stats(), "routes": router.stats()}
+
+@app.get("/api/llm/budgets")
+def llm_budgets():
+    """Report per-stage output budgets and how often completions hit them."""
+    return budget_stats.stats()
+
+@app.get("/api/singleflight/stats")
+def singleflight_stats():
+    """Report how many LLM calls were coalesced with an identical in-flight call."""
+    if inflight_calls is None:
+        return {"enabled": False}
+    return {"enabled": True, **inflight_calls.stats()}
+
+@app.get("/api/precomputed/stats")
+def precomputed_stats():
+    """Report precomputed motions, their fresh variants and hit counts."""
+    if precomputed is None:
+        return {"enabled": False}
+    return {"enabled": True, **precomputed.stats()}
+
+@app.get("/api/debate-jobs/stats")
+def debate_job_stats():
+    """Report queued, running and finished debate jobs and rejected submissions."""
+    return debate_jobs.stats()
+
+@app.get("/api/live-drafts/stats")
+def live_draft_stats():
+    """Report speculative live-counter drafts currently held."""
+    return drafts.stats()
+
 
 class LiveDebateRequest(BaseModel):
-    topic: str
+    topic: Optional[str] = None  # Taken from the session when session_id is set
     user_argument: str
     round: str  # "opening", "rebuttal", "closing"
-    argument_history: list = []  # Previous arguments in the debate
+    session_id: Optional[str] = None  # Server-side history; replaces argument_history
+    argument_history: list = []  # Previous arguments, for clients without a session
+    use_cache: bool = True
+    # Draft the next round's counter while the user types (sessions only)
+    speculate: bool = False
+
+
+class LiveSessionRequest(BaseModel):
+    topic: str
+
+
+class PrepareRequest(BaseModel):
+    round: str
+    partial_argument: str = ""  # What the user has typed so far, if anything
 
 
 class LiveDebateResponse(BaseModel):
@@ -186,24 +332,30 @@ class LiveDebateResponse(BaseModel):
     points: list
 
 
-@app.post("/api/live-counter")
-async def generate_counter(request: LiveDebateRequest):
-    """Generate AI counter-argument for the user's position in live debate."""
-    topic = request.topic
-    user_argument = request.user_argument
-    round_type = request.round
-    history = request.argument_history
-    
-    # Build history context
-    history_context = ""
-    if history:
-        history_context = "\n\nPrevious points in this debate:\n"
-        for item in history:
-            if item.get("type") == "user":
-                history_context += f"PRO: {item.get('text', '')}\n"
-            else:
-                history_context += f"CON: {item.get('text', '')}\n"
-    
+# Word cap for a counter refined from a speculative draft
+REFINED_COUNTER_WORDS = 140
+
+DRAFT_NOTES = """
+PREPARED NOTES (drafted before this argument arrived; use what applies to its actual
+claims and ignore the rest):
+{draft}
+"""
+
+
+def build_counter_prompt(
+    topic: str, user_argument: str, round_type: str, history_context: str = "",
+    draft: str = "",
+) -> str:
+    """Build the prompt for the AI's counter-argument in a live debate round.
+
+    ``draft`` holds speculative notes prepared while the user was typing, so
+    the model refines them into a tighter reply instead of starting from
+    nothing; fewer output tokens is where the latency saving comes from.
+    """
+    max_words = 200
+    if draft:
+        history_context += DRAFT_NOTES.format(draft=draft.strip())
+        max_words = REFINED_COUNTER_WORDS
     # Generate counter-argument based on round
     if round_type == "opening":
         prompt = f"""You are presenting the Opposition position in a live debate.
@@ -213,7 +365,7 @@ Argument to counter:
 {user_argument}
 {history_context}
 
-Write a counter-argument (max 200 words) that directly challenges this position.
+Write a counter-argument (max {max_words} words) that directly challenges this position.
 
 IMPORTANT RULES:
 - Do NOT refer to "the user" or "my opponent" or "the speaker"
@@ -232,7 +384,7 @@ Argument to counter:
 {user_argument}
 {history_context}
 
-Write a rebuttal (max 200 words) that dismantles this argument.
+Write a rebuttal (max {max_words} words) that dismantles this argument.
 
 IMPORTANT RULES:
 - Do NOT use "the user", "my opponent", "the previous speaker"
@@ -251,7 +403,7 @@ Final argument to counter:
 {user_argument}
 {history_context}
 
-Write a closing counter-argument (max 200 words).
+Write a closing counter-argument (max {max_words} words).
 
 IMPORTANT RULES:
 - Do NOT use "In conclusion" or "To summarize"
@@ -262,11 +414,11 @@ IMPORTANT RULES:
 
 Format: Present your strongest counter-points with evidence. End powerfully."""
 
-    response = llm.invoke(prompt)
-    content = response.content
-    counter_text = str(content) if not isinstance(content, str) else content
-    
-    # Split into points for structured display
+    return prompt
+
+
+def split_points(counter_text: str) -> list:
+    """Split a counter-argument into paragraph points for structured display."""
     points = []
     paragraphs = counter_text.strip().split('\n\n')
     for i, para in enumerate(paragraphs):
@@ -280,120 +432,339 @@ Format: Present your strongest counter-points with evidence. End powerfully."""
     if not points:
         points = [{"id": 1, "text": counter_text.strip()}]
     
+    return points
+
+
+@app.post("/api/live-sessions")
+def create_live_session(request: LiveSessionRequest):
+    """Start a live debate whose history is kept on the server."""
+    return {"session_id": sessions.create(request.topic), "topic": request.topic}
+
+
+@app.get("/api/live-sessions/{session_id}")
+def get_live_session(session_id: str):
+    """Return the topic and turns of a live debate session."""
+    session = load_session(session_id)
+    return {
+        "session_id": session_id,
+        "topic": session.topic,
+        "turns": [asdict(turn) for turn in session.turns],
+    }
+
+
+@app.delete("/api/live-sessions/{session_id}")
+def delete_live_session(session_id: str):
+    drafts.discard(session_id)
+    sessions.delete(session_id)
+    return {"deleted": session_id}
+
+
+@app.post("/api/live-sessions/{session_id}/prepare")
+async def prepare_live_round(session_id: str, request: PrepareRequest):
+    """Start drafting the AI's counter for a round while the user is still typing.
+
+    The draft is used by the next /api/live-counter call for this round that
+    sets ``speculate``; it is dropped if the debate moves on first.
+    """
+    session = load_session(session_id)
+    drafts.prepare(session_id, session, request.round, request.partial_argument)
+    return {"session_id": session_id, "round": request.round, "status": "preparing"}
+
+
+def load_session(session_id: str) -> DebateSession:
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404, detail="Debate session not found or expired"
+        )
+    return session
+
+
+async def counter_context(request: LiveDebateRequest):
+    """Resolve the session (if any), topic and compacted history for a counter call."""
+    if request.session_id:
+        session = load_session(request.session_id)
+        for turn in session.turns:
+            if turn.summary:
+                compactor.remember(turn.text, turn.summary)
+        entries = await compactor.compact(session.history_entries())
+        # Persist new summaries so other workers and restarts never recompute them
+        for turn in session.turns:
+            if not turn.summary and compactor.cached(turn.text):
+                turn.summary = compactor.cached(turn.text)
+        return session, session.topic, render_history(entries)
+    if not request.topic:
+        raise HTTPException(
+            status_code=422, detail="topic is required without a session_id"
+        )
+    entries = await compactor.compact(client_history_entries(request.argument_history))
+    return None, request.topic, render_history(entries)
+
+
+async def counter_prompt(request: LiveDebateRequest):
+    """Resolve the session and build the counter prompt, refining any ready draft."""
+    session, topic, history_context = await counter_context(request)
+    draft = ""
+    if session is not None and request.speculate:
+        draft = drafts.take(request.session_id, session, request.round) or ""
+    prompt = build_counter_prompt(
+        topic, request.user_argument, request.round, history_context, draft
+    )
+    return session, prompt
+
+
+def record_round(request: LiveDebateRequest, session, counter_text: str):
+    """Append the user's argument and the AI's counter to the session."""
+    if session is not None:
+        session.add_turn("user", request.round, request.user_argument)
+        session.add_turn("ai", request.round, counter_text)
+        sessions.save(request.session_id, session)
+        # Condense turns leaving the verbatim window while the user types the next round
+        compactor.warm([text for _, text in compactor.older(session.history_entries())])
+        upcoming = next_round(request.round)
+        if request.speculate and upcoming:
+            drafts.prepare(request.session_id, session, upcoming)
+
+
+@app.post("/api/live-counter")
+async def generate_counter(request: LiveDebateRequest):
+    """Generate AI counter-argument for the user's position in live debate."""
+    session, prompt = await counter_prompt(request)
+    counter_text = await invoke_llm(prompt, "counter", request.use_cache)
+    points = split_points(counter_text)
+    record_round(request, session, counter_text)
+    
     return {
         "counter_argument": counter_text,
-        "points": points
+        "points": points,
+        "session_id": request.session_id
     }
 
 
+async def counter_events(request: LiveDebateRequest, session, prompt: str):
+    """Yield token events for a counter-argument, plus each point as it completes."""
+    splitter = PointSplitter()
+    counter_text = ""
+    
+    async for chunk in stream_llm(prompt, "counter"):
+        counter_text += chunk
+        yield {"type": "token", "text": chunk}
+        for point in splitter.feed(chunk):
+            yield {"type": "point", **point}
+    for point in splitter.close():
+        yield {"type": "point", **point}
+    
+    record_round(request, session, counter_text)
+    yield {
+        "type": "done",
+        "counter_argument": counter_text,
+        "points": split_points(counter_text),
+        "session_id": request.session_id,
+    }
+
+
+@app.post("/api/live-counter/stream")
+async def stream_counter(request: LiveDebateRequest):
+    """Stream the AI counter-argument for a live debate round as NDJSON."""
+    session, prompt = await counter_prompt(request)
+    return StreamingResponse(
+        ndjson(counter_events(request, session, prompt)),
+        media_type="application/x-ndjson",
+    )
+
+
 class ScoringRequest(BaseModel):
     argument: str
     topic: str
+    use_cache: bool = True
+    fast: bool = False  # Local heuristic scores only, no LLM call
+    target_score: Optional[int] = None  # Also return tips towards this score
+
+
+class BatchScoringItem(BaseModel):
+    argument: str
+    topic: str
+
+
+class BatchScoringRequest(BaseModel):
+    arguments: list[BatchScoringItem]
+    use_cache: bool = True
+    fast: bool = False
+
+
+# Arguments packed into one judge call, and judge calls in flight per request
+SCORE_BATCH_SIZE = 5
+SCORE_BATCH_CONCURRENCY = 3
+
+
+async def gather_or_cancel(coroutines) -> list:
+    """Run coroutines concurrently; if one fails, cancel the others and re-raise.
+
+    Used where any failure fails the whole response, so the rest would
+    only spend quota on a result nobody receives.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def score_locally(argument: str, features, fast: bool, endpoint: str) -> Optional[dict]:
+    """Return scores that need no LLM call: trivial input, or fast mode."""
+    if features.trivial:
+        scored_locally.inc(endpoint=endpoint, reason="trivial")
+        return format_scores(trivial_scores(features), argument)
+    if fast:
+        scored_locally.inc(endpoint=endpoint, reason="fast")
+        return format_scores(local_scores(features), argument)
+    return None
+
+
+def with_local_counts(scores: dict, features) -> dict:
+    """Use the locally computed counts rather than asking the judge for them."""
+    return {
+        **scores,
+        "sentence_count": features.sentence_count,
+        "evidence_count": features.evidence_count,
+    }
+
+
+def coached(
+    scores: dict, target_score: Optional[int], tips: Optional[dict] = None
+) -> dict:
+    """Attach feedback to a score response when a target was requested.
+
+    Without tips from the judge, the rule-based tips of /api/get-feedback are used.
+    """
+    if target_score is not None:
+        gap = score_gap(scores, target_score)
+        scores["feedback"] = tips or fallback_feedback(scores, gap)
+    return scores
+
+
+async def judge_argument(
+    argument: str, topic: str, features, use_cache: bool = True,
+    target_score: Optional[int] = None,
+) -> dict:
+    """Score one argument with the schema-validated judge pipeline.
+
+    With a ``target_score`` the same call also returns improvement tips.
+    """
+    prompt = build_scoring_prompt(argument, topic, features, target_score)
+    schema, budget = ArgumentScores, None
+    if target_score is not None:
+        schema, budget = CoachedScores, COACHED_SCORE_BUDGET
+    check = agreement_check(features)
+    result = await request_structured(
+        prompt, schema, "score", use_cache, check=check, budget=budget
+    )
+    result = result.model_dump(exclude_none=True)
+    scores = format_scores(with_local_counts(result, features), argument)
+    if target_score is None:
+        return scores
+    tips = {"type": "improvement", "message": result["message"], "tips": result["tips"]}
+    return coached(scores, target_score, tips)
 
 
 @app.post("/api/score-argument")
 async def score_argument(request: ScoringRequest):
-    """Score a debate argument based on multiple metrics using AI analysis."""
+    """Score a debate argument based on multiple metrics using AI analysis.
+
+    Send ``target_score`` to get improvement tips in the same response.
+    """
     argument = request.argument
-    topic = request.topic
-    
-    # Use LLM to analyze the argument with specific quotes
-    scoring_prompt = f"""You are an expert debate judge. Analyze this argument IN DETAIL.
-
-TOPIC: {topic}
-
-ARGUMENT TO ANALYZE:
-"{argument}"
-
-Provide a thorough analysis with SPECIFIC QUOTES from the argument. For each metric, cite exactly which phrases led to your score.
-
-Respond in this EXACT JSON format:
-{{
-    "coherence": 0.XX,
-    "coherence_reason": "Quote the specific phrases that show good/poor flow. Example: 'The transition from X to Y was abrupt' or 'The phrase \"therefore\" effectively connects ideas'",
-    "relevance": 0.XX,
-    "relevance_reason": "Quote which parts directly address the topic and which parts drift off-topic",
-    "evidence_strength": 0.XX,
-    "evidence_reason": "List the specific evidence/facts cited. If none: 'No concrete evidence provided - claims like \"X\" lack supporting data'",
-    "fallacy_penalty": 0.XX,
-    "fallacy_reason": "Quote the exact phrases containing fallacies, or say 'No fallacies detected'",
-    "sentence_count": N,
-    "evidence_count": N,
-    "fallacies": ["specific fallacy with quote"] or [],
-    "strongest_point": "Quote the single best sentence/argument",
-    "weakest_point": "Quote the sentence that needs most improvement and explain why"
-}}
-
-Be specific. Quote exact phrases. Don't give generic feedback."""
+    features = analyze_argument(argument, request.topic)
+    local = score_locally(argument, features, request.fast, "score-argument")
+    if local is not None:
+        return coached(local, request.target_score)
 
     try:
-        response = llm.invoke(scoring_prompt)
-        content = response.content
-        
-        import json
-        import re
-        
-        json_match = re.search(r'\{[\s\S]*\}', str(content))
-        if json_match:
-            scores = json.loads(json_match.group())
-        else:
-            raise ValueError("Could not parse scoring response")
-        
-        # Ensure all values are within bounds
-        scores["coherence"] = max(0, min(1, float(scores.get("coherence", 0.7))))
-        scores["relevance"] = max(0, min(1, float(scores.get("relevance", 0.7))))
-        scores["evidence_strength"] = max(0, min(1, float(scores.get("evidence_strength", 0.6))))
-        scores["fallacy_penalty"] = max(0, min(1, float(scores.get("fallacy_penalty", 0.1))))
-        
-        # Calculate argument strength using weighted sum
-        w1, w2, w3, w4 = 0.25, 0.30, 0.30, 0.15
-        argument_strength = (
-            w1 * scores["coherence"] +
-            w2 * scores["relevance"] +
-            w3 * scores["evidence_strength"] -
-            w4 * scores["fallacy_penalty"]
+        return await judge_argument(
+            argument, request.topic, features, request.use_cache, request.target_score
         )
-        argument_strength = max(0, min(1, argument_strength))
-        
-        return {
-            "coherence": scores["coherence"],
-            "coherenceReason": scores.get("coherence_reason", ""),
-            "relevance": scores["relevance"],
-            "relevanceReason": scores.get("relevance_reason", ""),
-            "evidenceStrength": scores["evidence_strength"],
-            "evidenceReason": scores.get("evidence_reason", ""),
-            "fallacyPenalty": scores["fallacy_penalty"],
-            "fallacyReason": scores.get("fallacy_reason", ""),
-            "argumentStrength": argument_strength,
-            "strongestPoint": scores.get("strongest_point", ""),
-            "weakestPoint": scores.get("weakest_point", ""),
-            "details": {
-                "sentenceCount": scores.get("sentence_count", len(argument.split('.'))),
-                "evidenceCount": scores.get("evidence_count", 0),
-                "fallaciesDetected": scores.get("fallacies", [])
-            }
-        }
-        
+
+    except (RateLimitExceeded, CircuitOpenError):
+        raise
     except Exception as e:
         print(f"Error scoring argument: {e}")
-        return {
-            "coherence": 0.7,
-            "coherenceReason": "Unable to analyze - please try again",
-            "relevance": 0.7,
-            "relevanceReason": "Unable to analyze - please try again",
-            "evidenceStrength": 0.6,
-            "evidenceReason": "Unable to analyze - please try again",
-            "fallacyPenalty": 0.1,
-            "fallacyReason": "Unable to analyze - please try again",
-            "argumentStrength": 0.72,
-            "strongestPoint": "",
-            "weakestPoint": "",
-            "details": {
-                "sentenceCount": len(argument.split('.')),
-                "evidenceCount": 0,
-                "fallaciesDetected": []
-            }
-        }
+        fallbacks.inc(endpoint="score-argument")
+        return coached(fallback_scores(argument), request.target_score)
+
+
+@app.post("/api/score-arguments")
+async def score_arguments(request: BatchScoringRequest):
+    """Score many arguments, packing several into each LLM call.
+
+    Results come back in input order. Trivial arguments (and all of them in
+    fast mode) are scored locally. An argument missing or invalid in the
+    batch response is re-scored on its own; if that fails too it gets the
+    same fallback as /api/score-argument. If one batch hits the rate limit
+    or an open circuit, the others are cancelled and the error is returned.
+    """
+    items = request.arguments
+    features = [analyze_argument(item.argument, item.topic) for item in items]
+    results = [
+        score_locally(item.argument, facts, request.fast, "score-arguments")
+        for item, facts in zip(items, features)
+    ]
+    pending = [i for i, result in enumerate(results) if result is None]
+    size = SCORE_BATCH_SIZE
+    chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+    semaphore = asyncio.Semaphore(SCORE_BATCH_CONCURRENCY)
+
+    async def score_chunk(chunk: list):
+        def complete(content: str):
+            # Only fully scored batches are worth caching
+            if None in parse_batch_scores(content, len(chunk)):
+                raise ValueError("Batch scoring response is incomplete")
+
+        async with semaphore:
+            try:
+                prompt = build_batch_scoring_prompt(
+                    [items[i] for i in chunk], [features[i] for i in chunk]
+                )
+                content = await invoke_llm(
+                    prompt, "score", request.use_cache, json_mode=True,
+                    validate=complete, budget=BUDGETS["score"].scaled(len(chunk)),
+                )
+                parsed = parse_batch_scores(content, len(chunk))
+                record_parse("score-batch", "invalid" if None in parsed else "ok")
+            except (RateLimitExceeded, CircuitOpenError):
+                raise
+            except Exception as e:
+                print(f"Error scoring argument batch: {e}")
+                record_parse("score-batch", "failed")
+                parsed = [None] * len(chunk)
+
+        # Re-judge misses concurrently, without holding a batch slot meanwhile
+        await gather_or_cancel(
+            score_item(i, scores) for i, scores in zip(chunk, parsed)
+        )
+
+    async def score_item(i: int, scores: Optional[dict]):
+        item = items[i]
+        try:
+            if scores is None:
+                results[i] = await judge_argument(
+                    item.argument, item.topic, features[i], request.use_cache
+                )
+            else:
+                results[i] = format_scores(
+                    with_local_counts(scores, features[i]), item.argument
+                )
+        except (RateLimitExceeded, CircuitOpenError):
+            raise
+        except Exception as e:
+            print(f"Error scoring argument: {e}")
+            fallbacks.inc(endpoint="score-arguments")
+            results[i] = fallback_scores(item.argument)
+
+    await gather_or_cancel(score_chunk(chunk) for chunk in chunks)
+    return {"results": results}
 
 
 class FeedbackRequest(BaseModel):
@@ -401,97 +772,27 @@ class FeedbackRequest(BaseModel):
     topic: str
     scores: dict
     target_score: int
+    use_cache: bool = True
 
 
 @app.post("/api/get-feedback")
 async def get_feedback(request: FeedbackRequest):
     """Get AI feedback on how to improve an argument to reach the target score."""
-    argument = request.argument
-    topic = request.topic
     scores = request.scores
-    target_score = request.target_score
-    current_score = int(scores.get("argumentStrength", 0.7) * 100)
-    gap = target_score - current_score
-    
-    feedback_prompt = f"""You are an expert debate coach helping someone improve their argumentation skills.
-
-TOPIC: {topic}
-
-STUDENT'S ARGUMENT:
-{argument}
-
-CURRENT SCORES:
-- Coherence: {scores.get('coherence', 0.7):.0%}
-- Relevance: {scores.get('relevance', 0.7):.0%}
-- Evidence Strength: {scores.get('evidenceStrength', 0.6):.0%}
-- Fallacy Penalty: -{scores.get('fallacyPenalty', 0.1):.0%}
-- Overall Score: {current_score}%
-- Target Score: {target_score}%
-- Gap to close: {gap} points
-
-Provide specific, actionable feedback to help them improve. Focus on their weakest areas.
-
-Respond in this EXACT JSON format:
-{{
-    "type": "improvement",
-    "message": "A brief encouraging message about their gap to the target (1 sentence)",
-    "tips": [
-        {{
-            "metric": "Name of metric to improve",
-            "tip": "Specific, actionable advice (2-3 sentences max)"
-        }}
-    ]
-}}
-
-Provide 2-3 tips focusing on the metrics with the lowest scores. Be concise and practical."""
+    gap = score_gap(scores, request.target_score)
+    feedback_prompt = build_feedback_prompt(
+        request.argument, request.topic, scores, request.target_score
+    )
 
     try:
-        response = llm.invoke(feedback_prompt)
-        content = response.content
-        
-        import json
-        import re
-        
-        json_match = re.search(r'\{[\s\S]*\}', str(content))
-        if json_match:
-            feedback = json.loads(json_match.group())
-            return feedback
-        else:
-            raise ValueError("Could not parse feedback")
-            
+        feedback = await request_structured(
+            feedback_prompt, FeedbackResult, "feedback", request.use_cache
+        )
+        return feedback.model_dump()
+
+    except (RateLimitExceeded, CircuitOpenError):
+        raise
     except Exception as e:
         print(f"Error getting feedback: {e}")
-        # Generate fallback feedback
-        tips = []
-        if scores.get("coherence", 1) < 0.75:
-            tips.append({
-                "metric": "Coherence",
-                "tip": "Connect your ideas more clearly. Use transition words like 'therefore', 'however', 'furthermore' to link sentences."
-            })
-        if scores.get("relevance", 1) < 0.8:
-            tips.append({
-                "metric": "Relevance",
-                "tip": "Stay focused on the debate topic. Make sure each point directly addresses the motion."
-            })
-        if scores.get("evidenceStrength", 1) < 0.7:
-            tips.append({
-                "metric": "Evidence",
-                "tip": "Add specific examples, statistics, or expert citations to strengthen your claims."
-            })
-        if scores.get("fallacyPenalty", 0) > 0.1:
-            tips.append({
-                "metric": "Logic",
-                "tip": "Avoid emotional appeals and stick to evidence-based reasoning. Check for common fallacies."
-            })
-        
-        if not tips:
-            tips.append({
-                "metric": "Overall",
-                "tip": "Add more depth and specificity to your arguments. Consider addressing potential counterarguments."
-            })
-        
-        return {
-            "type": "improvement",
-            "message": f"You need {gap} more points to reach your target. Here's how:",
-            "tips": tips[:3]
-        }
+        fallbacks.inc(endpoint="get-feedback")
+        return fallback_feedback(scores, gap)
@@ -0,0 +1,194 @@
+import threading
+import time
+
+from tokens import count_tokens
+
+# Seconds; LLM calls routinely take several seconds, so the range is wide
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0)
+
+REGISTRY = []
+
+
+def _format_labels(names: tuple, values: tuple, extra: tuple = ()) -> str:
+    pairs = [f'{name}="{value}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            counts, total, count = self.values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        for key, (counts, total, count) in sorted(self.values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labels, key, (("le", bound),))
+                yield f"{self.name}_bucket{labels} {bucket_count}"
+            labels = _format_labels(self.labels, key, (("le", "+Inf"),))
+            yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {count}"
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by endpoint",
+    ("endpoint", "method", "status"),
+)
+llm_call_duration = Histogram(
+    "llm_call_duration_seconds",
+    "Upstream LLM call latency by debate stage or task, and model",
+    ("stage", "model"),
+)
+llm_prompt_tokens = Counter(
+    "llm_prompt_tokens_total", "Prompt tokens sent to the LLM", ("stage",)
+)
+llm_completion_tokens = Counter(
+    "llm_completion_tokens_total", "Completion tokens received from the LLM", ("stage",)
+)
+llm_calls = Counter(
+    "llm_calls_total",
+    "Upstream LLM calls by model and outcome",
+    ("stage", "model", "outcome"),
+)
+model_escalations = Counter(
+    "llm_escalations_total",
+    "Responses escalated to the next model of a task's cascade",
+    ("task", "model", "reason"),
+)
+output_overruns = Counter(
+    "llm_output_overruns_total",
+    "Completions cut by max_tokens, trimmed or stopped early",
+    ("stage", "kind"),
+)
+trimmed_tokens = Counter(
+    "llm_trimmed_tokens_total",
+    "Completion tokens trimmed past the word budget",
+    ("stage",),
+)
+json_parses = Counter(
+    "llm_json_parse_total",
+    "Attempts to parse JSON from judge responses",
+    ("task", "result"),
+)
+speculative_drafts = Counter(
+    "speculative_drafts_total",
+    "Speculative live-counter drafts by outcome",
+    ("outcome",),
+)
+scored_locally = Counter(
+    "local_scores_total", "Arguments scored without an LLM call", ("endpoint", "reason")
+)
+fallbacks = Counter(
+    "fallback_responses_total",
+    "Responses served from hard-coded fallbacks",
+    ("endpoint",),
+)
+
+
+def record_llm_call(
+    stage: str, model: str, seconds: float, prompt: str, response=None,
+    completion: str = "",
+):
+    """Record latency and token usage for one upstream LLM call.
+
+    Uses the provider's reported usage when the response carries it and a
+    local estimate otherwise.
+    """
+    llm_call_duration.observe(seconds, stage=stage, model=model)
+    usage = getattr(response, "usage_metadata", None) or {}
+    llm_prompt_tokens.inc(usage.get("input_tokens", count_tokens(prompt)), stage=stage)
+    llm_completion_tokens.inc(
+        usage.get("output_tokens", count_tokens(completion)), stage=stage
+    )
+    llm_calls.inc(stage=stage, model=model, outcome="ok")
+
+
+def record_parse(task: str, result: str):
+    """Count one judge-output parse: ok, invalid (re-asked), repaired or failed."""
+    json_parses.inc(task=task, result=result)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request, labelled with its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                endpoint=getattr(route, "path", "unmatched"),
+                method=scope["method"],
+                status=status["code"],
+            )
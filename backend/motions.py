@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+
+from analysis import STOPWORDS, stem
+
+_WORDS = re.compile(r"[a-z][a-z']*")
+# Words that flip a motion's meaning; two motions only match if they agree on these
+NEGATIONS = frozenset({"no", "not", "nor", "never", "against"})
+_MAX_HASH = (1 << 64) - 1
+
+
+def motion_terms(topic: str) -> list:
+    """Stemmed content words of a motion in order, keeping negations."""
+    text = topic.lower().replace("n't", " not")
+    return [
+        word if word in NEGATIONS else stem(word)
+        for word in (w.strip("'") for w in _WORDS.findall(text))
+        if word and (word in NEGATIONS or word not in STOPWORDS)
+    ]
+
+
+def _hash(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def shingles(topic: str) -> frozenset:
+    """Hashed word and word-pair shingles; pairs keep some of the word order."""
+    terms = motion_terms(topic)
+    features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    return frozenset(_hash(feature) for feature in features)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MotionIndex:
+    """Find stored motions that are near-duplicates of a new one.
+
+    Motions are reduced to word shingles and indexed with MinHash LSH:
+    ``bands`` bands of ``rows`` hashes each, so motions sharing any band
+    become candidates. With the defaults a pair at 0.8 similarity shares a
+    band about 95% of the time and one at 0.5 only 6% of the time, which
+    keeps candidate lists short when many motions share words like "ban".
+    Candidates are then compared by exact Jaccard similarity of their
+    shingles, and the best one at or above
+    ``threshold`` is the match. Motions must also agree on negations, so
+    "X should be banned" never matches "X should not be banned".
+
+    Hash functions are derived from a fixed seed and stable hashes, so a
+    saved index can be reloaded by another process.
+    """
+
+    def __init__(
+        self, threshold: float = 0.8, bands: int = 16, rows: int = 8, seed: int = 1
+    ):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        # XOR with a random mask reorders the (already uniform) shingle hashes;
+        # about three times cheaper in Python than (a * x + b) mod p
+        self.masks = [rng.getrandbits(64) for _ in range(bands * rows)]
+        self.lock = threading.Lock()
+        self.keys = []
+        self.features = []
+        self.negations = []
+        self.band_index = []
+        self.ids = {}
+        self.buckets = {}
+        self.lookups = 0
+        self.matches_found = 0
+
+    def signature(self, features: frozenset) -> list:
+        if not features:
+            return [_MAX_HASH] * len(self.masks)
+        return [min([x ^ mask for x in features]) for mask in self.masks]
+
+    def band_keys(self, features: frozenset) -> list:
+        signature = self.signature(features)
+        return [
+            hash((band, tuple(signature[band * self.rows:(band + 1) * self.rows])))
+            for band in range(self.bands)
+        ]
+
+    def add(self, topic: str, key: str = None):
+        """Index a motion under ``key`` (by default the motion itself)."""
+        key = key or topic
+        if key in self.ids:
+            return
+        features = shingles(topic)
+        negations = frozenset(NEGATIONS.intersection(motion_terms(topic)))
+        bands = self.band_keys(features)
+        with self.lock:
+            if key in self.ids:
+                return
+            self._insert(key, features, negations, bands)
+
+    def _insert(self, key: str, features: frozenset, negations: frozenset, bands: list):
+        index = len(self.keys)
+        self.ids[key] = index
+        self.keys.append(key)
+        self.features.append(features)
+        self.negations.append(negations)
+        self.band_index.append(bands)
+        for band in bands:
+            self.buckets.setdefault(band, []).append(index)
+
+    def matches(self, topic: str) -> list:
+        """Return (key, similarity) of every match above the threshold, best first."""
+        features = shingles(topic)
+        negations = frozenset(NEGATIONS.intersection(motion_terms(topic)))
+        bands = self.band_keys(features)
+        with self.lock:
+            self.lookups += 1
+            candidates = {
+                index for band in bands for index in self.buckets.get(band, ())
+            }
+            found = []
+            for index in candidates:
+                if self.negations[index] != negations:
+                    continue
+                similarity = jaccard(features, self.features[index])
+                if similarity >= self.threshold:
+                    found.append((self.keys[index], similarity))
+            if found:
+                self.matches_found += 1
+        return sorted(found, key=lambda match: match[1], reverse=True)
+
+    def match(self, topic: str):
+        """Return (key, similarity) of the closest match, or None if none is close."""
+        found = self.matches(topic)
+        return found[0] if found else None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def save(self, path: str):
+        """Write the index to ``path`` as JSON, replacing the file atomically.
+
+        The JSON goes to a uniquely named temporary file in the same
+        directory first, so concurrent writers never mix their output.
+        """
+        with self.lock:
+            data = {
+                "bands": self.bands,
+                "rows": self.rows,
+                "threshold": self.threshold,
+                # Band keys are saved so loading does not recompute every signature
+                "entries": [
+                    [key, sorted(features), sorted(negations), bands]
+                    for key, features, negations, bands in zip(
+                        self.keys, self.features, self.negations, self.band_index
+                    )
+                ],
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str, threshold: float = None) -> "MotionIndex":
+        """Read an index written by ``save``; ``threshold`` overrides the saved one."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if threshold is None:
+            threshold = data["threshold"]
+        index = cls(threshold, data["bands"], data["rows"])
+        for key, features, negations, bands in data["entries"]:
+            index._insert(key, frozenset(features), frozenset(negations), bands)
+        return index
+
+    def stats(self) -> dict:
+        return {
+            "motions": len(self.keys),
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "matches": self.matches_found,
+        }
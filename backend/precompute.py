@@ -0,0 +1,258 @@
+"""Precompute full debates for popular motions.
+
+Usage: python precompute.py topics.txt [--variants 3] [--force] [--invalidate]
+
+Reads one motion per line (blank lines and ``#`` comments are skipped) and
+makes sure each has ``--variants`` fresh /api/debate results in the store.
+Only missing or expired variants are generated, so the job is cheap to run
+from cron. ``--force`` regenerates every variant; ``--invalidate`` drops the
+stored debates for the listed motions without generating new ones. When
+MOTION_INDEX_PATH is set, the near-duplicate motion index is saved there
+afterwards so the server does not have to rebuild it.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from cache import normalize_prompt
+from graph import format_debate, run_debate_graph
+from motions import MotionIndex
+from sqlite_store import SQLiteStore
+
+
+def topic_key(topic: str) -> str:
+    """Case- and whitespace-insensitive key, so "Uniforms?" and "uniforms? " match."""
+    return normalize_prompt(topic).lower()
+
+
+def read_topics(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        motions = (line for line in lines if line and not line.startswith("#"))
+        return list(dict.fromkeys(motions))
+
+
+class PrecomputedDebates(SQLiteStore):
+    """SQLite store of ready-made /api/debate responses, several per motion.
+
+    Variants older than ``ttl`` seconds are no longer served and are replaced
+    by the next precompute run. Reads rotate through a motion's variants so
+    repeat visitors do not keep seeing the same debate.
+
+    A motion with no variants of its own is served those of the closest
+    stored motion in ``index`` (see motions.py), so paraphrases such as
+    "Social media is more harmful than beneficial" reuse the debates of
+    "Is social media more harmful than beneficial?". Motions with fresh
+    variants are added to the index on the first miss, not when the store
+    is opened, so importing the app does not wait for it.
+    """
+
+    def __init__(
+        self, path: str = "debates.sqlite3", ttl: float = 7 * 86400,
+        clock=time.time, index: MotionIndex = None,
+    ):
+        super().__init__(
+            path,
+            "CREATE TABLE IF NOT EXISTS debates (id INTEGER PRIMARY KEY, "
+            "topic_key TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS debates_topic ON debates (topic_key)",
+        )
+        self.ttl = ttl
+        self.clock = clock
+        self.rotation = {}
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.index = index if index is not None else MotionIndex()
+        self.indexed = False
+
+    def index_stored(self):
+        """Add the motions with fresh variants to the index, once."""
+        if self.indexed:
+            return
+        with self.lock:
+            keys = self.conn.execute(
+                "SELECT DISTINCT topic_key FROM debates WHERE created_at > ?",
+                (self.clock() - self.ttl,),
+            ).fetchall()
+        # Motions already in the index (e.g. loaded from disk) are skipped
+        for (key,) in keys:
+            self.index.add(key)
+        self.indexed = True
+
+    def fresh(self, topic: str) -> list:
+        """Return the ids of a motion's unexpired variants, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id FROM debates WHERE topic_key = ? AND created_at > ?"
+                " ORDER BY created_at",
+                (topic_key(topic), self.clock() - self.ttl),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pick(self, topic: str):
+        """Return the next variant of a motion or of its closest paraphrase, or None."""
+        key = topic_key(topic)
+        ids = self.fresh(key)
+        similar = False
+        if not ids:
+            self.index_stored()
+            # The closest paraphrase may have expired or been invalidated; try the next
+            for candidate, _ in self.index.matches(key):
+                ids = self.fresh(candidate)
+                if ids:
+                    key, similar = candidate, True
+                    break
+        if not ids:
+            self.misses += 1
+            return None
+        if key not in self.rotation:
+            self.rotation[key] = itertools.count()
+        variant = ids[next(self.rotation[key]) % len(ids)]
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result FROM debates WHERE id = ?", (variant,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.similar_hits += similar
+        return json.loads(row[0])
+
+    def add(self, topic: str, result: dict):
+        key = topic_key(topic)
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO debates (topic_key, result, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result), self.clock()),
+            )
+            self.conn.commit()
+        self.index.add(key)
+
+    def delete(self, ids: list):
+        with self.lock:
+            rows = [(i,) for i in ids]
+            self.conn.executemany("DELETE FROM debates WHERE id = ?", rows)
+            self.conn.commit()
+
+    def invalidate(self, topic: str = None) -> int:
+        """Delete the variants of one motion, or of every motion."""
+        with self.lock:
+            if topic is None:
+                deleted = self.conn.execute("DELETE FROM debates").rowcount
+            else:
+                deleted = self.conn.execute(
+                    "DELETE FROM debates WHERE topic_key = ?", (topic_key(topic),)
+                ).rowcount
+            self.conn.commit()
+        return deleted
+
+    def prune(self) -> int:
+        """Delete expired variants."""
+        with self.lock:
+            deleted = self.conn.execute(
+                "DELETE FROM debates WHERE created_at <= ?", (self.clock() - self.ttl,)
+            ).rowcount
+            self.conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        with self.lock:
+            motions, variants = self.conn.execute(
+                "SELECT COUNT(DISTINCT topic_key), COUNT(*) FROM debates"
+                " WHERE created_at > ?",
+                (self.clock() - self.ttl,),
+            ).fetchone()
+        return {
+            "motions": motions,
+            "variants": variants,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "index": self.index.stats(),
+        }
+
+    def save_index(self):
+        """Persist the motion index to MOTION_INDEX_PATH, if set.
+
+        Only the precompute CLI calls this; server workers load the file and
+        add any motions stored since, but never write it.
+        """
+        path = os.getenv("MOTION_INDEX_PATH")
+        if path:
+            self.index_stored()
+            self.index.save(path)
+
+
+def build_motion_index() -> MotionIndex:
+    """Load the motion index from MOTION_INDEX_PATH if it exists, else start empty."""
+    threshold = float(os.getenv("MOTION_MATCH_THRESHOLD", "0.8"))
+    path = os.getenv("MOTION_INDEX_PATH")
+    if path and os.path.exists(path):
+        try:
+            return MotionIndex.load(path, threshold)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading motion index, rebuilding it: {e}")
+    return MotionIndex(threshold)
+
+
+def build_precomputed():
+    """Open the precomputed-debate store, or None unless PRECOMPUTE_PATH is set."""
+    path = os.getenv("PRECOMPUTE_PATH")
+    if not path:
+        return None
+    ttl = float(os.getenv("PRECOMPUTE_TTL", str(7 * 86400)))
+    return PrecomputedDebates(path, ttl=ttl, index=build_motion_index())
+
+
+async def precompute(
+    store: PrecomputedDebates, topics: list, variants: int, force: bool = False
+) -> dict:
+    """Fill the store with ``variants`` fresh debates per motion, one motion at a time.
+
+    With ``force`` every variant is regenerated; the old ones keep being
+    served until their motion's replacements are stored.
+    """
+    pruned = store.prune()
+    generated = 0
+    for topic in topics:
+        existing = store.fresh(topic)
+        missing = variants if force else variants - len(existing)
+        for i in range(missing):
+            print(f"--- Precomputing '{topic}' ({i + 1}/{missing}) ---")
+            # Bypass the response cache so each variant is a distinct debate
+            speeches = await run_debate_graph(topic, use_cache=False)
+            store.add(topic, format_debate(topic, speeches))
+            generated += 1
+        if force:
+            store.delete(existing)
+    return {"generated": generated, "pruned": pruned, **store.stats()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("topics", help="File with one motion per line")
+    parser.add_argument(
+        "--variants", type=int, default=int(os.getenv("PRECOMPUTE_VARIANTS", "3"))
+    )
+    parser.add_argument("--force", action="store_true", help="Regenerate every variant")
+    parser.add_argument(
+        "--invalidate",
+        action="store_true",
+        help="Only delete the stored debates for these motions",
+    )
+    args = parser.parse_args()
+
+    store = build_precomputed() or PrecomputedDebates(index=build_motion_index())
+    topics = read_topics(args.topics)
+    if args.invalidate:
+        print({"deleted": sum(store.invalidate(topic) for topic in topics)})
+    else:
+        print(asyncio.run(precompute(store, topics, args.variants, args.force)))
+    store.save_index()
@@ -0,0 +1,145 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+
+from tokens import count_tokens
+
+# Lower number is served first. Live debate counters keep a user waiting
+# mid-conversation; whole debates and scoring can tolerate queueing.
+PRIORITIES = {"interactive": 0, "bulk": 1}
+TASK_PRIORITIES = {"counter": "interactive"}
+
+# Rough completion size per call, added to the prompt estimate
+COMPLETION_TOKEN_ESTIMATE = 300
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot be scheduled within its priority's max wait."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM rate limit reached, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Token estimate for a call: the prompt plus a typical reply."""
+    return count_tokens(prompt) + COMPLETION_TOKEN_ESTIMATE
+
+
+class TokenBucket:
+    """Token bucket refilling at ``rate`` per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.level = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if it can be taken now)."""
+        self._refill()
+        # A request bigger than the bucket would never fit; let it drain the bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class Scheduler:
+    """Admit LLM calls under requests-per-minute and tokens-per-minute limits.
+
+    Waiting calls are served in priority order, then arrival order. A call
+    that cannot be admitted within its priority's max wait raises
+    RateLimitExceeded with a retry hint instead of going upstream and failing.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_wait: dict,
+        clock=time.monotonic,
+        sleep=asyncio.sleep,
+        poll_interval: float = 0.05,
+    ):
+        self.requests = TokenBucket(
+            requests_per_minute / 60, requests_per_minute, clock
+        )
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute, clock)
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.poll_interval = poll_interval
+        self.waiters = []
+        self.sequence = itertools.count()
+        self.rejected = 0
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    async def acquire(self, priority: str, tokens: int, max_wait: float = None):
+        """Wait until a call of ``tokens`` estimated tokens may be sent.
+
+        ``max_wait`` shortens the priority's max wait, e.g. to the time left
+        before the caller's deadline; 0 admits the call only if it can go now.
+        """
+        limit = self.max_wait[priority]
+        if max_wait is not None:
+            limit = min(max_wait, limit)
+        deadline = self.clock() + limit
+        entry = (PRIORITIES[priority], next(self.sequence))
+        heapq.heappush(self.waiters, entry)
+        try:
+            while True:
+                wait = self._wait_time(tokens)
+                at_head = self.waiters[0] == entry
+                if at_head and wait == 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                pause = max(wait, 0 if at_head else self.poll_interval)
+                if self.clock() + pause > deadline:
+                    self.rejected += 1
+                    raise RateLimitExceeded(max(wait, self.poll_interval))
+                await self.sleep(wait if at_head else self.poll_interval)
+        finally:
+            self.waiters.remove(entry)
+            heapq.heapify(self.waiters)
+
+    def stats(self) -> dict:
+        return {
+            "waiting": len(self.waiters),
+            "rejected": self.rejected,
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level),
+        }
+
+
+def build_scheduler():
+    """Build the scheduler from GROQ_RPM / GROQ_TPM; a limit of 0 disables it.
+
+    Defaults match Groq's free tier for llama-3.3-70b-versatile. The limits
+    are for the whole deployment: each of SERVER_WORKERS processes (set by
+    gunicorn.conf.py) gets an equal share.
+    """
+    processes = max(1, int(os.getenv("SERVER_WORKERS", "1")))
+    rpm = float(os.getenv("GROQ_RPM", "30")) / processes
+    tpm = float(os.getenv("GROQ_TPM", "12000")) / processes
+    if rpm <= 0 or tpm <= 0:
+        return None
+    return Scheduler(rpm, tpm, max_wait={
+        "interactive": float(os.getenv("LLM_MAX_WAIT_INTERACTIVE", "10")),
+        "bulk": float(os.getenv("LLM_MAX_WAIT_BULK", "30")),
+    })
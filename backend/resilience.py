@@ -0,0 +1,292 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from functools import lru_cache
+
+from ratelimit import RateLimitExceeded
+
+# Total seconds an endpoint's LLM call may take, retries and hedges included
+TASK_DEADLINES = {
+    "opening": 40.0,
+    "rebuttal": 40.0,
+    "closing": 40.0,
+    "counter": 25.0,
+    "draft": 40.0,
+    "score": 30.0,
+    "feedback": 30.0,
+    "summary": 15.0,
+    "repair": 15.0,
+}
+DEFAULT_DEADLINE = 40.0
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> tuple:
+    """Upstream errors worth another attempt; bad requests and auth failures are not.
+
+    groq is imported here rather than at module load: by the first LLM call
+    the chat model has imported it already, and startup does not pay for it.
+    """
+    import groq
+
+    return (
+        groq.APIConnectionError,  # includes APITimeoutError
+        groq.RateLimitError,
+        groq.InternalServerError,
+        TimeoutError,
+    )
+
+
+def upstream_failure(error: BaseException) -> bool:
+    """Whether an error says the upstream is unhealthy, retryable or not.
+
+    Server errors and auth failures count; other 4xx answers (bad requests,
+    JSON mode validation) show the upstream is up and do not.
+    """
+    if isinstance(error, retryable_errors()):
+        return True
+    import groq
+
+    return isinstance(error, groq.APIStatusError) and (
+        error.status_code >= 500 or error.status_code in (401, 403)
+    )
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM upstream unavailable, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng=random.random) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return rng() * min(cap, base * 2 ** attempt)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per task."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.samples = {}
+
+    def record(self, task: str, seconds: float):
+        self.samples.setdefault(task, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, task: str, q: float):
+        samples = sorted(self.samples.get(task, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def count(self, task: str) -> int:
+        return len(self.samples.get(task, ()))
+
+    def stats(self) -> dict:
+        return {
+            task: {
+                "count": self.count(task),
+                "p50": round(self.percentile(task, 0.50), 3),
+                "p95": round(self.percentile(task, 0.95), 3),
+                "p99": round(self.percentile(task, 0.99), 3),
+            }
+            for task in self.samples
+        }
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` failures in a row, until ``reset_timeout``.
+
+    Half-open admits a single probe call; others fail fast until it succeeds
+    (closing the circuit) or fails (re-opening it). Every ``before_call``
+    must be followed by ``record_success``, ``record_failure`` or ``release``.
+    """
+
+    # Retry-After for calls turned away while a half-open probe is running
+    PROBE_RETRY_AFTER = 1.0
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        """Fail fast while open; in half-open, let one call through as the probe."""
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError(self.reset_timeout - (self.clock() - self.opened_at))
+        if state == "half-open":
+            if self.probing:
+                raise CircuitOpenError(self.PROBE_RETRY_AFTER)
+            self.probing = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        # A failed half-open probe re-opens the circuit for another full timeout
+        if self.failures >= self.failure_threshold or self.probing:
+            self.opened_at = self.clock()
+        self.probing = False
+
+    def release(self):
+        """End a call that says nothing about upstream health (cancelled, a 400)."""
+        self.probing = False
+
+
+async def admitted_now(admit) -> bool:
+    """Whether ``admit`` lets a call through without waiting."""
+    if admit is None:
+        return True
+    try:
+        await admit(0.0)
+    except RateLimitExceeded:
+        return False
+    return True
+
+
+class Resilience:
+    """Deadlines, jittered retries, optional hedging and a circuit breaker for LLMs."""
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 4.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        breaker: CircuitBreaker = None,
+        deadlines: dict = None,
+        sleep=asyncio.sleep,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.deadlines = deadlines or TASK_DEADLINES
+        self.sleep = sleep
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges = 0
+
+    async def run(self, task: str, attempt, model: str = None, admit=None):
+        """Run ``attempt()`` under the task's deadline, retrying retryable errors.
+
+        ``admit(max_wait)`` is awaited before every upstream call, e.g. to wait
+        for the rate limiter, and must give up within ``max_wait`` seconds.
+        Its wait is capped at the time left before the deadline, and its
+        errors (RateLimitExceeded) are raised without touching the breaker:
+        the call never reached upstream. Each attempt then gets the rest of
+        the time, so one that hangs times out and counts as a breaker
+        failure. Latency (and so the hedging threshold) is tracked per task
+        and model.
+        """
+        key = task if model is None else f"{task}@{model}"
+        deadline = time.monotonic() + self.deadlines.get(task, DEFAULT_DEADLINE)
+        for retry in range(self.max_retries + 1):
+            self.breaker.before_call()
+            if admit is not None:
+                try:
+                    await admit(max(0.0, deadline - time.monotonic()))
+                except BaseException:
+                    self.breaker.release()
+                    raise
+            start = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    self._attempt(key, attempt, admit), timeout=deadline - start
+                )
+            except BaseException as e:
+                if isinstance(e, Exception) and upstream_failure(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release()
+                if not isinstance(e, retryable_errors()) or retry == self.max_retries:
+                    raise
+                delay = backoff_delay(retry, self.backoff_base, self.backoff_cap)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                self.retries += 1
+                print(f"Retrying {key} LLM call after error: {e}")
+                await self.sleep(delay)
+            else:
+                self.breaker.record_success()
+                self.latency.record(key, time.monotonic() - start)
+                return result
+
+    async def _attempt(self, task: str, attempt, admit=None):
+        """One attempt, plus a hedged duplicate if it runs past the task's p95.
+
+        The duplicate is only sent if ``admit`` lets it through straight away.
+        """
+        hedge_after = None
+        if self.hedge and self.latency.count(task) >= self.hedge_min_samples:
+            hedge_after = self.latency.percentile(task, 0.95)
+        if hedge_after is None:
+            return await attempt()
+
+        first = asyncio.ensure_future(attempt())
+        calls = {first}
+        try:
+            done, _ = await asyncio.wait(calls, timeout=hedge_after)
+            if not done and await admitted_now(admit):
+                self.hedges += 1
+                calls.add(asyncio.ensure_future(attempt()))
+            pending = set(calls)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for call in done:
+                    if call.exception() is None:
+                        return call.result()
+            # Every attempt failed; surface the original attempt's error
+            return first.result()
+        finally:
+            for call in calls:
+                if not call.done():
+                    call.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "latency": self.latency.stats(),
+        }
+
+
+def build_resilience() -> Resilience:
+    """Build the resilience policy from the LLM_* environment variables."""
+    return Resilience(
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        hedge=os.getenv("LLM_HEDGE", "0") == "1",
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30")),
+        ),
+    )
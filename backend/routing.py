@@ -0,0 +1,92 @@
+import os
+import threading
+
+from metrics import model_escalations
+
+LARGE_MODEL = "llama-3.3-70b-versatile"
+SMALL_MODEL = "llama-3.1-8b-instant"
+
+# Models tried in order for each task, by tier; a later model is only called
+# when the previous one's response fails validation or its confidence check.
+# Speeches and counters go straight to the large model, judging starts small.
+DEFAULT_ROUTES = {
+    "opening": ("large",),
+    "rebuttal": ("large",),
+    "closing": ("large",),
+    "counter": ("large",),
+    "draft": ("large",),
+    "score": ("small", "large"),
+    "feedback": ("small", "large"),
+    "repair": ("small", "large"),
+    "summary": ("small",),
+}
+
+
+def parse_routes(spec: str) -> dict:
+    """Parse ``task=model[>model...],...`` into {task: (model, ...)}."""
+    routes = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        task, _, models = entry.partition("=")
+        cascade = tuple(model.strip() for model in models.split(">") if model.strip())
+        if not task.strip() or not cascade:
+            raise ValueError(f"Invalid LLM_ROUTES entry: {entry!r}")
+        routes[task.strip()] = cascade
+    return routes
+
+
+class ModelRouter:
+    """Per-task model cascades, with counts of requests and escalations.
+
+    Routes name models by tier (``small``, ``large``) or by model id. Tasks
+    without a route use the large model alone.
+    """
+
+    def __init__(
+        self, large: str = LARGE_MODEL, small: str = SMALL_MODEL, routes: dict = None
+    ):
+        self.large = large
+        self.tiers = {"large": large, "small": small}
+        self.routes = {
+            task: tuple(self.tiers.get(model, model) for model in cascade)
+            for task, cascade in {**DEFAULT_ROUTES, **(routes or {})}.items()
+        }
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.escalations = {}
+
+    def models(self, task: str) -> tuple:
+        return self.routes.get(task, (self.large,))
+
+    def record_request(self, task: str):
+        with self.lock:
+            self.requests[task] = self.requests.get(task, 0) + 1
+
+    def record_escalation(self, task: str, model: str, reason: str):
+        with self.lock:
+            self.escalations[task] = self.escalations.get(task, 0) + 1
+        model_escalations.inc(task=task, model=model, reason=reason)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                task: {
+                    "models": list(self.models(task)),
+                    "requests": requests,
+                    "escalations": self.escalations.get(task, 0),
+                    "escalation_rate": round(
+                        self.escalations.get(task, 0) / requests, 3
+                    ),
+                }
+                for task, requests in sorted(self.requests.items())
+            }
+
+
+def build_router() -> ModelRouter:
+    """Build the model router from LLM_MODEL, LLM_SMALL_MODEL and LLM_ROUTES."""
+    return ModelRouter(
+        large=os.getenv("LLM_MODEL", LARGE_MODEL),
+        small=os.getenv("LLM_SMALL_MODEL", SMALL_MODEL),
+        routes=parse_routes(os.getenv("LLM_ROUTES", "")),
+    )
@@ -0,0 +1,337 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from analysis import ArgumentFeatures, describe_features, local_scores
+from structured import extract_json
+
+# Field layout the judge is asked to fill in, shared by single and batch prompts.
+SCORING_FORMAT = """{{{extra}
+    "coherence": 0.XX,
+    "coherence_reason": "Quote the specific phrases that show good/poor flow. Example: 'The transition from X to Y was abrupt' or 'The phrase "therefore" effectively connects ideas'",
+    "relevance": 0.XX,
+    "relevance_reason": "Quote which parts directly address the topic and which parts drift off-topic",
+    "evidence_strength": 0.XX,
+    "evidence_reason": "List the specific evidence/facts cited. If none: 'No concrete evidence provided - claims like "X" lack supporting data'",
+    "fallacy_penalty": 0.XX,
+    "fallacy_reason": "Quote the exact phrases containing fallacies, or say 'No fallacies detected'",
+    "fallacies": ["specific fallacy with quote"] or [],
+    "strongest_point": "Quote the single best sentence/argument",
+    "weakest_point": "Quote the sentence that needs most improvement and explain why"{coaching}
+}}"""
+
+# Extra fields when the judge also coaches towards a target score
+COACHING_FORMAT = """,
+    "message": "A brief encouraging message about their gap to the target (1 sentence)",
+    "tips": [
+        {{
+            "metric": "Name of metric to improve",
+            "tip": "Specific, actionable advice (2-3 sentences max)"
+        }}
+    ]"""
+
+
+def build_scoring_prompt(
+    argument: str, topic: str, features: ArgumentFeatures,
+    target_score: Optional[int] = None,
+) -> str:
+    """Build the judge prompt for a single argument, with its local facts.
+
+    With a ``target_score`` the judge also returns improvement tips, so a
+    client that wants both needs no separate /api/get-feedback call.
+    """
+    coaching = "" if target_score is None else f"""
+
+The student is aiming for an overall score of {target_score}%.
+Overall = 25% coherence + 30% relevance + 30% evidence strength - 15% fallacy penalty.
+After scoring, provide 2-3 specific, actionable tips focusing on the metrics with the
+lowest scores."""
+    coaching_format = "" if target_score is None else COACHING_FORMAT.format()
+    return f"""You are an expert debate judge. Analyze this argument IN DETAIL.
+
+TOPIC: {topic}
+
+ARGUMENT TO ANALYZE:
+"{argument}"
+
+FACTS ALREADY COMPUTED
+(trust these counts; do not recount, use them as a starting point):
+{describe_features(features)}
+
+Provide a thorough analysis with SPECIFIC QUOTES from the argument. For each metric, cite exactly which phrases led to your score.{coaching}
+
+Respond in this EXACT JSON format:
+{SCORING_FORMAT.format(extra="", coaching=coaching_format)}
+
+Be specific. Quote exact phrases. Don't give generic feedback."""
+
+
+def build_batch_scoring_prompt(items: list, features: list) -> str:
+    """Build one judge prompt for several {argument, topic} items and their facts."""
+    arguments = "\n\n".join(
+        f'ARGUMENT {i}\nTOPIC: {item.topic}\nARGUMENT TO ANALYZE:\n"{item.argument}"\n'
+        f"FACTS ALREADY COMPUTED:\n{describe_features(facts)}"
+        for i, (item, facts) in enumerate(zip(items, features), start=1)
+    )
+    return f"""You are an expert debate judge. Analyze each of the following
+{len(items)} arguments IN DETAIL and independently of each other.
+
+{arguments}
+
+Trust the computed facts; do not recount them.
+Provide a thorough analysis of each argument with SPECIFIC QUOTES from it.
+For each metric, cite exactly which phrases led to your score.
+
+Respond with a JSON object whose "results" array holds exactly {len(items)} objects,
+one per argument in the order given, each in this EXACT JSON format:
+{SCORING_FORMAT.format(extra=chr(10) + '    "index": N,', coaching="")}
+
+Set "index" to the argument's number.
+Be specific. Quote exact phrases. Don't give generic feedback."""
+
+
+class ArgumentScores(BaseModel):
+    """Validated judge output for one argument."""
+
+    coherence: float = Field(ge=0, le=1)
+    coherence_reason: str = ""
+    relevance: float = Field(ge=0, le=1)
+    relevance_reason: str = ""
+    evidence_strength: float = Field(ge=0, le=1)
+    evidence_reason: str = ""
+    fallacy_penalty: float = Field(ge=0, le=1)
+    fallacy_reason: str = ""
+    sentence_count: Optional[int] = None
+    evidence_count: int = 0
+    fallacies: list[str] = []
+    strongest_point: str = ""
+    weakest_point: str = ""
+
+
+class FeedbackTip(BaseModel):
+    metric: str
+    tip: str
+
+
+class FeedbackResult(BaseModel):
+    """Validated coach output for /api/get-feedback."""
+
+    type: str = "improvement"
+    message: str
+    tips: list[FeedbackTip] = Field(min_length=1)
+
+
+class CoachedScores(ArgumentScores):
+    """Judge output for one argument plus tips towards a target score."""
+
+    message: str
+    tips: list[FeedbackTip] = Field(min_length=1)
+
+
+def parse_batch_scores(content: str, count: int) -> list:
+    """Extract per-argument score dicts from a batch response.
+
+    Accepts a ``{"results": [...]}`` object (what JSON mode produces) or a
+    bare array. Returns a list of length ``count`` in input order; entries
+    the model skipped or that fail validation are None so the caller can
+    fall back per item.
+    """
+    parsed = extract_json(content, (dict, list))
+    entries = parsed.get("results") if isinstance(parsed, dict) else parsed
+    if not isinstance(entries, list):
+        raise ValueError("Batch scoring response has no results array")
+
+    results = [None] * count
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        slot = index - 1 if isinstance(index, int) and 1 <= index <= count else position
+        if slot >= count or results[slot] is not None:
+            continue
+        try:
+            scores = ArgumentScores.model_validate(entry)
+            results[slot] = scores.model_dump(exclude_none=True)
+        except ValidationError:
+            continue
+    return results
+
+
+# How far the judge's overall strength may stray from the local estimate
+# before its scores are treated as low confidence and re-judged
+MAX_JUDGE_DISAGREEMENT = 0.3
+
+
+def weighted_strength(scores: dict) -> float:
+    """Overall argument strength as the weighted sum of the judge's scores."""
+    w1, w2, w3, w4 = 0.25, 0.30, 0.30, 0.15
+    strength = (
+        w1 * scores["coherence"] +
+        w2 * scores["relevance"] +
+        w3 * scores["evidence_strength"] -
+        w4 * scores["fallacy_penalty"]
+    )
+    return max(0, min(1, strength))
+
+
+def agreement_check(features: ArgumentFeatures):
+    """Return a check rejecting judge scores far from the local heuristic estimate.
+
+    Used as the confidence check of the score cascade: a small model whose
+    verdict disagrees sharply with the argument's measurable features is
+    overruled by the large one.
+    """
+    expected = weighted_strength(local_scores(features))
+
+    def check(result: ArgumentScores):
+        strength = weighted_strength(result.model_dump())
+        if abs(strength - expected) > MAX_JUDGE_DISAGREEMENT:
+            raise ValueError(
+                f"Judge strength {strength:.2f} is far from "
+                f"the local estimate {expected:.2f}"
+            )
+
+    return check
+
+
+def format_scores(scores: dict, argument: str) -> dict:
+    """Clamp the judge's scores and shape them into the API response."""
+    # Ensure all values are within bounds
+    scores["coherence"] = max(0, min(1, float(scores.get("coherence", 0.7))))
+    scores["relevance"] = max(0, min(1, float(scores.get("relevance", 0.7))))
+    scores["evidence_strength"] = max(
+        0, min(1, float(scores.get("evidence_strength", 0.6)))
+    )
+    scores["fallacy_penalty"] = max(
+        0, min(1, float(scores.get("fallacy_penalty", 0.1)))
+    )
+
+    argument_strength = weighted_strength(scores)
+    
+    return {
+        "coherence": scores["coherence"],
+        "coherenceReason": scores.get("coherence_reason", ""),
+        "relevance": scores["relevance"],
+        "relevanceReason": scores.get("relevance_reason", ""),
+        "evidenceStrength": scores["evidence_strength"],
+        "evidenceReason": scores.get("evidence_reason", ""),
+        "fallacyPenalty": scores["fallacy_penalty"],
+        "fallacyReason": scores.get("fallacy_reason", ""),
+        "argumentStrength": argument_strength,
+        "strongestPoint": scores.get("strongest_point", ""),
+        "weakestPoint": scores.get("weakest_point", ""),
+        "details": {
+            "sentenceCount": scores.get("sentence_count", len(argument.split('.'))),
+            "evidenceCount": scores.get("evidence_count", 0),
+            "fallaciesDetected": scores.get("fallacies", [])
+        }
+    }
+
+
+def fallback_scores(argument: str) -> dict:
+    """Default scores returned when the judge's response cannot be used."""
+    return {
+        "coherence": 0.7,
+        "coherenceReason": "Unable to analyze - please try again",
+        "relevance": 0.7,
+        "relevanceReason": "Unable to analyze - please try again",
+        "evidenceStrength": 0.6,
+        "evidenceReason": "Unable to analyze - please try again",
+        "fallacyPenalty": 0.1,
+        "fallacyReason": "Unable to analyze - please try again",
+        "argumentStrength": 0.72,
+        "strongestPoint": "",
+        "weakestPoint": "",
+        "details": {
+            "sentenceCount": len(argument.split('.')),
+            "evidenceCount": 0,
+            "fallaciesDetected": []
+        }
+    }
+
+
+def score_gap(scores: dict, target_score: int) -> int:
+    """Points between a formatted score response and the target."""
+    return target_score - int(scores.get("argumentStrength", 0.7) * 100)
+
+
+def build_feedback_prompt(
+    argument: str, topic: str, scores: dict, target_score: int
+) -> str:
+    """Build the coach prompt for closing the gap between the scores and the target."""
+    current_score = int(scores.get("argumentStrength", 0.7) * 100)
+    gap = score_gap(scores, target_score)
+
+    return f"""You are an expert debate coach helping someone improve their argumentation skills.
+
+TOPIC: {topic}
+
+STUDENT'S ARGUMENT:
+{argument}
+
+CURRENT SCORES:
+- Coherence: {scores.get('coherence', 0.7):.0%}
+- Relevance: {scores.get('relevance', 0.7):.0%}
+- Evidence Strength: {scores.get('evidenceStrength', 0.6):.0%}
+- Fallacy Penalty: -{scores.get('fallacyPenalty', 0.1):.0%}
+- Overall Score: {current_score}%
+- Target Score: {target_score}%
+- Gap to close: {gap} points
+
+Provide specific, actionable feedback to help them improve. Focus on their weakest areas.
+
+Respond in this EXACT JSON format:
+{{
+    "type": "improvement",
+    "message": "A brief encouraging message about their gap to the target (1 sentence)",
+    "tips": [
+        {{
+            "metric": "Name of metric to improve",
+            "tip": "Specific, actionable advice (2-3 sentences max)"
+        }}
+    ]
+}}
+
+Provide 2-3 tips focusing on the metrics with the lowest scores. Be concise and practical."""
+
+
+def fallback_feedback(scores: dict, gap: int) -> dict:
+    """Rule-based tips returned when the coach's response cannot be used."""
+    tips = []
+    if scores.get("coherence", 1) < 0.75:
+        tips.append({
+            "metric": "Coherence",
+            "tip": "Connect your ideas more clearly. Use transition words like "
+                   "'therefore', 'however', 'furthermore' to link sentences."
+        })
+    if scores.get("relevance", 1) < 0.8:
+        tips.append({
+            "metric": "Relevance",
+            "tip": "Stay focused on the debate topic. "
+                   "Make sure each point directly addresses the motion."
+        })
+    if scores.get("evidenceStrength", 1) < 0.7:
+        tips.append({
+            "metric": "Evidence",
+            "tip": "Add specific examples, statistics, or expert citations "
+                   "to strengthen your claims."
+        })
+    if scores.get("fallacyPenalty", 0) > 0.1:
+        tips.append({
+            "metric": "Logic",
+            "tip": "Avoid emotional appeals and stick to evidence-based reasoning. "
+                   "Check for common fallacies."
+        })
+    
+    if not tips:
+        tips.append({
+            "metric": "Overall",
+            "tip": "Add more depth and specificity to your arguments. "
+                   "Consider addressing potential counterarguments."
+        })
+    
+    return {
+        "type": "improvement",
+        "message": f"You need {gap} more points to reach your target. Here's how:",
+        "tips": tips[:3]
+    }
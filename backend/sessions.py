@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+from sqlite_store import SQLiteStore
+
+HISTORY_HEADER = "\n\nPrevious points in this debate:\n"
+
+
+def speaker_label(speaker: str) -> str:
+    """Label the counter prompt uses for a turn's speaker."""
+    return "PRO" if speaker == "user" else "CON"
+
+
+def render_history(entries: list) -> str:
+    """Render (label, text) history entries into counter prompt context."""
+    if not entries:
+        return ""
+    return HISTORY_HEADER + "".join(f"{label}: {text}\n" for label, text in entries)
+
+
+def client_history_entries(items: list) -> list:
+    """Turn a client-sent argument_history list into (label, text) entries."""
+    entries = []
+    for item in items:
+        speaker = "user" if item.get("type") == "user" else "ai"
+        entries.append((speaker_label(speaker), item.get("text", "")))
+    return entries
+
+
+@dataclass
+class Turn:
+    speaker: str  # "user" or "ai"
+    round: str    # "opening", "rebuttal", "closing"
+    text: str
+    summary: str = ""  # Condensed form, filled in once the turn is compacted
+
+
+@dataclass
+class DebateSession:
+    """Server-side state of one live debate."""
+
+    topic: str
+    turns: list = field(default_factory=list)
+
+    def add_turn(self, speaker: str, round: str, text: str):
+        self.turns.append(Turn(speaker, round, text))
+
+    def history_entries(self) -> list:
+        return [(speaker_label(turn.speaker), turn.text) for turn in self.turns]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "DebateSession":
+        fields = json.loads(data)
+        fields["turns"] = [Turn(**turn) for turn in fields["turns"]]
+        return cls(**fields)
+
+
+class MemorySessionStore:
+    """In-process sessions, evicted when idle past ``ttl`` or over ``max_sessions``."""
+
+    def __init__(
+        self, max_sessions: int = 10000, ttl: float = 7200, clock=time.monotonic
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def create(self, topic: str) -> str:
+        session_id = uuid.uuid4().hex
+        self.save(session_id, DebateSession(topic))
+        return session_id
+
+    def get(self, session_id: str):
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return None
+            session, last_used = entry
+            if self.clock() - last_used >= self.ttl:
+                del self.sessions[session_id]
+                return None
+            return session
+
+    def save(self, session_id: str, session: DebateSession):
+        with self.lock:
+            self.sessions[session_id] = (session, self.clock())
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+
+class SQLiteSessionStore(SQLiteStore):
+    """Sessions in a SQLite file, shared across workers and restarts."""
+
+    def __init__(
+        self, path: str = "sessions.sqlite3", ttl: float = 7200, clock=time.time
+    ):
+        super().__init__(
+            path,
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)",
+        )
+        self.ttl = ttl
+        self.clock = clock
+
+    def create(self, topic: str) -> str:
+        session_id = uuid.uuid4().hex
+        self.save(session_id, DebateSession(topic))
+        return session_id
+
+    def get(self, session_id: str):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM sessions WHERE id = ? AND expires_at > ?",
+                (session_id, self.clock()),
+            ).fetchone()
+        return DebateSession.from_json(row[0]) if row else None
+
+    def save(self, session_id: str, session: DebateSession):
+        with self.lock:
+            now = self.clock()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, data, expires_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, session.to_json(), now + self.ttl),
+            )
+            self.conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            self.conn.commit()
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self.conn.commit()
+
+
+def build_session_store():
+    """Build the live-debate session store from the SESSION_* environment variables."""
+    ttl = float(os.getenv("SESSION_TTL", "7200"))
+    if os.getenv("SESSION_BACKEND", "memory") == "sqlite":
+        return SQLiteSessionStore(
+            os.getenv("SESSION_PATH", "sessions.sqlite3"), ttl=ttl
+        )
+    return MemorySessionStore(int(os.getenv("SESSION_MAX", "10000")), ttl=ttl)
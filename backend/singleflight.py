@@ -0,0 +1,51 @@
+import asyncio
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts the work; callers that arrive while it
+    is still running await the same task instead of starting their own. The
+    key is released as soon as the task finishes, so later callers start a
+    fresh call.
+
+    One caller being cancelled leaves the call running for the others, but
+    once every caller has been cancelled the call is cancelled too, so work
+    nobody waits for stops using upstream quota.
+    """
+
+    def __init__(self):
+        self.inflight = {}
+        self.waiters = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn):
+        """Return the result of ``fn()``, sharing it with concurrent callers."""
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        self.waiters[task] = self.waiters.get(task, 0) + 1
+        try:
+            # Shield so one caller disconnecting does not cancel the shared call
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[task] -= 1
+            if not self.waiters[task]:
+                del self.waiters[task]
+                if not task.done():
+                    if self.inflight.get(key) is task:
+                        del self.inflight[key]
+                    task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.inflight),
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from history import compactor
+from llm_client import invoke_llm
+from metrics import speculative_drafts
+from sessions import render_history
+
+LIVE_ROUNDS = ("opening", "rebuttal", "closing")
+
+DRAFT_PROMPT = """You are preparing the Opposition's reply for the {round} round of a
+live debate.
+Motion: {topic}
+{history_context}{partial}
+The Proposition's {round} argument has not arrived yet. Prepare notes (max 200 words):
+1. The 2-3 claims the Proposition is most likely to make next, each with a
+   one-sentence counter backed by evidence.
+2. Three concrete evidence points (facts, figures, examples) supporting the
+   Opposition on this motion.
+
+Write the notes as short lines. No greetings or commentary."""
+
+
+def next_round(round_type: str):
+    """Return the live-debate round after ``round_type``, or None after the closing."""
+    if round_type not in LIVE_ROUNDS:
+        return None
+    index = LIVE_ROUNDS.index(round_type) + 1
+    return LIVE_ROUNDS[index] if index < len(LIVE_ROUNDS) else None
+
+
+async def draft_notes(session, round_type: str, partial_argument: str = "") -> str:
+    """Generate speculative notes for the Opposition's next counter."""
+    history_context = render_history(await compactor.compact(session.history_entries()))
+    partial = ""
+    if partial_argument.strip():
+        partial = f"\nThe Proposition is currently writing:\n{partial_argument}\n"
+    prompt = DRAFT_PROMPT.format(
+        round=round_type, topic=session.topic, history_context=history_context,
+        partial=partial,
+    )
+    return await invoke_llm(prompt, "draft")
+
+
+@dataclass
+class Draft:
+    round: str
+    version: int  # Number of session turns the draft was conditioned on
+    task: asyncio.Task
+    created: float
+
+
+class DraftStore:
+    """Speculative counter drafts per live-debate session.
+
+    A session has at most one draft, for the round the user is writing. A
+    draft is only used if it finished and the session has not moved on since
+    it was started; anything else is cancelled and the counter is generated
+    from scratch. Drafts expire after ``ttl`` seconds and the least recently
+    started are evicted beyond ``max_drafts``.
+
+    Drafts are asyncio tasks, so they live in the worker process that
+    started them. Under several workers a round answered by another worker
+    finds no draft and generates its counter from scratch.
+    """
+
+    def __init__(
+        self, generate=draft_notes, ttl: float = 300.0, max_drafts: int = 256,
+        clock=time.monotonic,
+    ):
+        self.generate = generate
+        self.ttl = ttl
+        self.max_drafts = max_drafts
+        self.clock = clock
+        self.drafts = OrderedDict()
+
+    def prepare(
+        self, session_id: str, session, round_type: str, partial_argument: str = ""
+    ):
+        """Start drafting ``round_type`` for a session, replacing any older draft."""
+        self.discard(session_id)
+        draft = self.generate(session, round_type, partial_argument)
+        task = asyncio.ensure_future(draft)
+        task.add_done_callback(_log_failure)
+        version = len(session.turns)
+        self.drafts[session_id] = Draft(round_type, version, task, self.clock())
+        speculative_drafts.inc(outcome="started")
+        while len(self.drafts) > self.max_drafts:
+            _, evicted = self.drafts.popitem(last=False)
+            self._cancel(evicted, "evicted")
+
+    def take(self, session_id: str, session, round_type: str):
+        """Return the finished draft for this round, or None if none is usable."""
+        draft = self.drafts.pop(session_id, None)
+        if draft is None:
+            speculative_drafts.inc(outcome="miss")
+            return None
+        if (
+            draft.round != round_type
+            or draft.version != len(session.turns)
+            or self.clock() - draft.created > self.ttl
+        ):
+            self._cancel(draft, "stale")
+            return None
+        if not draft.task.done():
+            # Waiting would cost more than generating the counter directly
+            self._cancel(draft, "unfinished")
+            return None
+        if draft.task.cancelled() or draft.task.exception() is not None:
+            speculative_drafts.inc(outcome="failed")
+            return None
+        speculative_drafts.inc(outcome="used")
+        return draft.task.result()
+
+    def discard(self, session_id: str):
+        draft = self.drafts.pop(session_id, None)
+        if draft is not None:
+            self._cancel(draft, "replaced")
+
+    def _cancel(self, draft: Draft, outcome: str):
+        draft.task.cancel()
+        speculative_drafts.inc(outcome=outcome)
+
+    def stats(self) -> dict:
+        return {
+            "drafts": len(self.drafts),
+            "ready": sum(1 for draft in self.drafts.values() if draft.task.done()),
+        }
+
+
+def _log_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Error drafting counter: {task.exception()}")
+
+
+def build_draft_store() -> DraftStore:
+    """Build the speculative draft store from the LIVE_DRAFT_* environment variables."""
+    return DraftStore(
+        ttl=float(os.getenv("LIVE_DRAFT_TTL", "300")),
+        max_drafts=int(os.getenv("LIVE_DRAFT_MAX", "256")),
+    )
@@ -0,0 +1,27 @@
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """A SQLite file behind one connection shared by every thread of the process.
+
+    Subclasses run their queries on ``conn`` while holding ``lock``. The
+    ``schema`` statements run when the store is opened, so they should be
+    idempotent (``CREATE ... IF NOT EXISTS``).
+    """
+
+    def __init__(self, path: str, *schema: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = self.connect()
+        for statement in schema:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def reopen(self):
+        """Replace the connection, e.g. in a worker forked after it was opened."""
+        with self.lock:
+            self.conn = self.connect()
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from ratelimit import RateLimitExceeded
+
+
+class PointSplitter:
+    """Split a streamed counter-argument into points as paragraphs complete.
+
+    Produces the same ids and texts as ``split_points`` on the full text,
+    but emits each paragraph as soon as the blank line after it arrives.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.index = 0
+        self.started = False
+
+    def feed(self, text: str) -> list:
+        """Add a chunk of text and return any points it completed."""
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return []
+            self.started = True
+        self.buffer += text
+        points = []
+        while "\n\n" in self.buffer:
+            paragraph, self.buffer = self.buffer.split("\n\n", 1)
+            points.extend(self._emit(paragraph))
+        return points
+
+    def close(self) -> list:
+        """Flush the final paragraph once the stream has ended."""
+        paragraph, self.buffer = self.buffer, ""
+        return self._emit(paragraph)
+
+    def _emit(self, paragraph: str) -> list:
+        self.index += 1
+        if paragraph.strip():
+            return [{"id": self.index, "text": paragraph.strip()}]
+        return []
+
+
+async def merge_streams(streams: dict):
+    """Interleave several async text streams, yielding (key, chunk) pairs.
+
+    Chunks are yielded in arrival order, so two speeches generated at the
+    same time reach the client together instead of one after the other.
+    """
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(key, stream):
+        try:
+            async for chunk in stream:
+                await queue.put((key, chunk))
+            await queue.put((key, finished))
+        except Exception as e:
+            await queue.put((key, e))
+
+    tasks = [asyncio.create_task(pump(key, stream)) for key, stream in streams.items()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            key, chunk = await queue.get()
+            if chunk is finished:
+                remaining -= 1
+            elif isinstance(chunk, Exception):
+                raise chunk
+            else:
+                yield key, chunk
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def ndjson(events):
+    """Encode an async stream of event dicts as newline-delimited JSON."""
+    try:
+        async for event in events:
+            yield json.dumps(event) + "\n"
+    except RateLimitExceeded as e:
+        message = "Too many requests - please try again shortly"
+        error = {"type": "error", "message": message, "retry_after": e.retry_after}
+        yield json.dumps(error) + "\n"
+    except Exception as e:
+        print(f"Error while streaming: {e}")
+        error = {"type": "error", "message": "Generation failed - please try again"}
+        yield json.dumps(error) + "\n"
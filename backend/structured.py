@@ -0,0 +1,168 @@
+import json
+import re
+
+from pydantic import BaseModel, ValidationError
+
+from llm_client import invoke_llm
+from metrics import record_parse
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_OPENER = re.compile(r"[{\[]")
+
+
+def loads_tolerant(text: str):
+    """json.loads that also accepts trailing commas and typographic quotes."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        cleaned = _TRAILING_COMMA.sub(r"\1", text)
+        cleaned = cleaned.replace("“", '"').replace("”", '"')
+        return json.loads(cleaned)
+
+
+class JSONStreamExtractor:
+    """Pull complete top-level JSON values out of text as it streams in.
+
+    Tracks bracket depth outside of string literals, so braces inside quoted
+    text, prose before or after the JSON, and code fences do not confuse it.
+    A balanced span that still is not valid JSON is skipped and scanning
+    resumes after it.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.start = None
+        self.open = []
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> list:
+        """Add text and return the JSON values it completed."""
+        self.buffer += text
+        values = []
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            if self.start is None:
+                if char in "{[":
+                    self.start, self.open = self.pos, [self.pos]
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.open.append(self.pos)
+            elif char in "}]":
+                self.open.pop()
+                if not self.open:
+                    candidate = self.buffer[self.start:self.pos + 1]
+                    self.start = None
+                    try:
+                        values.append(loads_tolerant(candidate))
+                    except ValueError:
+                        pass
+            self.pos += 1
+        return values
+
+    def close(self) -> list:
+        """Recover values after an unmatched opening bracket in the prose.
+
+        If a stray ``{`` left the scanner waiting for a close that never
+        came, rescan from just after it. Brackets nested in it that are
+        also still open would run to the end again, so they are skipped
+        instead of rescanned, which keeps a run of stray brackets linear.
+        """
+        values = []
+        while self.start is not None:
+            unclosed = set(self.open)
+            match = _OPENER.search(self.buffer, self.start + 1)
+            while match and match.start() in unclosed:
+                match = _OPENER.search(self.buffer, match.start() + 1)
+            rest = self.buffer[match.start():] if match else ""
+            self.__init__()
+            values += self.feed(rest)
+        return values
+
+
+def extract_json(text: str, kind=dict):
+    """Return the first JSON value of ``kind`` (a type or tuple of types) in text."""
+    extractor = JSONStreamExtractor()
+    for value in extractor.feed(str(text)) + extractor.close():
+        if isinstance(value, kind):
+            return value
+    raise ValueError("No usable JSON found in response")
+
+
+def describe_error(error: Exception) -> str:
+    """One-line summary of why a response was rejected."""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, item['loc']))}: {item['msg']}"
+            for item in error.errors()
+        )
+    return str(error)
+
+
+def build_repair_prompt(content: str, schema: type, error: Exception) -> str:
+    """Ask the model to fix its own output, without resending the original task."""
+    return f"""The text below was supposed to be a single JSON object matching this
+JSON schema, but it could not be used: {describe_error(error)}
+
+SCHEMA:
+{json.dumps(schema.model_json_schema())}
+
+TEXT:
+{content}
+
+Respond with ONLY the corrected JSON object.
+Keep all of the original values that are valid."""
+
+
+async def request_structured(
+    prompt: str, schema: type, task: str, use_cache: bool = True, check=None,
+    budget=None,
+) -> BaseModel:
+    """Get a schema-validated JSON response from the LLM.
+
+    Uses the model's JSON mode, then the tolerant extractor. If the output
+    still does not validate, sends one short repair request containing only
+    the broken output instead of resubmitting the whole prompt.
+
+    ``check(result)`` may raise ValueError to mark a valid result as low
+    confidence, which escalates it to the next model of the task's cascade.
+    ``budget`` overrides the task's output limits for a larger schema.
+    """
+    def parse(content: str) -> BaseModel:
+        return schema.model_validate(extract_json(content))
+
+    def confident(content: str):
+        check(parse(content))
+
+    content = await invoke_llm(
+        prompt, task, use_cache, json_mode=True, validate=parse,
+        confident=confident if check else None, budget=budget,
+    )
+    try:
+        result = parse(content)
+    except (ValueError, ValidationError) as e:
+        record_parse(task, "invalid")
+        print(f"Re-asking for valid {task} JSON: {describe_error(e)}")
+        # validate lets an unusable repair escalate through the repair cascade
+        repair_prompt = build_repair_prompt(content, schema, e)
+        repaired = await invoke_llm(
+            repair_prompt, "repair", json_mode=True, validate=parse
+        )
+        try:
+            result = parse(repaired)
+        except (ValueError, ValidationError):
+            record_parse(task, "failed")
+            raise
+        record_parse(task, "repaired")
+        return result
+    record_parse(task, "ok")
+    return result
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Backend modules import each other as top-level modules, as under uvicorn
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Importing llm_client needs a key; no test reaches Groq
+os.environ.setdefault("GROQ_API_KEY", "test-placeholder")
+
+from benchmarks.fake_llm import FakeClock, FakeMessage  # noqa: E402
+
+
+@pytest.fixture
+def clock():
+    """Manual clock: bump ``clock.now`` to move time; ``clock.sleep`` advances it."""
+    return FakeClock(now=1000.0)
+
+
+class SlowModel:
+    """Chat model stand-in whose calls take long enough to be cancelled."""
+
+    def __init__(
+        self, delay: float = 5.0,
+        reply: str = "Likely claim: homework builds discipline.",
+    ):
+        self.delay = delay
+        self.reply = reply
+        self.started = 0
+        self.finished = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        return FakeMessage(self.reply)
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    """Route invoke_llm to a SlowModel, with no rate limiter in front of it."""
+    import llm_client
+
+    model = SlowModel()
+    monkeypatch.setattr(llm_client, "llm", model)
+    monkeypatch.setattr(llm_client, "scheduler", None)
+    return model
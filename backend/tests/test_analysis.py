@@ -0,0 +1,40 @@
+import pytest
+
+from analysis import analyze_argument
+
+TOPIC = "School uniforms should be compulsory"
+HINDI = (
+    "स्कूल यूनिफॉर्म बच्चों के बीच भेदभाव को कम करती है। "
+    "इससे अमीर और गरीब छात्रों के बीच का अंतर दिखाई नहीं देता। "
+    "शोध बताते हैं कि अनुशासन भी बढ़ता है।"
+)
+RUSSIAN = "Школьная форма снижает травлю, потому что скрывает различия в доходах."
+CHINESE = "校服可以减少学生之间的攀比。它也让早上的准备更简单。"
+TRIVIAL = ["Yes.", "I agree with it", "नहीं।", "ok ... !!! 42"]
+
+
+@pytest.mark.parametrize("argument, words, sentences", [
+    (HINDI, 30, 3),
+    (RUSSIAN, 10, 1),
+    (CHINESE, 24, 2),
+])
+def test_non_english_arguments_are_not_trivial(argument, words, sentences):
+    features = analyze_argument(argument, TOPIC)
+    assert (features.word_count, features.sentence_count) == (words, sentences)
+    assert not features.trivial
+
+
+@pytest.mark.parametrize("argument", TRIVIAL)
+def test_short_arguments_are_trivial(argument):
+    assert analyze_argument(argument, TOPIC).trivial
+
+
+def test_evidence_and_topic_terms_are_counted():
+    argument = (
+        "School uniforms reduce bullying. "
+        "According to a 2019 survey, 40% of students agree."
+    )
+    features = analyze_argument(argument, TOPIC)
+    assert features.sentence_count == 2
+    assert features.evidence_count == 1
+    assert features.topic_terms == ["school", "uniform"]
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+import main
+from ratelimit import RateLimitExceeded
+
+ARGUMENT = (
+    "School uniforms reduce bullying because 40% of students report less teasing, "
+    "according to a 2019 survey."
+)
+
+
+def batch(size: int) -> main.BatchScoringRequest:
+    return main.BatchScoringRequest(
+        arguments=[
+            {"argument": f"{ARGUMENT} Point {i}.", "topic": "School uniforms"}
+            for i in range(size)
+        ],
+        use_cache=False,
+    )
+
+
+def test_items_take_only_argument_and_topic():
+    item = {"argument": ARGUMENT, "topic": "School uniforms"}
+    extra = {"target_score": 90, "fast": True}
+    request = main.BatchScoringRequest(arguments=[{**item, **extra}])
+    assert request.arguments[0].model_dump() == item
+
+
+def test_rate_limited_chunk_cancels_the_others(monkeypatch):
+    started, cancelled = [], []
+
+    async def invoke_llm(prompt, *args, **kwargs):
+        started.append(prompt)
+        if len(started) == 1:
+            await asyncio.sleep(0)
+            raise RateLimitExceeded(2.0)
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(prompt)
+            raise
+
+    monkeypatch.setattr(main, "invoke_llm", invoke_llm)
+
+    async def run():
+        with pytest.raises(RateLimitExceeded):
+            await asyncio.wait_for(
+                main.score_arguments(batch(3 * main.SCORE_BATCH_SIZE)), timeout=5
+            )
+        # Checked before asyncio.run would cancel leftover tasks itself
+        assert len(started) == main.SCORE_BATCH_CONCURRENCY
+        assert len(cancelled) == len(started) - 1
+
+    asyncio.run(run())
+
+
+def test_rate_limited_chunk_cancels_the_upstream_calls_of_the_others(
+    monkeypatch, slow_model
+):
+    import llm_client
+
+    model = slow_model
+    admitted = []
+
+    async def acquire_slot(task, prompt, max_wait=None):
+        admitted.append(task)
+        if len(admitted) > 2:
+            raise RateLimitExceeded(2.0)
+
+    monkeypatch.setattr(llm_client, "acquire_slot", acquire_slot)
+
+    async def run():
+        with pytest.raises(RateLimitExceeded):
+            await asyncio.wait_for(
+                main.score_arguments(batch(3 * main.SCORE_BATCH_SIZE)), timeout=5
+            )
+        await asyncio.sleep(0.05)
+        assert (model.started, model.cancelled, model.finished) == (2, 2, 0)
+
+    asyncio.run(run())
+
+
+def test_batch_misses_are_rejudged_concurrently_outside_the_batch_slot(monkeypatch):
+    monkeypatch.setattr(main, "SCORE_BATCH_CONCURRENCY", 1)
+    judging = {"now": 0, "peak": 0}
+
+    async def invoke_llm(prompt, *args, **kwargs):
+        return "{}"
+
+    async def judge_argument(
+        argument, topic, features, use_cache=True, target_score=None
+    ):
+        judging["now"] += 1
+        judging["peak"] = max(judging["peak"], judging["now"])
+        await asyncio.sleep(0.01)
+        judging["now"] -= 1
+        return main.fallback_scores(argument)
+
+    monkeypatch.setattr(main, "invoke_llm", invoke_llm)
+    monkeypatch.setattr(main, "judge_argument", judge_argument)
+
+    response = asyncio.run(main.score_arguments(batch(2 * main.SCORE_BATCH_SIZE)))
+
+    assert len(response["results"]) == 2 * main.SCORE_BATCH_SIZE
+    # With one batch slot, both batches' misses can only overlap if neither holds it
+    assert judging["peak"] == 2 * main.SCORE_BATCH_SIZE
@@ -0,0 +1,79 @@
+import json
+
+from budgets import BUDGETS, COACHED_SCORE_BUDGET, StreamBudget, trim_to_budget
+from scoring import ArgumentScores, CoachedScores
+from tokens import count_tokens
+
+QUOTE = (
+    "The phrase 'uniforms cost families around $100 a year' is specific, "
+    "but 'everyone knows they stifle creativity' is asserted without support "
+    "and weakens the case considerably. "
+    "The closing line 'so schools must act now' does not follow from either point."
+)
+
+
+def full_scores() -> dict:
+    """A long but realistic judge reply: every reason quotes the argument at length."""
+    return {
+        "coherence": 0.72, "coherence_reason": QUOTE,
+        "relevance": 0.85, "relevance_reason": QUOTE,
+        "evidence_strength": 0.41, "evidence_reason": QUOTE,
+        "fallacy_penalty": 0.2, "fallacy_reason": QUOTE,
+        "fallacies": [
+            "Appeal to common belief: 'everyone knows they stifle creativity'",
+            "Hasty generalisation: 'all students hate them'",
+        ],
+        "strongest_point": QUOTE,
+        "weakest_point": QUOTE,
+    }
+
+
+def full_coached() -> dict:
+    tip = (
+        "Replace 'everyone knows' with a cited survey of students. "
+        "Name the source and the year. Then connect the figure back to "
+        "the cost argument so the evidence carries the claim."
+    )
+    metrics = ("Evidence Strength", "Coherence", "Fallacy Penalty")
+    return {
+        **full_scores(),
+        "message": (
+            "You are about twelve points short of your target, "
+            "and stronger evidence would close most of that gap."
+        ),
+        "tips": [{"metric": metric, "tip": tip} for metric in metrics],
+    }
+
+
+def test_full_score_reply_fits_its_budget():
+    scores = ArgumentScores.model_validate(full_scores())
+    reply = json.dumps(scores.model_dump(), indent=4)
+    assert count_tokens(reply) < BUDGETS["score"].max_tokens
+
+
+def test_full_coached_reply_fits_its_budget():
+    coached = CoachedScores.model_validate(full_coached())
+    reply = json.dumps(coached.model_dump(), indent=4)
+    assert count_tokens(reply) < COACHED_SCORE_BUDGET.max_tokens
+    # The plain score cap would truncate it, which is why coaching has its own
+    assert count_tokens(reply) > BUDGETS["score"].max_tokens
+
+
+def test_trim_keeps_whole_sentences():
+    text = "One two three. Four five six. Seven eight nine."
+    assert trim_to_budget(text, 4) == "One two three. Four five six."
+    assert trim_to_budget(text, 100) == text
+    # A cut-off final sentence is dropped when generation hit max_tokens
+    cut_off = "One two three. Four five"
+    assert trim_to_budget(cut_off, 100, complete=False) == "One two three."
+
+
+def test_stream_budget_stops_at_the_sentence_end():
+    budget = StreamBudget(max_words=3)
+    emitted = []
+    for chunk in ["One two ", "three four", " costs 3.5% more. ", "Never sent."]:
+        text, stop = budget.feed(chunk)
+        emitted.append(text)
+        if stop:
+            break
+    assert "".join(emitted) == "One two three four costs 3.5% more."
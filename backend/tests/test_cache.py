@@ -0,0 +1,50 @@
+from cache import MemoryCache, SQLiteCache, cache_key
+
+
+def test_cache_key_ignores_whitespace_but_not_params():
+    assert cache_key("a  b\n c", {"model": "x"}) == cache_key("a b c", {"model": "x"})
+    assert cache_key("a b c", {"model": "x"}) != cache_key("a b c", {"model": "y"})
+
+
+def test_memory_cache_expires_and_evicts_least_recent(clock):
+    cache = MemoryCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    clock.now += 10
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_round_trip_expiry_and_reopen(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=10, clock=clock)
+    cache.set("a", "1")
+    cache.reopen()
+    assert cache.get("a") == "1"
+    assert SQLiteCache(str(tmp_path / "cache.sqlite3"), clock=clock).get("a") == "1"
+    clock.now += 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_prunes_expired_entries_on_write(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=10, clock=clock)
+    cache.set("a", "1")
+    clock.now += 10
+    cache.set("b", "2")
+    assert len(cache) == 1
+    assert cache.get("b") == "2"
+
+
+def test_sqlite_cache_evicts_oldest_beyond_max_entries(tmp_path, clock):
+    cache = SQLiteCache(
+        str(tmp_path / "cache.sqlite3"), ttl=10, clock=clock, max_entries=2
+    )
+    for key in "abc":
+        cache.set(key, key)
+        clock.now += 1
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
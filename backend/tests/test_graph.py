@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import graph
+from graph import DebateConflict, run_debate_graph
+
+TOPIC = "Homework should be banned."
+
+
+def speech(prompt: str, stage: str) -> str:
+    side = "Proposition" if "Proposition position" in prompt else "Opposition"
+    return f"{side} {stage} speech."
+
+
+def fake_speeches(monkeypatch, fail_stage=None, gate=None):
+    calls = []
+
+    async def invoke_llm(prompt, stage, use_cache=True):
+        calls.append(stage)
+        if gate is not None:
+            await gate.wait()
+        if stage == fail_stage:
+            raise RuntimeError("upstream failed")
+        return speech(prompt, stage)
+
+    monkeypatch.setattr(graph, "invoke_llm", invoke_llm)
+    return calls
+
+
+def test_resume_regenerates_only_missing_speeches(monkeypatch):
+    fake_speeches(monkeypatch, fail_stage="closing")
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_debate_graph(TOPIC, "resume-me"))
+    calls = fake_speeches(monkeypatch)
+    speeches = asyncio.run(run_debate_graph(TOPIC, "resume-me"))
+    assert calls == ["closing", "closing"]
+    assert speeches["proposition"]["opening"] == "Proposition opening speech."
+
+
+def test_resume_with_another_topic_is_refused(monkeypatch):
+    fake_speeches(monkeypatch, fail_stage="rebuttal")
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_debate_graph(TOPIC, "other-topic"))
+    calls = fake_speeches(monkeypatch)
+    with pytest.raises(DebateConflict):
+        asyncio.run(run_debate_graph("Zoos should be banned.", "other-topic"))
+    assert calls == []
+    # The original debate can still be resumed
+    resumed = asyncio.run(run_debate_graph(TOPIC, "other-topic"))
+    assert "closing" in resumed["opposition"]
+
+
+def test_running_debate_cannot_be_started_twice(monkeypatch):
+    async def run():
+        gate = asyncio.Event()
+        fake_speeches(monkeypatch, gate=gate)
+        first = asyncio.ensure_future(run_debate_graph(TOPIC, "busy"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(DebateConflict):
+            await run_debate_graph(TOPIC, "busy")
+        gate.set()
+        await first
+        assert "busy" not in graph.active_debates
+
+    asyncio.run(run())
+
+
+def test_stream_sends_the_graph_prompts_in_stage_order(monkeypatch):
+    graph_prompts, stream_prompts = [], []
+
+    async def invoke_llm(prompt, stage, use_cache=True):
+        graph_prompts.append(prompt)
+        return speech(prompt, stage)
+
+    async def stream_llm(prompt, stage):
+        stream_prompts.append(prompt)
+        text = speech(prompt, stage)
+        yield text[:5]
+        yield text[5:]
+
+    monkeypatch.setattr(graph, "invoke_llm", invoke_llm)
+    monkeypatch.setattr(graph, "stream_llm", stream_llm)
+
+    async def collect():
+        return [event async for event in graph.debate_events(TOPIC)]
+
+    events = asyncio.run(collect())
+    speeches = asyncio.run(run_debate_graph(TOPIC, concurrent=False))
+    assert [(e["side"], e["stage"]) for e in events if e["type"] == "speech"] == [
+        (side, stage) for stage in graph.DEBATE_STAGES for side in graph.DEBATE_SIDES
+    ]
+    assert sorted(stream_prompts) == sorted(graph_prompts)
+    assert events[-1] == {"type": "done", **graph.format_debate(TOPIC, speeches)}
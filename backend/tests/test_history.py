@@ -0,0 +1,31 @@
+import asyncio
+
+from history import HistoryCompactor
+
+
+def test_one_oversized_turn_is_condensed_not_dropped():
+    prompts = []
+
+    async def summarize(prompt):
+        prompts.append(prompt)
+        return "Uniforms cut bullying, per a 2019 survey."
+
+    compactor = HistoryCompactor(summarize, keep_last=4, token_budget=50)
+    turn = "Uniforms reduce bullying because students stop comparing clothes. " * 20
+
+    entries = asyncio.run(compactor.compact([("Pro", turn)]))
+
+    assert entries == [("Pro", "Uniforms cut bullying, per a 2019 survey.")]
+    assert len(prompts) == 1 and turn in prompts[0]
+
+
+def test_recent_turns_are_condensed_oldest_first_until_they_fit():
+    async def summarize(prompt):
+        return "Short."
+
+    compactor = HistoryCompactor(summarize, keep_last=4, token_budget=60)
+    first, latest = "Opening point about uniforms. " * 10, "A short reply."
+
+    entries = asyncio.run(compactor.compact([("Pro", first), ("Con", latest)]))
+
+    assert entries == [("Pro", "Short."), ("Con", latest)]
@@ -0,0 +1,89 @@
+from motions import MotionIndex, motion_terms
+
+
+def make_index():
+    index = MotionIndex()
+    index.add("Is social media more harmful than beneficial to society?")
+    index.add("Homework should be banned in primary schools.")
+    return index
+
+
+def test_paraphrases_match():
+    index = make_index()
+    match, _ = index.match("Social media is more harmful than beneficial to society")
+    assert match == "Is social media more harmful than beneficial to society?"
+    assert index.match("  HOMEWORK SHOULD BE BANNED IN PRIMARY SCHOOLS!! ")[1] == 1.0
+    house = "This House believes homework should be banned in primary schools."
+    assert index.match(house) is not None
+
+
+def test_negations_and_unrelated_motions_do_not_match():
+    index = make_index()
+    assert index.match("Homework should not be banned in primary schools.") is None
+    assert index.match("Homework shouldn't be banned in primary schools.") is None
+    assert index.match("Zoos should be banned.") is None
+
+
+def test_negation_contractions_are_expanded():
+    assert "not" in motion_terms("Homework shouldn't be banned")
+
+
+def test_threshold_controls_matches():
+    # About 0.82 similar: one extra word
+    query = "Social media is more harmful than beneficial to society today"
+    default = MotionIndex()
+    default.add("Social media is more harmful than beneficial to society")
+    assert default.match(query) is not None
+    strict = MotionIndex(threshold=0.9)
+    strict.add("Social media is more harmful than beneficial to society")
+    assert strict.match(query) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = make_index()
+    path = str(tmp_path / "motions.json")
+    index.save(path)
+    loaded = MotionIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.match("homework should be banned in primary schools") == index.match(
+        "homework should be banned in primary schools"
+    )
+    assert MotionIndex.load(path, threshold=0.95).threshold == 0.95
+
+
+def test_adding_a_key_twice_is_ignored():
+    index = MotionIndex()
+    index.add("Uniforms should be abolished.", key="uniforms")
+    index.add("School uniforms should be abolished.", key="uniforms")
+    assert len(index) == 1
+
+
+def test_concurrent_saves_leave_a_valid_file(tmp_path):
+    import threading
+
+    path = str(tmp_path / "motions.json")
+    indexes = []
+    for size in (1, 2, 3, 4):
+        index = MotionIndex()
+        for i in range(size * 50):
+            index.add(f"Motion number {i} about topic {size}")
+        indexes.append(index)
+    threads = [
+        threading.Thread(target=index.save, args=(path,)) for index in indexes * 3
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(MotionIndex.load(path)) in (50, 100, 150, 200)
+    assert list(tmp_path.iterdir()) == [tmp_path / "motions.json"]
+
+
+def test_matches_are_sorted_by_similarity():
+    index = MotionIndex(threshold=0.6)
+    index.add("Social media is more harmful than beneficial to society")
+    index.add("Social media is more harmful than beneficial to society today")
+    found = index.matches("Social media is more harmful than beneficial to society")
+    similarities = [similarity for _, similarity in found]
+    assert similarities == sorted(similarities, reverse=True)
+    assert found[0][1] == 1.0 and len(found) == 2
@@ -0,0 +1,47 @@
+from precompute import PrecomputedDebates
+
+MOTION = "Social media is more harmful than beneficial to society"
+QUESTION = "Is social media more harmful than beneficial to society?"
+NEGATED = "Social media is not more harmful than beneficial to society"
+HOMEWORK = "Homework should be banned in primary schools."
+
+
+def test_paraphrase_is_served_a_stored_debate(tmp_path):
+    store = PrecomputedDebates(str(tmp_path / "debates.sqlite3"))
+    store.add(QUESTION, {"topic": "social"})
+    assert store.pick(MOTION) == {"topic": "social"}
+    assert store.pick(NEGATED) is None
+    assert store.stats()["similar_hits"] == 1
+
+
+def test_expired_best_match_falls_back_to_the_next(tmp_path, clock):
+    path = str(tmp_path / "debates.sqlite3")
+    store = PrecomputedDebates(path, ttl=100, clock=clock)
+    store.add(QUESTION, {"topic": "question"})
+    clock.now += 60
+    store.add(f"{MOTION} today", {"topic": "today"})
+    clock.now += 60
+    # The closest stored motion has expired, so the next closest is served
+    assert store.pick(MOTION) == {"topic": "today"}
+
+
+def test_index_is_rebuilt_from_the_store(tmp_path):
+    path = str(tmp_path / "debates.sqlite3")
+    PrecomputedDebates(path).add(HOMEWORK, {"topic": "homework"})
+    paraphrase = "homework should be banned in primary schools!"
+    assert PrecomputedDebates(path).pick(paraphrase) == {"topic": "homework"}
+
+
+def test_index_is_built_on_the_first_miss_from_fresh_motions_only(tmp_path, clock):
+    path = str(tmp_path / "debates.sqlite3")
+    old = PrecomputedDebates(path, ttl=100, clock=clock)
+    old.add(HOMEWORK, {"topic": "homework"})
+    clock.now += 200
+    old.add("Zoos should be abolished.", {"topic": "zoos"})
+
+    store = PrecomputedDebates(path, ttl=100, clock=clock)
+    assert store.index.stats()["motions"] == 0
+    assert store.pick("zoos should be abolished.") == {"topic": "zoos"}
+    assert store.index.stats()["motions"] == 0
+    assert store.pick("Zoos should be abolished!") == {"topic": "zoos"}
+    assert store.index.stats()["motions"] == 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from ratelimit import RateLimitExceeded, Scheduler, TokenBucket
+
+
+def test_token_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    bucket.take(2)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 1.0
+    assert bucket.wait_time(1) == 0
+
+
+def test_requests_per_minute_are_spread_out(clock):
+    scheduler = Scheduler(
+        60, 1_000_000, {"interactive": 10, "bulk": 10}, clock=clock, sleep=clock.sleep
+    )
+
+    async def scenario():
+        start, admitted = clock.now, []
+        for _ in range(62):
+            await scheduler.acquire("bulk", 10)
+            admitted.append(clock.now - start)
+        return admitted
+
+    admitted = asyncio.run(scenario())
+    # The burst is the bucket's capacity, then one request per second
+    assert admitted[59] == 0
+    assert admitted[61] == pytest.approx(2.0)
+
+
+def test_call_past_its_max_wait_is_rejected(clock):
+    scheduler = Scheduler(
+        1, 1_000_000, {"interactive": 5, "bulk": 5}, clock=clock, sleep=clock.sleep
+    )
+
+    async def scenario():
+        await scheduler.acquire("bulk", 10)
+        await scheduler.acquire("bulk", 10)
+
+    with pytest.raises(RateLimitExceeded) as error:
+        asyncio.run(scenario())
+    assert error.value.retry_after == pytest.approx(60.0)
+    assert scheduler.rejected == 1
+
+
+def test_interactive_calls_go_first(clock):
+    async def yield_only(seconds):
+        await asyncio.sleep(0)
+
+    scheduler = Scheduler(
+        60, 1_000_000, {"interactive": 30, "bulk": 30}, clock=clock, sleep=yield_only
+    )
+    scheduler.requests.take(60)
+    order = []
+
+    async def call(priority, name):
+        await scheduler.acquire(priority, 10)
+        order.append(name)
+
+    async def scenario():
+        # Both wait for an empty bucket; the bulk call queued first
+        calls = [asyncio.ensure_future(call("bulk", "bulk"))]
+        await asyncio.sleep(0)
+        calls.append(asyncio.ensure_future(call("interactive", "interactive")))
+        await asyncio.sleep(0)
+        clock.now += 2.0
+        await asyncio.gather(*calls)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "bulk"]
@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import groq
+import httpx
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, Resilience
+
+
+def status_error(cls, status: int):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    return cls(
+        "upstream error", response=httpx.Response(status, request=request), body=None
+    )
+
+
+async def no_sleep(seconds):
+    pass
+
+
+def make_resilience(threshold=2, deadline=0.05, clock=time.monotonic):
+    breaker = CircuitBreaker(
+        failure_threshold=threshold, reset_timeout=30.0, clock=clock
+    )
+    return Resilience(
+        max_retries=0, breaker=breaker, deadlines={"score": deadline}, sleep=no_sleep
+    )
+
+
+def test_timeouts_open_the_breaker():
+    resilience = make_resilience()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                await resilience.run("score", hang)
+        with pytest.raises(CircuitOpenError):
+            await resilience.run("score", hang)
+
+    asyncio.run(scenario())
+    assert resilience.breaker.state == "open"
+
+
+@pytest.mark.parametrize("cls,status", [
+    (groq.InternalServerError, 500),
+    (groq.AuthenticationError, 401),
+    (groq.PermissionDeniedError, 403),
+])
+def test_non_retryable_upstream_failures_count(cls, status):
+    resilience = make_resilience(threshold=1)
+
+    async def fail():
+        raise status_error(cls, status)
+
+    with pytest.raises(cls):
+        asyncio.run(resilience.run("score", fail))
+    assert resilience.breaker.state == "open"
+
+
+def test_bad_requests_do_not_count():
+    resilience = make_resilience(threshold=1)
+
+    async def fail():
+        raise status_error(groq.BadRequestError, 400)
+
+    with pytest.raises(groq.BadRequestError):
+        asyncio.run(resilience.run("score", fail))
+    assert resilience.breaker.state == "closed"
+
+
+def test_half_open_admits_one_probe(clock):
+    resilience = make_resilience(threshold=1, deadline=5.0, clock=clock)
+    resilience.breaker.record_failure()
+    clock.now += 31.0
+    release = asyncio.Event()
+
+    async def slow_success():
+        await release.wait()
+        return "ok"
+
+    async def scenario():
+        probe = asyncio.ensure_future(resilience.run("score", slow_success))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await resilience.run("score", slow_success)
+        release.set()
+        assert await probe == "ok"
+        assert await resilience.run("score", slow_success) == "ok"
+
+    asyncio.run(scenario())
+    assert resilience.breaker.state == "closed"
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 31.0
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_cancelled_probe_frees_the_slot(clock):
+    resilience = make_resilience(threshold=1, deadline=5.0, clock=clock)
+    resilience.breaker.record_failure()
+    clock.now += 31.0
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        probe = asyncio.ensure_future(resilience.run("score", hang))
+        await asyncio.sleep(0)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        resilience.breaker.before_call()
+
+    asyncio.run(scenario())
+    assert resilience.breaker.probing
+
+
+def test_saturated_limiter_does_not_open_the_breaker():
+    from ratelimit import RateLimitExceeded, Scheduler
+
+    resilience = make_resilience(threshold=2, deadline=0.2)
+    scheduler = Scheduler(
+        requests_per_minute=1, tokens_per_minute=100_000, max_wait={"bulk": 30.0}
+    )
+    scheduler.requests.take(1)
+    calls = []
+
+    async def admit(max_wait):
+        await scheduler.acquire("bulk", 10, max_wait)
+
+    async def attempt():
+        calls.append(1)
+        return "reply"
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(resilience.run("score", attempt, admit=admit) for _ in range(5)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RateLimitExceeded) for result in results)
+
+    asyncio.run(scenario())
+    assert calls == []
+    assert resilience.breaker.state == "closed"
+    assert resilience.breaker.failures == 0
+
+
+def test_call_queued_within_the_deadline_goes_through():
+    from ratelimit import Scheduler
+
+    resilience = make_resilience(deadline=0.5)
+    # One request every 0.25s: the second call queues for about half the deadline
+    scheduler = Scheduler(
+        requests_per_minute=240, tokens_per_minute=100_000, max_wait={"bulk": 30.0}
+    )
+    scheduler.requests.level = 1
+
+    async def admit(max_wait):
+        await scheduler.acquire("bulk", 10, max_wait)
+
+    async def attempt():
+        await asyncio.sleep(0.1)
+        return "reply"
+
+    async def scenario():
+        return await asyncio.gather(
+            *(resilience.run("score", attempt, admit=admit) for _ in range(2))
+        )
+
+    assert asyncio.run(scenario()) == ["reply", "reply"]
+    assert resilience.breaker.failures == 0
@@ -0,0 +1,46 @@
+from sessions import (
+    DebateSession,
+    MemorySessionStore,
+    SQLiteSessionStore,
+    client_history_entries,
+)
+
+
+def test_memory_sessions_expire_when_idle(clock):
+    store = MemorySessionStore(ttl=60, clock=clock)
+    session_id = store.create("Uniforms")
+    session = store.get(session_id)
+    session.add_turn("user", "opening", "Uniforms cost money.")
+    store.save(session_id, session)
+    clock.now += 59
+    assert store.get(session_id).turns[0].text == "Uniforms cost money."
+    clock.now += 60
+    assert store.get(session_id) is None
+
+
+def test_sqlite_sessions_are_shared_between_connections(tmp_path, clock):
+    path = str(tmp_path / "sessions.sqlite3")
+    store = SQLiteSessionStore(path, ttl=60, clock=clock)
+    session_id = store.create("Uniforms")
+    session = store.get(session_id)
+    session.add_turn("ai", "opening", "Uniforms build identity.")
+    store.save(session_id, session)
+    other = SQLiteSessionStore(path, ttl=60, clock=clock)
+    entries = store.get(session_id).history_entries()
+    assert other.get(session_id).history_entries() == entries
+    other.delete(session_id)
+    assert store.get(session_id) is None
+
+
+def test_session_json_round_trip():
+    session = DebateSession("Uniforms")
+    session.add_turn("user", "rebuttal", "Costs matter.")
+    assert DebateSession.from_json(session.to_json()) == session
+
+
+def test_client_history_is_labelled_by_speaker():
+    entries = client_history_entries(
+        [{"type": "user", "text": "Costs matter."}, {"type": "ai", "text": "Not much."}]
+    )
+    assert [text for _, text in entries] == ["Costs matter.", "Not much."]
+    assert entries[0][0] != entries[1][0]
@@ -0,0 +1,40 @@
+import asyncio
+
+from sessions import DebateSession
+from speculation import DraftStore
+
+
+def test_thrown_away_drafts_cancel_their_upstream_calls(slow_model):
+    store = DraftStore(max_drafts=1)
+    session = DebateSession("Homework should be banned.")
+
+    async def scenario():
+        store.prepare("a", session, "opening")
+        await asyncio.sleep(0.01)
+        # Replaced by a draft with more of the argument typed
+        store.prepare("a", session, "opening", "Homework takes away")
+        await asyncio.sleep(0.01)
+        # Evicted by another session's draft
+        store.prepare("b", session, "opening")
+        await asyncio.sleep(0.01)
+        # Not ready when the round arrives
+        assert store.take("b", session, "opening") is None
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert slow_model.started == 3
+    assert (slow_model.cancelled, slow_model.finished) == (3, 0)
+
+
+def test_finished_draft_is_used(slow_model):
+    slow_model.delay = 0
+    store = DraftStore()
+    session = DebateSession("Homework should be banned.")
+
+    async def scenario():
+        store.prepare("a", session, "rebuttal")
+        await asyncio.sleep(0.05)
+        return store.take("a", session, "rebuttal")
+
+    assert asyncio.run(scenario()) == slow_model.reply
+    assert slow_model.finished == 1
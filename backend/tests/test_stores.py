@@ -0,0 +1,15 @@
+from jobs import DebateJob, SQLiteJobStore
+from precompute import PrecomputedDebates
+
+
+def test_job_and_debate_stores_reopen(tmp_path):
+    jobs = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    jobs.save(DebateJob("job", "Uniforms", status="done", finished=5.0))
+    debates = PrecomputedDebates(str(tmp_path / "debates.sqlite3"))
+    debates.add("Uniforms", {"topic": "Uniforms"})
+    for store in (jobs, debates):
+        old = store.conn
+        store.reopen()
+        assert store.conn is not old
+    assert jobs.get("job").status == "done"
+    assert debates.pick("uniforms") == {"topic": "Uniforms"}
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+import structured
+from structured import JSONStreamExtractor, extract_json, loads_tolerant
+
+
+def test_extracts_json_from_prose_and_fences():
+    text = (
+        "Sure! Here it is:\n"
+        '```json\n{"coherence": 0.8, "note": "a {brace} inside"}\n```\n'
+        "Hope that helps."
+    )
+    assert extract_json(text) == {"coherence": 0.8, "note": "a {brace} inside"}
+
+
+def test_values_split_across_chunks():
+    extractor = JSONStreamExtractor()
+    assert extractor.feed('prefix {"a": [1, ') == []
+    assert extractor.feed('2], "b": "x\\"}"}') == [{"a": [1, 2], "b": 'x"}'}]
+
+
+def test_invalid_span_is_skipped():
+    assert extract_json('{not json} then {"ok": true}') == {"ok": True}
+
+
+def test_stray_open_brace_is_recovered_on_close():
+    assert extract_json('Use {curly braces like this and then {"ok": 1}') == {"ok": 1}
+
+
+def test_many_stray_open_braces_are_recovered_on_close():
+    assert extract_json("{" * 5000 + '{"ok": 1}') == {"ok": 1}
+    assert extract_json("see { or [ " * 3000 + '{"ok": 1}') == {"ok": 1}
+
+
+def test_kind_filters_values():
+    assert extract_json('[1, 2] {"a": 1}', kind=dict) == {"a": 1}
+    assert extract_json('[1, 2] {"a": 1}', kind=list) == [1, 2]
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("No JSON here at all.")
+
+
+def test_tolerant_loading():
+    assert loads_tolerant('{"a": [1, 2,],}') == {"a": [1, 2]}
+    assert loads_tolerant("{“a”: 1}") == {"a": 1}
+
+
+class Verdict(BaseModel):
+    winner: str
+
+
+def test_repair_is_validated_so_it_can_escalate(monkeypatch):
+    calls = []
+
+    async def invoke_llm(prompt, task, *args, validate=None, **kwargs):
+        calls.append((task, validate))
+        return "not json" if task == "verdict" else '{"winner": "pro"}'
+
+    monkeypatch.setattr(structured, "invoke_llm", invoke_llm)
+
+    result = asyncio.run(structured.request_structured("Who won?", Verdict, "verdict"))
+
+    assert result == Verdict(winner="pro")
+    task, validate = calls[-1]
+    assert task == "repair"
+    with pytest.raises(ValueError):
+        validate("still not json")
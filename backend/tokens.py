@@ -0,0 +1,23 @@
+import re
+
+# Words, numbers and individual punctuation marks, the units BPE tokenizers
+# start from before merging.
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the LLM token count of ``text`` without loading a tokenizer.
+
+    Common English words are a single BPE token and longer ones split into
+    roughly four-character pieces; numbers split about every three digits.
+    The estimate leans high, which is the safe side for prompt budgets.
+    """
+    total = 0
+    for piece in _PIECES.findall(text):
+        if piece.isdigit():
+            total += (len(piece) + 2) // 3
+        elif piece.isalpha() and len(piece) > 6:
+            total += (len(piece) + 3) // 4
+        else:
+            total += 1
+    return total
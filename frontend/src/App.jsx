@@ -8,9 +8,13 @@ import LiveDebateArena from "./components/LiveDebateArena";
 import Scoring from "./components/Scoring";
 import "./App.css";
 
+// How often to poll a queued debate for finished speeches
+const JOB_POLL_MS = 1500;
+
 function App() {
   const [debateData, setDebateData] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
+  const [progress, setProgress] = useState(null);
   const [error, setError] = useState(null);
 
   const handleStartDebate = async (topic) => {
@@ -18,7 +22,8 @@ function App() {
     setError(null);
 
     try {
-      const response = await fetch("/api/debate", {
+      // Queue the debate, then poll the job instead of holding a long request open
+      const response = await fetch("/api/debate/jobs", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -30,13 +35,28 @@ function App() {
         throw new Error("Failed to generate debate");
       }
 
-      const data = await response.json();
-      setDebateData(data);
+      const { job_id } = await response.json();
+      let job;
+      do {
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+        const poll = await fetch(`/api/debate/jobs/${job_id}`);
+        if (!poll.ok) {
+          throw new Error("Failed to generate debate");
+        }
+        job = await poll.json();
+        setProgress({ completed: job.completed, total: job.total });
+      } while (job.status === "queued" || job.status === "running");
+
+      if (job.status === "failed") {
+        throw new Error(job.error || "Failed to generate debate");
+      }
+      setDebateData(job);
     } catch (err) {
       setError(err.message);
       console.error("Error:", err);
     } finally {
       setIsLoading(false);
+      setProgress(null);
     }
   };
 
@@ -71,7 +91,10 @@ function App() {
                 {isLoading && (
                   <div className="loading-container">
                     <div className="loading-spinner"></div>
-                    <p className="loading-text">Generating debate arguments...</p>
+                    <p className="loading-text">
+                      Generating debate arguments
+                      {progress ? ` (${progress.completed}/${progress.total} speeches)` : "..."}
+                    </p>
                     <p className="loading-subtext">
                       This may take a moment as our AI debaters prepare their arguments
                     </p>
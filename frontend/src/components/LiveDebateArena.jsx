@@ -25,13 +25,62 @@ function LiveDebateArena() {
         rebuttal: [],
         closing: [],
     });
+    const [sessionId, setSessionId] = useState(null);
+    const [isStartingSession, setIsStartingSession] = useState(false);
     const [isLoading, setIsLoading] = useState(false);
     const [error, setError] = useState(null);
 
-    const handleStartDebate = (selectedTopic) => {
+    const handleStartDebate = async (selectedTopic) => {
         setTopic(selectedTopic);
         setHasStarted(true);
         setError(null);
+        setIsStartingSession(true);
+
+        // The server keeps the debate history, so each round only sends the new argument
+        try {
+            const response = await fetch("/api/live-sessions", {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                },
+                body: JSON.stringify({ topic: selectedTopic }),
+            });
+
+            if (!response.ok) {
+                throw new Error("Failed to start debate session");
+            }
+
+            const data = await response.json();
+            setSessionId(data.session_id);
+
+            // Let the server draft the first counter while the user writes their opening
+            fetch(`/api/live-sessions/${data.session_id}/prepare`, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                },
+                body: JSON.stringify({ round: "opening" }),
+            }).catch(() => {});
+        } catch (err) {
+            console.error("Error starting debate session:", err);
+            setError(err.message);
+        } finally {
+            setIsStartingSession(false);
+        }
+    };
+
+    // Without a session (it could not be created) the client sends the earlier rounds itself
+    const buildArgumentHistory = () => {
+        const allHistory = [];
+        ["opening", "rebuttal", "closing"].forEach((round) => {
+            userArguments[round].forEach((arg) => {
+                allHistory.push({ type: "user", text: arg.text });
+            });
+            aiResponses[round].forEach((resp) => {
+                allHistory.push({ type: "ai", text: resp.text });
+            });
+        });
+        return allHistory;
     };
 
     const handleSubmitArgument = async (argument) => {
@@ -46,19 +95,6 @@ function LiveDebateArena() {
         setError(null);
 
         try {
-            // Build argument history for context
-            const allHistory = [];
-            ["opening", "rebuttal", "closing"].forEach((round) => {
-                userArguments[round].forEach((arg) => {
-                    allHistory.push({ type: "user", text: arg.text });
-                });
-                aiResponses[round].forEach((resp) => {
-                    allHistory.push({ type: "ai", text: resp.text });
-                });
-            });
-            // Add current argument
-            allHistory.push({ type: "user", text: argument });
-
             const response = await fetch("/api/live-counter", {
                 method: "POST",
                 headers: {
@@ -68,7 +104,9 @@ function LiveDebateArena() {
                     topic: topic,
                     user_argument: argument,
                     round: currentRound,
-                    argument_history: allHistory,
+                    ...(sessionId
+                        ? { session_id: sessionId, speculate: true }
+                        : { argument_history: buildArgumentHistory() }),
                 }),
             });
 
@@ -183,6 +221,7 @@ function LiveDebateArena() {
                     onSubmit={handleSubmitArgument}
                     onNextRound={handleNextRound}
                     canAdvance={canAdvance && currentRound !== "closing"}
+                    disabled={isStartingSession}
                 />
                 <AICounterposition
                     currentRound={currentRound}
@@ -8,6 +8,8 @@ function Scoring() {
     const [targetScore, setTargetScore] = useState(80);
     const [isAnalyzing, setIsAnalyzing] = useState(false);
     const [results, setResults] = useState(null);
+    const [feedback, setFeedback] = useState(null);
+    const [isLoadingTips, setIsLoadingTips] = useState(false);
     const [attemptHistory, setAttemptHistory] = useState([]);
     const [error, setError] = useState(null);
 
@@ -35,6 +37,7 @@ function Scoring() {
 
             const data = await response.json();
             setResults(data);
+            setFeedback(null);
 
             // Add to history
             setAttemptHistory(prev => [...prev, {
@@ -48,6 +51,37 @@ function Scoring() {
         }
     };
 
+    // Tips cost a second LLM call, so they are only fetched on request
+    const handleGetTips = async () => {
+        setIsLoadingTips(true);
+        setError(null);
+
+        try {
+            const response = await fetch("/api/get-feedback", {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                },
+                body: JSON.stringify({
+                    argument: argumentText,
+                    topic: topicText,
+                    scores: results,
+                    target_score: targetScore,
+                }),
+            });
+
+            if (!response.ok) {
+                throw new Error("Failed to get improvement tips");
+            }
+
+            setFeedback(await response.json());
+        } catch (err) {
+            setError(err.message);
+        } finally {
+            setIsLoadingTips(false);
+        }
+    };
+
     const handleTryAgain = () => {
         setResults(null);
     };
@@ -171,6 +205,29 @@ function Scoring() {
                             )}
                         </div>
 
+                        {/* Tips towards the target, fetched only when asked for */}
+                        {!scoreReached && !feedback && (
+                            <button className="secondary-btn" onClick={handleGetTips} disabled={isLoadingTips}>
+                                <Lightbulb size={16} /> {isLoadingTips ? "Getting tips..." : `Get Tips to Reach ${targetScore}%`}
+                            </button>
+                        )}
+                        {!scoreReached && feedback?.tips?.length > 0 && (
+                            <div className="metrics-section">
+                                <h3>How to Reach {targetScore}%</h3>
+                                {feedback.message && (
+                                    <p className="metric-reason">{feedback.message}</p>
+                                )}
+                                {feedback.tips.map((t, i) => (
+                                    <div key={i} className="metric-row">
+                                        <div className="metric-header-row">
+                                            <span className="metric-name">{t.metric}</span>
+                                        </div>
+                                        <p className="metric-reason"><Lightbulb size={12} /> {t.tip}</p>
+                                    </div>
+                                ))}
+                            </div>
+                        )}
+
                         {/* Metrics with Inline Feedback */}
                         <div className="metrics-section">
                             <h3>Score Breakdown</h3>
@@ -8,12 +8,12 @@ const ROUND_LABELS = {
     closing: "Closing Statement",
 };
 
-function UserPosition({ currentRound, arguments: userArgs, onSubmit, onNextRound, canAdvance }) {
+function UserPosition({ currentRound, arguments: userArgs, onSubmit, onNextRound, canAdvance, disabled = false }) {
     const [inputText, setInputText] = useState("");
 
     const handleSubmit = (e) => {
         e.preventDefault();
-        if (inputText.trim()) {
+        if (inputText.trim() && !disabled) {
             onSubmit(inputText.trim());
             setInputText("");
         }
@@ -70,7 +70,7 @@ function UserPosition({ currentRound, arguments: userArgs, onSubmit, onNextRound
                                 <button
                                     type="submit"
                                     className="submit-argument-btn"
-                                    disabled={!inputText.trim()}
+                                    disabled={!inputText.trim() || disabled}
                                 >
                                     Submit Argument
                                     <Send size={16} />